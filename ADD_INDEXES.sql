@@ -0,0 +1,62 @@
+-- 热点查询索引
+-- 与 backend/models.py 中各模型 __table_args__ 声明的索引一致，
+-- 已通过 flask db migrate/upgrade 同步模型的数据库无需再执行
+--
+-- 执行方式：mysql -u poc_user -p poc_platform < ADD_INDEXES.sql
+-- ALGORITHM=INPLACE, LOCK=NONE：在线建索引，不阻塞读写
+
+USE poc_platform;
+
+-- 项目列表按状态筛选、按提交时间排序，统计按月份聚合
+ALTER TABLE `Project`
+    ADD INDEX ix_project_status_submit_time (status, submit_time),
+    ADD INDEX ix_project_submit_time (submit_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 评审人任务列表、项目评审进度
+ALTER TABLE `ReviewTask`
+    ADD INDEX ix_review_task_reviewer_status (reviewer_id, status),
+    ADD INDEX ix_review_task_project_status (project_id, status),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 用户通知按时间倒序
+ALTER TABLE `Notification`
+    ADD INDEX ix_notification_user_create_time (user_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 项目留言、概念验证记录按时间排序
+ALTER TABLE `IncubationComment`
+    ADD INDEX ix_incubation_comment_project_create_time (project_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE `ProofOfConcept`
+    ADD INDEX ix_proof_of_concept_project_create_time (project_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 对接意向：项目方和企业支持者两个方向的列表
+ALTER TABLE `SupportIntention`
+    ADD INDEX ix_support_intention_project_create_time (project_id, create_time),
+    ADD INDEX ix_support_intention_supporter_create_time (supporter_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 资源集市：公开资源列表、我发布的资源
+ALTER TABLE `IncubationResource`
+    ADD INDEX ix_incubation_resource_status_create_time (status, create_time),
+    ADD INDEX ix_incubation_resource_provider_create_time (provider_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 资源申请：资源的申请列表、我的申请
+ALTER TABLE `ResourceApplication`
+    ADD INDEX ix_resource_application_resource_create_time (resource_id, create_time),
+    ADD INDEX ix_resource_application_applicant_create_time (applicant_id, create_time),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- 回退：
+-- ALTER TABLE `Project` DROP INDEX ix_project_status_submit_time, DROP INDEX ix_project_submit_time;
+-- ALTER TABLE `ReviewTask` DROP INDEX ix_review_task_reviewer_status, DROP INDEX ix_review_task_project_status;
+-- ALTER TABLE `Notification` DROP INDEX ix_notification_user_create_time;
+-- ALTER TABLE `IncubationComment` DROP INDEX ix_incubation_comment_project_create_time;
+-- ALTER TABLE `ProofOfConcept` DROP INDEX ix_proof_of_concept_project_create_time;
+-- ALTER TABLE `SupportIntention` DROP INDEX ix_support_intention_project_create_time, DROP INDEX ix_support_intention_supporter_create_time;
+-- ALTER TABLE `IncubationResource` DROP INDEX ix_incubation_resource_status_create_time, DROP INDEX ix_incubation_resource_provider_create_time;
+-- ALTER TABLE `ResourceApplication` DROP INDEX ix_resource_application_resource_create_time, DROP INDEX ix_resource_application_applicant_create_time;
@@ -0,0 +1,17 @@
+-- 令牌版本列（登录令牌吊销）
+-- 与 backend/models.py 中 User.token_version 一致，
+-- 已通过 flask db migrate/upgrade 同步模型的数据库无需再执行
+--
+-- 执行方式：mysql -u poc_user -p poc_platform < ADD_TOKEN_VERSION.sql
+-- 必须在部署新版后端之前执行：新版本的每个 User 查询（包括登录和令牌校验）都会读取该列
+-- ALGORITHM=INSTANT：只修改表定义，不复制数据（MySQL 8.0.12+；更早的版本去掉该子句）
+
+USE poc_platform;
+
+-- 角色变更、移出团队时递增，令牌中的 ver 与之不一致即失效
+ALTER TABLE `User`
+    ADD COLUMN token_version INT NOT NULL DEFAULT 0,
+    ALGORITHM=INSTANT;
+
+-- 回退（需先回退到不读取该列的后端版本）：
+-- ALTER TABLE `User` DROP COLUMN token_version;
@@ -422,7 +422,7 @@ class ProjectResource(Resource):
                         if avg_score > 60:
                             p.status = '已通过'
                         else:
-                            p.status = '复审未通过'
+                            p.status = '已取消'
                         try:
                             db.session.commit()  # 尝试保存状态
                         except Exception as e:
@@ -742,7 +742,7 @@ class ReviewerReview(Resource):
                         project.status = '已通过'
                         msg = f"项目通过复审（均分{avg_score:.1f}），进入孵化阶段。"
                     else:
-                        project.status = '复审未通过'
+                        project.status = '已取消'
                         msg = f"项目复审未通过（均分{avg_score:.1f}）。"
 
                     notify = Notification(user_id=project.principal_id, title="复审结果", content=msg)
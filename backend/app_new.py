@@ -1,65 +1,121 @@
 """
 Flask应用主入口
-只包含应用初始化和错误处理
-所有业务逻辑已拆分到resources模块
+create_app() 应用工厂，只包含应用初始化和错误处理
+所有业务逻辑已拆分到resources模块：
+- bcrypt、numpy 等较重的依赖在用到的函数内导入
+- Flask-Migrate 与数据维护命令只在 flask 命令行中注册，服务进程不导入 alembic
+
+运行：
+    flask --app app_new run                       # 开发
+    gunicorn 'app_new:create_app()'               # 生产
 """
 import logging
+import os
+
 from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_restful import Api
-from flask_migrate import Migrate
 
-from config import Config
+from config import get_config
 from models import db
 from exceptions import APIException
 from routes import register_routes
+from passwords import password_hasher
+from tokens import init_jwt
+from db_routing import replica_router
+from query_stats import init_query_stats
+from metrics import init_metrics
+from profiler import request_profiler
+from serialization import init_representations
+from compression import compressor
+from fanout import query_fanout
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 创建Flask应用
-app = Flask(__name__)
-app.config.from_object(Config)
 
-# 初始化扩展
-db.init_app(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-CORS(app)
-api = Api(app)
+def create_app(config_name=None, overrides=None):
+    """
+    创建应用
+    config_name: development / production / testing，默认按 APP_ENV 选择
+    overrides: 在初始化扩展之前覆盖的配置项
+    """
+    app = Flask(__name__)
+    app.config.from_object(get_config(config_name))
+    if overrides:
+        app.config.update(overrides)
+
+    # 初始化扩展
+    db.init_app(app)
+    replica_router.init_app(app)
+    init_query_stats(app)
+    init_metrics(app)
+    request_profiler.init_app(app)
+    compressor.init_app(app)
+    query_fanout.init_app(app)
+    password_hasher.init_app(app)
+    init_jwt(JWTManager(app), app)
+    CORS(app)
+    api = Api(app)
+    init_representations(api)
+
+    # 注册路由
+    register_routes(api)
+    cli = os.environ.get('FLASK_RUN_FROM_CLI') == 'true'
+
+    # 注册命令行工具（flask 命令行会设置 FLASK_RUN_FROM_CLI）
+    if cli:
+        _register_cli(app)
+
+    # 启动全局统计快照的后台刷新
+    if app.config['STATISTICS_BACKGROUND_REFRESH']:
+        from resources.statistics import global_statistics_snapshot
+        global_statistics_snapshot.init_app(app, interval=app.config['STATISTICS_REFRESH_INTERVAL'])
+
+    _register_error_handlers(app)
+    return app
 
-# 注册路由
-register_routes(api)
 
-# 全局错误处理器
-@app.errorhandler(APIException)
-def handle_api_exception(e):
-    """处理自定义API异常"""
-    logger.warning(f"API异常: {e.message} (状态码: {e.status_code})")
-    return jsonify({'message': e.message}), e.status_code
+def _register_cli(app):
+    """数据库迁移和数据维护命令"""
+    from flask_migrate import Migrate
+    from bulk_import import import_command
+    from datagen import generate_data_command
+    from index_advisor import index_advisor_command
 
+    Migrate(app, db)
+    app.cli.add_command(import_command)
+    app.cli.add_command(index_advisor_command)
+    app.cli.add_command(generate_data_command)
 
-@app.errorhandler(404)
-def handle_not_found(e):
-    """处理404错误"""
-    return jsonify({'message': '资源不存在'}), 404
 
+def _register_error_handlers(app):
+    """全局错误处理器"""
+    @app.errorhandler(APIException)
+    def handle_api_exception(e):
+        """处理自定义API异常"""
+        logger.warning(f"API异常: {e.message} (状态码: {e.status_code})")
+        return jsonify({'message': e.message}), e.status_code
 
-@app.errorhandler(500)
-def handle_internal_error(e):
-    """处理500错误"""
-    logger.error(f"服务器内部错误: {str(e)}", exc_info=True)
-    return jsonify({'message': '服务器内部错误，请稍后重试'}), 500
+    @app.errorhandler(404)
+    def handle_not_found(e):
+        """处理404错误"""
+        return jsonify({'message': '资源不存在'}), 404
 
+    @app.errorhandler(500)
+    def handle_internal_error(e):
+        """处理500错误"""
+        logger.error(f"服务器内部错误: {str(e)}", exc_info=True)
+        return jsonify({'message': '服务器内部错误，请稍后重试'}), 500
 
-@app.errorhandler(Exception)
-def handle_general_exception(e):
-    """处理其他未捕获的异常"""
-    logger.error(f"未处理的异常: {str(e)}", exc_info=True)
-    return jsonify({'message': '服务器错误，请稍后重试'}), 500
+    @app.errorhandler(Exception)
+    def handle_general_exception(e):
+        """处理其他未捕获的异常"""
+        logger.error(f"未处理的异常: {str(e)}", exc_info=True)
+        return jsonify({'message': '服务器错误，请稍后重试'}), 500
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    create_app().run(debug=True, port=5000)
@@ -0,0 +1,229 @@
+"""
+ASGI 入口（可选）
+- resources/async_views.py 中登记的只读 GET 接口（统计、项目/任务/通知列表、孵化项目、资源集市）在事件循环中处理，
+  查询通过异步驱动执行，等待数据库时不占用线程
+- 其余接口、写请求和带性能分析标记的请求交给 Flask 应用，在 ASGI_WSGI_THREADS 个线程中执行
+- 令牌校验、角色判断、JSON/MessagePack 编码、压缩、CORS 和监控指标与 Flask 路径一致；
+  令牌缺失、无效或已吊销时转交 Flask 路径，返回与同步接口相同的错误响应
+
+运行（需安装 uvicorn、a2wsgi、greenlet 和异步数据库驱动）：
+    uvicorn --factory asgi:create_asgi_app --workers 4
+"""
+import asyncio
+import logging
+import time
+from importlib import import_module
+from urllib.parse import parse_qsl
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from sqlalchemy import select
+from werkzeug.datastructures import Accept, MIMEAccept, MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header
+from werkzeug.routing import Map, Rule
+
+from app_new import create_app
+from async_db import async_db
+from compression import compressor
+from exceptions import APIException, NotFoundError
+from metrics import REQUEST_LATENCY, RESPONSES, IN_FLIGHT
+from models import User
+from serialization import dumps, packb, msgpack, JSON_MEDIATYPE, MSGPACK_MEDIATYPE
+from tokens import token_versions
+
+logger = logging.getLogger(__name__)
+
+_views = []
+
+
+class AsyncView:
+    """异步处理的 GET 接口"""
+    __slots__ = ('path', 'handler', 'resource', 'failure', 'cacheable')
+
+    def __init__(self, path, handler, resource, failure, cacheable):
+        self.path = path
+        self.handler = handler
+        self.resource = resource
+        self.failure = failure
+        self.cacheable = cacheable
+
+
+def async_view(path, resource, failure, cacheable=False):
+    """
+    登记异步处理的 GET 接口，处理函数接收 AsyncRequest，返回可编码的数据
+    resource: 同步实现的 Resource 类名，监控指标沿用该名称
+    failure: 未预期异常时的提示，如 '获取通知列表失败'
+    cacheable: 与同步资源中的 cache_compressed() 相同，压缩结果按响应体缓存
+    """
+    def decorator(handler):
+        _views.append(AsyncView(path, handler, resource, failure, cacheable))
+        return handler
+    return decorator
+
+
+class AsyncRequest:
+    """异步接口的请求上下文"""
+
+    def __init__(self, app, claims, session, args, view_args):
+        self.app = app
+        self.claims = claims
+        self.uid = claims['sub']
+        self.session = session
+        self.args = args
+        self.view_args = view_args
+
+    async def role(self):
+        """当前用户角色：优先取令牌声明，旧令牌回退到数据库查询（与 utils.get_current_role 一致）"""
+        role = self.claims.get('role')
+        if role:
+            return role
+        role = await self.session.scalar(select(User.role).where(User.user_id == self.uid))
+        if role is None:
+            raise NotFoundError('用户不存在')
+        return role
+
+    async def run_sync(self, fn, *args):
+        """在线程中以 Flask 应用上下文执行同步函数（如读取统计快照）"""
+        def call():
+            with self.app.app_context():
+                return fn(*args)
+        return await asyncio.to_thread(call)
+
+
+class AsgiApp:
+    """异步只读接口 + Flask 应用"""
+
+    def __init__(self, app, views, threads=16):
+        self.app = app
+        self.views = views
+        self.wsgi = WSGIMiddleware(app, workers=threads)
+        self.adapter = Map([Rule(view.path, endpoint=i, methods=['GET'])
+                            for i, view in enumerate(views)]).bind('')
+        self.header_name = app.config.get('JWT_HEADER_NAME', 'Authorization').lower().encode('latin-1')
+        self.header_type = app.config.get('JWT_HEADER_TYPE', 'Bearer')
+        self.in_flight = IN_FLIGHT.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            response = await self._dispatch(scope)
+            if response is not None:
+                status, headers, body = response
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': body})
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_db.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _authenticate(self, headers):
+        """校验访问令牌，返回声明；令牌缺失或无效时返回 None"""
+        value = headers.get(self.header_name, b'').decode('latin-1')
+        prefix = f'{self.header_type} ' if self.header_type else ''
+        if not value.startswith(prefix):
+            return None
+        try:
+            with self.app.app_context():
+                claims = decode_token(value[len(prefix):])
+        except Exception:
+            return None
+        return claims if claims.get('type') == 'access' else None
+
+    async def _token_current(self, claims):
+        """令牌版本号是否与用户当前版本一致（与 tokens.init_jwt 的吊销检查相同）"""
+        try:
+            user_id = int(claims['sub'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        version = token_versions.cached(user_id)
+        if version is None:
+            # 版本号决定令牌是否已吊销，始终从主库读取
+            async with async_db.session(read=False) as session:
+                version = await session.scalar(select(User.token_version).where(User.user_id == user_id))
+            if version is None:
+                return False
+            token_versions.store(user_id, version)
+        return claims.get('ver', 0) == version
+
+    async def _dispatch(self, scope):
+        """处理登记的异步接口，返回 (状态码, 响应头, 响应体)；需要交给 Flask 处理时返回 None"""
+        try:
+            endpoint, view_args = self.adapter.match(scope['path'], method='GET')
+        except HTTPException:
+            return None
+        query = scope['query_string'].decode('latin-1')
+        headers = dict(scope['headers'])
+        # 性能分析由 Flask 路径的 profiler 处理
+        if b'x-profile' in headers or '_profile=' in query:
+            return None
+        claims = self._authenticate(headers)
+        if claims is None or not await self._token_current(claims):
+            return None
+
+        view = self.views[endpoint]
+        started = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            args = MultiDict(parse_qsl(query, keep_blank_values=True))
+            async with async_db.session(claims['sub']) as session:
+                request = AsyncRequest(self.app, claims, session, args, view_args)
+                try:
+                    data, status = await view.handler(request), 200
+                except APIException as e:
+                    logger.warning(f"API异常: {e.message} (状态码: {e.status_code})")
+                    data, status = {'message': e.message}, e.status_code
+                except Exception as e:
+                    logger.error(f"{view.failure}: {str(e)}", exc_info=True)
+                    data, status = {'message': f'{view.failure}，请稍后重试'}, 500
+            response_headers, body = self._encode(headers, data, view.cacheable and status == 200)
+        finally:
+            self.in_flight.dec()
+        REQUEST_LATENCY.labels(view.resource, 'GET').observe(time.perf_counter() - started)
+        RESPONSES.labels(view.resource, 'GET', str(status)).inc()
+        return status, response_headers, body
+
+    def _encode(self, headers, data, cacheable):
+        """按 Accept 编码、按 Accept-Encoding 压缩，并附加 CORS 响应头"""
+        accept = parse_accept_header(headers.get(b'accept', b'').decode('latin-1'), MIMEAccept)
+        if msgpack is not None and accept.best_match(
+                [JSON_MEDIATYPE, MSGPACK_MEDIATYPE], default=JSON_MEDIATYPE) == MSGPACK_MEDIATYPE:
+            mediatype, body = MSGPACK_MEDIATYPE, packb(data)
+        else:
+            mediatype, body = JSON_MEDIATYPE, dumps(data, indent=self.app.debug) + b'\n'
+
+        vary = ['Accept']
+        response_headers = [(b'content-type', mediatype.encode('latin-1'))]
+        if len(body) >= compressor.min_size:
+            vary.append('Accept-Encoding')
+            encoding = compressor.negotiate(
+                parse_accept_header(headers.get(b'accept-encoding', b'').decode('latin-1'), Accept))
+            if encoding is not None:
+                body = compressor.compress_body(body, encoding, cacheable)
+                response_headers.append((b'content-encoding', encoding.encode('latin-1')))
+
+        # 与 flask-cors 默认配置一致：有 Origin 时回显并按 Origin 区分缓存
+        origin = headers.get(b'origin')
+        if origin:
+            vary.append('Origin')
+        response_headers.append((b'access-control-allow-origin', origin or b'*'))
+        response_headers.append((b'vary', ', '.join(vary).encode('latin-1')))
+        response_headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        return response_headers, body
+
+
+def create_asgi_app(config_name=None, overrides=None):
+    """创建 ASGI 应用：Flask 应用 + 异步只读接口"""
+    app = create_app(config_name, overrides)
+    async_db.init_app(app)
+    import_module('resources.async_views')
+    return AsgiApp(app, list(_views), threads=app.config['ASGI_WSGI_THREADS'])
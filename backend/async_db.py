@@ -0,0 +1,75 @@
+"""
+异步数据库会话（ASGI 模式）
+- 由 SQLALCHEMY_DATABASE_URI 推导异步驱动：MySQL 使用 aiomysql，SQLite 使用 aiosqlite；ASYNC_DATABASE_URL 可直接指定
+- 连接池参数沿用 SQLALCHEMY_ENGINE_OPTIONS（大小、溢出、回收、预检测、语句超时），每个副本 bind 各建一个异步引擎
+- 读会话按 db_routing 的规则选择副本：写入者在固定窗口内读主库
+需要安装 SQLAlchemy 的 asyncio 依赖（greenlet）和对应的异步驱动
+"""
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db_routing import replica_router
+
+# 同步驱动名 -> 异步驱动名
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql+mysqldb': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+# 可直接传给异步引擎的连接池参数（InstrumentedQueuePool 是同步池，异步引擎使用默认的 AsyncAdaptedQueuePool）
+POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_recycle', 'pool_timeout', 'pool_pre_ping')
+
+
+def async_url(url):
+    """把同步连接串转换为异步驱动的连接串"""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url
+    drivername = ASYNC_DRIVERS.get(url.drivername)
+    if drivername is None:
+        raise ValueError(f'没有与 {url.drivername} 对应的异步驱动，请设置 ASYNC_DATABASE_URL')
+    return url.set(drivername=drivername)
+
+
+def _engine_options(options):
+    result = {key: options[key] for key in POOL_OPTIONS if key in options}
+    init_command = (options.get('connect_args') or {}).get('init_command')
+    if init_command:
+        # aiomysql 同样支持 init_command（如 max_execution_time 语句超时）
+        result['connect_args'] = {'init_command': init_command}
+    return result
+
+
+class AsyncDatabase:
+    """主库和副本的异步引擎"""
+
+    def __init__(self):
+        self.engines = {}
+
+    def init_app(self, app):
+        config = app.config
+        url = config.get('ASYNC_DATABASE_URL') or config['SQLALCHEMY_DATABASE_URI']
+        self.engines = {None: create_async_engine(
+            async_url(url), **_engine_options(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}))}
+        for key in replica_router.replica_keys:
+            bind = config['SQLALCHEMY_BINDS'][key]
+            bind = bind if isinstance(bind, dict) else {'url': bind}
+            self.engines[key] = create_async_engine(async_url(bind['url']), **_engine_options(bind))
+
+    def session(self, user_id=None, read=True):
+        """新的异步会话；只读且用户不在写后固定窗口内时使用副本"""
+        key = None
+        if read and replica_router.replica_keys and (user_id is None or not replica_router.is_pinned(user_id)):
+            key = replica_router.next_replica()
+        return AsyncSession(self.engines[key], expire_on_commit=False)
+
+    async def dispose(self):
+        for engine in self.engines.values():
+            await engine.dispose()
+        self.engines = {}
+
+
+async_db = AsyncDatabase()
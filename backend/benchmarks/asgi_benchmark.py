@@ -0,0 +1,131 @@
+"""
+ASGI / WSGI 吞吐量对比
+
+在同一数据库、同一并发下，依次用 werkzeug 多线程服务器（WSGI，Flask 同步接口）和 uvicorn（ASGI，
+resources/async_views.py 中的异步接口）承载 http_benchmark 中的只读看板请求，对比吞吐量和延迟分位数。
+只统计两种模式都会处理的接口：http_benchmark 的 GET 负载中已登记为异步视图的部分。
+
+用法（在 backend 目录下，需安装 uvicorn、a2wsgi、greenlet 和异步驱动 aiosqlite/aiomysql）：
+    python -m benchmarks.asgi_benchmark --duration 15 --concurrency 32
+    python -m benchmarks.asgi_benchmark --database mysql://u:p@localhost/poc_bench --no-seed
+
+SQLite 上异步驱动在后台线程中执行查询，差异主要来自调度开销；等待数据库网络往返的收益需在 MySQL 上测量。
+"""
+import argparse
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+
+import uvicorn
+from werkzeug.serving import make_server
+
+from asgi import create_asgi_app
+from benchmarks.http_benchmark import seed, virtual_users, workloads_for, run_load, summarize
+
+
+def read_workloads(views, db_uri):
+    """http_benchmark 负载中由异步视图处理、当前数据库支持的 GET 请求"""
+    paths = {view.path for view in views}
+    workloads = {}
+    for role, actions in workloads_for(db_uri)[0].items():
+        reads = [action for action in actions if action[1] == 'GET' and action[2] in paths]
+        if reads:
+            workloads[role] = reads
+    return workloads
+
+
+def serve_wsgi(app):
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def serve_asgi(asgi_app):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('127.0.0.1', 0))
+    server = uvicorn.Server(uvicorn.Config(asgi_app, log_level='warning', access_log=False))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    def shutdown():
+        server.should_exit = True
+        thread.join()
+        sock.close()
+    return sock.getsockname()[1], shutdown
+
+
+def print_comparison(results):
+    (wsgi_overall, wsgi_endpoints), (asgi_overall, asgi_endpoints) = results['wsgi'], results['asgi']
+    print(f"{'接口':<36}{'WSGI rps':>10}{'ASGI rps':>10}{'WSGI p95':>10}{'ASGI p95':>10}{'错误':>10}")
+    for name in sorted(set(wsgi_endpoints) | set(asgi_endpoints)):
+        w, a = wsgi_endpoints.get(name, {}), asgi_endpoints.get(name, {})
+        print(f"{name:<36}{w.get('throughput_rps', 0):>10.1f}{a.get('throughput_rps', 0):>10.1f}"
+              f"{w.get('p95_ms', 0):>10.1f}{a.get('p95_ms', 0):>10.1f}"
+              f"{w.get('errors', 0):>5}/{a.get('errors', 0):<4}")
+    print(f"{'合计':<36}{wsgi_overall['throughput_rps']:>10.1f}{asgi_overall['throughput_rps']:>10.1f}"
+          f"{wsgi_overall['p95_ms']:>10.1f}{asgi_overall['p95_ms']:>10.1f}"
+          f"{wsgi_overall['errors']:>5}/{asgi_overall['errors']:<4}")
+    for mode, (overall, _) in results.items():
+        print(f"{mode.upper()}: p50 {overall['p50_ms']}ms, p95 {overall['p95_ms']}ms, p99 {overall['p99_ms']}ms, "
+              f"{overall['throughput_rps']} req/s")
+    ratio = asgi_overall['throughput_rps'] / wsgi_overall['throughput_rps'] if wsgi_overall['throughput_rps'] else 0
+    print(f"ASGI/WSGI 吞吐量: {ratio:.2f}x")
+
+
+def run(args):
+    path = None
+    db_uri = args.database
+    if db_uri is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        db_uri = f'sqlite:///{path}'
+    try:
+        asgi_app = create_asgi_app('testing', {
+            'SQLALCHEMY_DATABASE_URI': db_uri,
+            'SQLALCHEMY_ENGINE_OPTIONS': {},
+            'SQLALCHEMY_BINDS': {},
+            'ASGI_WSGI_THREADS': args.concurrency,
+        })
+        if not args.no_seed:
+            seed(asgi_app.app, args.users, args.seed, drop_tables=args.i_know_this_drops_tables)
+        users_by_role = virtual_users(asgi_app.app)
+        workloads = read_workloads(asgi_app.views, db_uri)
+
+        results = {}
+        for mode, serve, target in (('wsgi', serve_wsgi, asgi_app.app), ('asgi', serve_asgi, asgi_app)):
+            port, shutdown = serve(target)
+            try:
+                samples = run_load(port, users_by_role, args.duration, args.warmup,
+                                   args.concurrency, args.seed, workloads)
+            finally:
+                shutdown()
+            results[mode] = summarize(samples, args.duration)
+        print_comparison(results)
+    finally:
+        if path:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ASGI / WSGI 吞吐量对比')
+    parser.add_argument('--database', default=None, help='数据库连接串，默认临时 SQLite 文件')
+    parser.add_argument('--no-seed', action='store_true', help='使用库中已有数据，不重新写入')
+    parser.add_argument('--i-know-this-drops-tables', action='store_true',
+                        help='允许在非 SQLite 数据库上删除重建所有表后写入测试数据')
+    parser.add_argument('--users', type=int, default=200, help='写入的用户数，其他数据按比例生成')
+    parser.add_argument('--duration', type=float, default=15.0, help='每种模式计入统计的压测时长（秒）')
+    parser.add_argument('--warmup', type=float, default=3.0, help='预热时长（秒），不计入统计')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+统计看板并行查询基准测试
+
+在同一份数据上分别以顺序执行（DB_FANOUT_WORKERS=0）和并行执行请求评审人、企业支持者统计接口，
+对比每个接口的延迟中位数，并校验两种模式的响应一致。
+--rtt-ms 在每条SQL执行前等待指定时间，模拟应用与数据库之间的网络往返（本地 SQLite 几乎没有往返开销）。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.fanout_benchmark --rounds 50 --rtt-ms 2
+    python -m benchmarks.fanout_benchmark --database mysql://u:p@db-host/poc_bench --no-seed
+
+全局统计快照（compute_global_statistics）和转化漏斗使用 MySQL 函数，只在 MySQL 上计入对比。
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from benchmarks.http_benchmark import build_app, seed, virtual_users
+from fanout import query_fanout
+from models import db
+
+ENDPOINTS = (
+    ('评审人', '/api/statistics/reviewer'),
+    ('企业支持者', '/api/statistics/supporter'),
+    ('企业支持者', '/api/statistics/supporter/funnel'),
+)
+
+
+def add_round_trip(engine, rtt_ms):
+    """每条SQL执行前等待 rtt_ms 毫秒"""
+    delay = rtt_ms / 1000
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def wait(*args):
+        time.sleep(delay)
+
+
+def measure(client, users, path, rounds):
+    """轮流使用各用户请求 rounds 次，返回 (延迟中位数ms, 响应列表)；接口不可用时返回 None"""
+    latencies, bodies = [], []
+    for i in range(rounds):
+        user = users[i % len(users)]
+        started = time.perf_counter()
+        response = client.get(path, headers=user['headers'])
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            return None
+        bodies.append(response.get_json())
+    return statistics.median(latencies), bodies
+
+
+def run(args):
+    path = None
+    db_uri = args.database
+    if db_uri is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        db_uri = f'sqlite:///{path}'
+    try:
+        app = build_app(db_uri)
+        if not args.no_seed:
+            seed(app, args.users, args.seed, drop_tables=args.i_know_this_drops_tables)
+        users_by_role = virtual_users(app)
+        if args.rtt_ms:
+            with app.app_context():
+                add_round_trip(db.engine, args.rtt_ms)
+        client = app.test_client()
+        workers = app.config['DB_FANOUT_WORKERS'] or 4
+
+        print(f"{'接口':<36}{'顺序 p50':>10}{'并行 p50':>10}{'加速比':>8}  响应一致")
+        for role, endpoint in ENDPOINTS:
+            users = users_by_role[role]
+            results = {}
+            for mode, max_workers in (('sequential', 0), ('parallel', workers)):
+                query_fanout.max_workers = max_workers
+                measure(client, users, endpoint, min(len(users), args.rounds))  # 预热：令牌版本缓存、连接池
+                results[mode] = measure(client, users, endpoint, args.rounds)
+            if results['sequential'] is None or results['parallel'] is None:
+                print(f"{endpoint:<36}{'接口在当前数据库上不可用（需要 MySQL）':>10}")
+                continue
+            (sequential, expected), (parallel, actual) = results['sequential'], results['parallel']
+            print(f"{endpoint:<36}{sequential:>10.2f}{parallel:>10.2f}{sequential / parallel:>7.2f}x  "
+                  f"{'是' if expected == actual else '否'}")
+    finally:
+        if path:
+            os.remove(path)
+
+
+def main():
+    # 漏斗接口在 SQLite 上的报错只影响该接口的结论，不输出堆栈
+    logging.disable(logging.ERROR)
+    parser = argparse.ArgumentParser(description='统计看板并行查询基准测试')
+    parser.add_argument('--database', default=None, help='数据库连接串，默认临时 SQLite 文件')
+    parser.add_argument('--no-seed', action='store_true', help='使用库中已有数据，不重新写入')
+    parser.add_argument('--i-know-this-drops-tables', action='store_true',
+                        help='允许在非 SQLite 数据库上删除重建所有表后写入测试数据')
+    parser.add_argument('--users', type=int, default=200, help='写入的用户数，其他数据按比例生成')
+    parser.add_argument('--rounds', type=int, default=50, help='每个接口每种模式的请求次数')
+    parser.add_argument('--rtt-ms', type=float, default=0.0, help='模拟的数据库往返延迟（毫秒）')
+    parser.add_argument('--seed', type=int, default=42)
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,645 @@
+"""
+端到端 HTTP 负载基准测试
+
+在本地数据库（默认临时 SQLite 文件）上写入测试数据，用 create_app 组装应用并启动真实的 HTTP 服务，
+按角色比例模拟项目负责人、评审人、秘书、企业支持者和管理员的看板浏览与写操作（覆盖 routes.py 中的全部接口，
+包括登录注册、批量导入导出、批量请求和性能分析下载），
+统计每个接口的 p50/p95/p99 延迟、吞吐量和每请求SQL语句数，结果可保存为 JSON 并与上次结果对比。
+5xx 和连接失败计为错误；4xx（重复提交、资源已关闭等业务规则拒绝）单独计为拒绝。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.http_benchmark --duration 30 --concurrency 8 --output results.json
+    python -m benchmarks.http_benchmark --compare results.json --output new.json   # 对比并标记回退
+    python -m benchmarks.http_benchmark --database mysql://u:p@localhost/poc_bench --no-seed
+    python -m benchmarks.http_benchmark --database mysql://u:p@localhost/poc_bench --i-know-this-drops-tables
+
+写入测试数据会删除重建所有表：非 SQLite 数据库必须加 --i-know-this-drops-tables，否则拒绝运行。
+SQLite 不支持 date_format、timestampdiff 等 MySQL 函数，全局统计和转化漏斗接口只在 MySQL 上计入负载。
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from werkzeug.serving import make_server
+
+from app_new import create_app
+from benchmarks.login_benchmark import percentile
+from datagen import Scale, generate
+from models import (
+    db, User, Team, UserInTeam, Project, ReviewTask, ProofOfConcept, Milestone, FundRecord, SupportIntention,
+    IncubationResource, ResourceApplication
+)
+from resources.exports import EXPORT_DATASETS
+from tokens import build_claims
+
+ROLE_MIX = (('项目参与者', 50), ('评审人', 20), ('秘书', 10), ('企业支持者', 15), ('管理员', 5))
+
+INCUBATING_STATUSES = {'孵化中', '概念验证中'}
+INCUBATION_EDITABLE_STATUSES = ('已通过', '孵化中', '概念验证中')
+
+# 使用 MySQL 专有函数（date_format、timestampdiff 等）的接口，其他数据库上不计入负载
+MYSQL_ONLY_PATHS = {'/api/statistics', '/api/statistics/supporter/funnel'}
+
+# 不携带令牌的接口
+ANONYMOUS_PATHS = {'/api/login', '/api/register'}
+
+# seed 为每个队长额外创建的备用用户（不参与压测），用于邀请和移出团队成员
+SPARE_USER_PREFIX = 'bench_spare_'
+
+# datagen 生成的用户的登录密码
+SEED_PASSWORD = 'password123'
+
+
+def _unique(rng):
+    return rng.randint(1, 10 ** 9)
+
+
+def _comment_body(rng, values):
+    return {'content': f'进展同步 {rng.randint(1, 10 ** 6)}'}
+
+
+def _project_body(rng, values):
+    return {'project_name': f'压测项目{_unique(rng)}', 'domain': rng.choice(['AI', '新材料', '生物医药'])}
+
+
+def _review_body(rng, values):
+    return {'innovation': rng.randint(10, 25), 'feasibility': rng.randint(10, 25),
+            'potentiality': rng.randint(10, 25), 'teamwork': rng.randint(10, 25), 'comment': '压测评审'}
+
+
+def _resource_body(rng, values):
+    return {'title': f'压测资源{_unique(rng)}', 'resource_type': '技术支持'}
+
+
+def _login_body(rng, values):
+    return {'user_name': values['me'], 'password': SEED_PASSWORD}
+
+
+def _register_body(rng, values):
+    return {'user_name': f'bench_reg_{_unique(rng)}', 'password': SEED_PASSWORD, 'real_name': '压测注册'}
+
+
+def _team_body(rng, values):
+    return {'team_name': f'压测团队{_unique(rng)}', 'domain': 'AI'}
+
+
+def _invite_body(rng, values):
+    return {'user_name': values['spare']['user_name']}
+
+
+def _incubation_body(rng, values):
+    return {'incubation_plan': '压测孵化计划', 'progress': rng.randint(0, 100)}
+
+
+def _poc_body(rng, values):
+    return {'title': f'压测验证{_unique(rng)}', 'verification_objective': '验证目标'}
+
+
+def _poc_update_body(rng, values):
+    return {'verification_result': f'压测结果{rng.randint(1, 100)}'}
+
+
+def _milestone_body(rng, values):
+    return {'status': rng.choice(['未开始', '进行中', '已完成'])}
+
+
+def _expenditure_body(rng, values):
+    return {'project_id': values['funded_project_id'], 'amount': rng.randint(1, 10), 'title': '压测报销'}
+
+
+def _achievement_body(rng, values):
+    return {'project_id': values['project_id'], 'title': f'压测成果{_unique(rng)}', 'type': '论文'}
+
+
+def _intention_status_body(rng, values):
+    return {'intention_id': values['intention']['intention_id'], 'status': rng.choice(['已对接', '已婉拒'])}
+
+
+def _apply_body(rng, values):
+    return {'project_id': values['project_id'], 'message': '压测申请'}
+
+
+def _batch_body(rng, values):
+    project_id = values['project_id']
+    return {'requests': [{'path': f'/api/projects/{project_id}'},
+                         {'path': f'/api/projects/{project_id}/milestones'},
+                         {'path': f'/api/projects/{project_id}/comments'}]}
+
+
+def _audit_body(rng, values):
+    return {'result': rng.choice(['通过', '未通过']), 'comment': '压测初审'}
+
+
+def _assign_body(rng, values):
+    return {'reviewer_id': values['reviewer_id']}
+
+
+def _fund_body(rng, values):
+    return {'project_id': values['project_id'], 'amount': rng.randint(1000, 10000), 'title': '压测下拨'}
+
+
+def _intention_body(rng, values):
+    return {'project_id': values['project_id'], 'support_type': '资金支持', 'message': '压测意向'}
+
+
+def _application_handle_body(rng, values):
+    return {'status': rng.choice(['对接中', '已达成', '已拒绝']), 'reply': '压测回复'}
+
+
+def _user_body(rng, values):
+    return {'user_name': f'bench_user_{_unique(rng)}', 'password': SEED_PASSWORD, 'real_name': '压测用户',
+            'role': '项目参与者'}
+
+
+def _user_update_body(rng, values):
+    # 只修改单位：修改角色会使该用户的令牌失效
+    return {'user_id': values['user_id'], 'affiliation': f'压测单位{rng.randint(1, 100)}'}
+
+
+def _import_body(rng, values):
+    return {'users': [{'user_name': f'bench_import_{_unique(rng)}', 'password': SEED_PASSWORD}
+                      for _ in range(2)]}
+
+
+# 每个角色的操作：(权重, 方法, 路径模板, 请求体生成函数[, 请求体需要的数据名])
+# 路径中的 <名称> 或 <名称.字段> 从该用户的数据中随机选取，同一操作中同名数据取同一个值；
+# 方法为 FLOW 时第三项为依次执行的 (方法, 路径模板, 请求体生成函数) 步骤，各步骤分别计入统计
+# ProjectResource 同时注册在 /api/projects/<project_id> 上的 POST 不接受 project_id，不是实际的操作，未计入
+WORKLOADS = {
+    '项目参与者': [
+        (10, 'GET', '/api/projects', None),
+        (8, 'GET', '/api/projects/<project_id>', None),
+        (3, 'GET', '/api/projects/<project_id>/overview', None),
+        (4, 'GET', '/api/projects/<project_id>/milestones', None),
+        (4, 'GET', '/api/projects/<project_id>/comments', None),
+        (3, 'GET', '/api/projects/<project_id>/funds', None),
+        (2, 'GET', '/api/projects/<project_id>/achievements', None),
+        (2, 'GET', '/api/projects/<project_id>/incubation', None),
+        (2, 'GET', '/api/projects/<project_id>/poc', None),
+        (2, 'GET', '/api/projects/<project_id>/intentions', None),
+        (2, 'GET', '/api/poc/<poc_id>', None),
+        (5, 'GET', '/api/notifications', None),
+        (3, 'GET', '/api/teams/my', None),
+        (1, 'GET', '/api/teams/<team_id>/members', None),
+        (3, 'GET', '/api/statistics/user', None),
+        (2, 'GET', '/api/public/resources', None),
+        (1, 'GET', '/api/my/resource-applications', None),
+        (1, 'POST', '/api/batch', _batch_body, ('project_id',)),
+        (2, 'POST', '/api/projects/<project_id>/comments', _comment_body),
+        (1, 'POST', '/api/projects', _project_body),
+        (1, 'POST', '/api/teams', _team_body),
+        (1, 'FLOW', (('POST', '/api/teams/<led_team_id>/members', _invite_body),
+                     ('DELETE', '/api/teams/<led_team_id>/members?user_id=<spare.user_id>', None))),
+        (1, 'POST', '/api/projects/<incubation_project_id>/incubation', _incubation_body),
+        (1, 'POST', '/api/projects/<incubation_project_id>/poc', _poc_body),
+        (1, 'PUT', '/api/poc/<poc_id>', _poc_update_body),
+        (1, 'PUT', '/api/milestones/<milestone_id>', _milestone_body),
+        (1, 'POST', '/api/expenditures', _expenditure_body, ('funded_project_id',)),
+        (1, 'POST', '/api/achievements', _achievement_body, ('project_id',)),
+        (1, 'PUT', '/api/projects/<intention.project_id>/intentions', _intention_status_body),
+        (1, 'POST', '/api/resources/<open_resource_id>/apply', _apply_body, ('project_id',)),
+        (1, 'POST', '/api/login', _login_body, ('me',)),
+        (1, 'POST', '/api/register', _register_body),
+    ],
+    '评审人': [
+        (10, 'GET', '/api/reviews/my-tasks', None),
+        (4, 'GET', '/api/reviewer/incubation-projects', None),
+        (5, 'GET', '/api/statistics/reviewer', None),
+        (5, 'GET', '/api/projects/<project_id>', None),
+        (4, 'GET', '/api/notifications', None),
+        (2, 'POST', '/api/reviews/<task_id>', _review_body),
+    ],
+    '秘书': [
+        (8, 'GET', '/api/projects', None),
+        (5, 'GET', '/api/projects/<project_id>', None),
+        (5, 'GET', '/api/statistics', None),
+        (2, 'GET', '/api/statistics/reviewer/calibration', None),
+        (3, 'GET', '/api/admin/users', None),
+        (2, 'GET', '/api/teams', None),
+        (3, 'GET', '/api/notifications', None),
+        (2, 'POST', '/api/projects/<pending_project_id>/audit', _audit_body),
+        (1, 'POST', '/api/projects/<project_id>/assign', _assign_body, ('reviewer_id',)),
+        (1, 'POST', '/api/funds', _fund_body, ('project_id',)),
+    ],
+    '企业支持者': [
+        (8, 'GET', '/api/supporter/projects', None),
+        (5, 'GET', '/api/statistics/supporter', None),
+        (2, 'GET', '/api/statistics/supporter/funnel', None),
+        (4, 'GET', '/api/supporter/my-resources', None),
+        (2, 'GET', '/api/supporter/resources', None),
+        (3, 'GET', '/api/resources/<resource_id>/applications', None),
+        (3, 'GET', '/api/public/resources', None),
+        (1, 'POST', '/api/supporter/resources', _resource_body),
+        (1, 'POST', '/api/support/intentions', _intention_body, ('project_id',)),
+        (1, 'PUT', '/api/applications/<application_id>/handle', _application_handle_body),
+    ],
+    '管理员': [
+        (5, 'GET', '/api/admin/users', None),
+        (5, 'GET', '/api/statistics', None),
+        (3, 'GET', '/api/projects', None),
+        (2, 'GET', '/api/teams', None),
+        (1, 'GET', '/api/admin/db-pool', None),
+        (1, 'GET', '/api/metrics', None),
+        (1, 'GET', '/api/admin/export/<dataset>', None),
+        (1, 'GET', '/api/admin/profiles', None),
+        (1, 'GET', '/api/admin/profiles/<profile_id>?format=json', None),
+        (1, 'POST', '/api/admin/users', _user_body),
+        (1, 'PUT', '/api/admin/users', _user_update_body, ('user_id',)),
+        (1, 'POST', '/api/admin/import', _import_body),
+    ],
+}
+
+_PLACEHOLDER = re.compile(r'<(\w+)(?:\.(\w+))?>')
+
+
+def workloads_for(db_uri, workloads=WORKLOADS):
+    """按数据库过滤负载：非 MySQL 数据库上去掉 MYSQL_ONLY_PATHS 中的接口，返回 (负载, 跳过的接口)"""
+    if db_uri.startswith('mysql'):
+        return workloads, []
+    skipped = sorted({action[2] for actions in workloads.values() for action in actions
+                      if action[2] in MYSQL_ONLY_PATHS})
+    return {role: [action for action in actions if action[2] not in MYSQL_ONLY_PATHS]
+            for role, actions in workloads.items()}, skipped
+
+
+def build_app(db_uri):
+    return create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': db_uri,
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+        'SQLALCHEMY_BINDS': {},
+        'DB_QUERY_HEADERS': True,
+        'DB_N_PLUS_ONE_THRESHOLD': 0,
+    })
+
+
+def _weighted(rng, pairs):
+    return rng.choices([item for item, _ in pairs], weights=[weight for _, weight in pairs])[0]
+
+
+def is_disposable(db_uri):
+    """SQLite 文件或内存库：seed 可以删除重建"""
+    return db_uri.startswith('sqlite')
+
+
+def seed(app, users, seed_value, drop_tables=False):
+    """删除并重建全部表，用 datagen 按用户数等比例生成全部业务表的数据，并为每个队长创建一个备用用户
+
+    非 SQLite 数据库需显式传入 drop_tables=True（命令行 --i-know-this-drops-tables），避免误删真实数据
+    """
+    db_uri = app.config['SQLALCHEMY_DATABASE_URI']
+    if not is_disposable(db_uri) and not drop_tables:
+        raise SystemExit(f"拒绝在 {db_uri.split('@')[-1]} 上删除重建所有表：请确认这是压测专用库后加 "
+                         f"--i-know-this-drops-tables，或使用 --no-seed")
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        generate(db.engine, Scale(users=users, projects=users * 2, notifications=users * 10, comments=users * 3),
+                 seed=seed_value)
+        password_hash = db.session.query(User.password_hash).limit(1).scalar()
+        leaders = [leader_id for (leader_id,) in db.session.query(Team.leader_id).distinct()
+                   if leader_id is not None]
+        db.session.execute(insert(User), [
+            {'user_name': f'{SPARE_USER_PREFIX}{leader_id}', 'password_hash': password_hash,
+             'real_name': '备用成员', 'role': '项目参与者'} for leader_id in leaders
+        ])
+        db.session.commit()
+        db.session.remove()
+
+
+def _group(rows):
+    """[(键, 值), ...] -> {键: [值, ...]}"""
+    grouped = defaultdict(list)
+    for key, value in rows:
+        grouped[key].append(value)
+    return grouped
+
+
+def virtual_users(app):
+    """每个用户的令牌及其可访问的数据ID，用于填充路径模板（备用用户除外）"""
+    result = defaultdict(list)
+    with app.app_context():
+        session = db.session
+        projects = session.query(Project.project_id, Project.principal_id, Project.status).all()
+        all_projects = [p.project_id for p in projects]
+        incubating = [p.project_id for p in projects if p.status in INCUBATING_STATUSES]
+        pending = [p.project_id for p in projects if p.status == '待初审']
+        owned = _group((p.principal_id, p.project_id) for p in projects)
+        editable = _group((p.principal_id, p.project_id) for p in projects
+                          if p.status in INCUBATION_EDITABLE_STATUSES)
+        funded = set(pid for (pid,) in session.query(FundRecord.project_id).distinct())
+        pocs = _group(session.query(Project.principal_id, ProofOfConcept.poc_id)
+                      .join(ProofOfConcept, ProofOfConcept.project_id == Project.project_id))
+        milestones = _group(session.query(Project.principal_id, Milestone.milestone_id)
+                            .join(Milestone, Milestone.project_id == Project.project_id))
+        intentions = _group((r.principal_id, {'project_id': r.project_id, 'intention_id': r.intention_id})
+                            for r in session.query(Project.principal_id, SupportIntention.project_id,
+                                                   SupportIntention.intention_id)
+                            .join(SupportIntention, SupportIntention.project_id == Project.project_id))
+        teams = _group(session.query(UserInTeam.user_id, UserInTeam.team_id))
+        led_teams = _group(session.query(Team.leader_id, Team.team_id))
+        spares = {int(name[len(SPARE_USER_PREFIX):]): {'user_id': uid, 'user_name': name}
+                  for uid, name in session.query(User.user_id, User.user_name)
+                  .filter(User.user_name.like(f'{SPARE_USER_PREFIX}%'))}
+        resources = _group(session.query(IncubationResource.provider_id, IncubationResource.resource_id))
+        open_resources = [rid for (rid,) in session.query(IncubationResource.resource_id)
+                          .filter(IncubationResource.status == '开放中')]
+        applications = _group(session.query(IncubationResource.provider_id, ResourceApplication.application_id)
+                              .join(ResourceApplication,
+                                    ResourceApplication.resource_id == IncubationResource.resource_id))
+        reviewers = [uid for (uid,) in session.query(User.user_id).filter(User.role == '评审人')]
+        user_ids = [uid for (uid,) in session.query(User.user_id)]
+
+        for user in User.query.filter(~User.user_name.like(f'{SPARE_USER_PREFIX}%')).order_by(User.user_id):
+            token = create_access_token(identity=str(user.user_id), additional_claims=build_claims(user))
+            uid = user.user_id
+            ids = {'project_id': all_projects}
+            if user.role == '项目参与者':
+                ids.update({
+                    'project_id': owned.get(uid, []),
+                    'incubation_project_id': editable.get(uid, []),
+                    'funded_project_id': [pid for pid in owned.get(uid, []) if pid in funded],
+                    'poc_id': pocs.get(uid, []),
+                    'milestone_id': milestones.get(uid, []),
+                    'intention': intentions.get(uid, []),
+                    'team_id': teams.get(uid, []),
+                    'led_team_id': led_teams.get(uid, []) if uid in spares else [],
+                    'spare': [spares[uid]] if uid in spares else [],
+                    'open_resource_id': open_resources,
+                    'me': [user.user_name],
+                })
+            elif user.role == '评审人':
+                tasks = session.query(ReviewTask.task_id, ReviewTask.project_id)\
+                    .filter(ReviewTask.reviewer_id == uid).all()
+                ids['task_id'] = [t for t, _ in tasks]
+                ids['project_id'] = [p for _, p in tasks]
+            elif user.role == '秘书':
+                ids.update({'pending_project_id': pending, 'reviewer_id': reviewers})
+            elif user.role == '企业支持者':
+                ids.update({
+                    'project_id': incubating,
+                    'resource_id': resources.get(uid, []),
+                    'application_id': applications.get(uid, []),
+                })
+            elif user.role == '管理员':
+                ids.update({'user_id': user_ids, 'dataset': list(EXPORT_DATASETS)})
+            result[user.role].append({'headers': {'Authorization': f'Bearer {token}'}, 'ids': ids})
+        db.session.remove()
+    return result
+
+
+def record_profile(app, users_by_role):
+    """以管理员身份做一次带 X-Profile 的请求，使性能分析结果的列表和下载接口有数据可取"""
+    admins = users_by_role.get('管理员')
+    if not admins:
+        return
+    response = app.test_client().get('/api/statistics/user', headers={**admins[0]['headers'], 'X-Profile': '1'})
+    profile_id = response.headers.get('X-Profile-Id')
+    for admin in admins:
+        admin['ids']['profile_id'] = [profile_id] if profile_id else []
+
+
+def _steps(action):
+    """操作的 (方法, 路径模板, 请求体生成函数) 步骤，以及请求体额外需要的数据名"""
+    if action[1] == 'FLOW':
+        return action[2], ()
+    return ((action[1], action[2], action[3]),), action[4] if len(action) > 4 else ()
+
+
+def _pick_request(rng, users_by_role, workloads):
+    """随机选取一个操作，返回其请求列表 [(接口名, 方法, 路径, 请求体, 请求头), ...]"""
+    role = _weighted(rng, [(r, w) for r, w in ROLE_MIX if users_by_role.get(r) and workloads.get(r)])
+    user = rng.choice(users_by_role[role])
+    while True:
+        steps, needs = _steps(_weighted(rng, [(action, action[0]) for action in workloads[role]]))
+        names = {name for _, template, _ in steps for name, _ in _PLACEHOLDER.findall(template)} | set(needs)
+        if all(user['ids'].get(name) for name in names):
+            break
+    values = {name: rng.choice(user['ids'][name]) for name in sorted(names)}
+
+    def fill(match):
+        value = values[match.group(1)]
+        return str(value[match.group(2)] if match.group(2) else value)
+
+    requests = []
+    for method, template, body in steps:
+        path = _PLACEHOLDER.sub(fill, template)
+        headers = {} if template in ANONYMOUS_PATHS else user['headers']
+        requests.append((f'{method} {template}', method, path, body(rng, values) if body else None, headers))
+    return requests
+
+
+def run_load(port, users_by_role, duration, warmup, concurrency, seed_value, workloads=WORKLOADS):
+    """多线程保持连接发送请求，返回 {接口: [(状态码, 延迟秒, SQL数, 数据库毫秒), ...]}"""
+    results = defaultdict(list)
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def worker(index):
+        rng = random.Random(seed_value + index)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        local = defaultdict(list)
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            for name, method, path, body, headers in _pick_request(rng, users_by_role, workloads):
+                payload = json.dumps(body).encode('utf-8') if body is not None else None
+                request_headers = dict(headers)
+                if payload is not None:
+                    request_headers['Content-Type'] = 'application/json'
+                t0 = time.perf_counter()
+                try:
+                    conn.request(method, path, body=payload, headers=request_headers)
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                    queries = int(response.getheader('X-DB-Query-Count', 0))
+                    db_ms = float(response.getheader('X-DB-Time', 0))
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                    status, queries, db_ms = 0, 0, 0.0
+                if t0 >= measure_from:
+                    local[name].append((status, time.perf_counter() - t0, queries, db_ms))
+        conn.close()
+        with lock:
+            for name, samples in local.items():
+                results[name].extend(samples)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def summarize(results, duration):
+    endpoints = {}
+    for name, samples in sorted(results.items()):
+        latencies = sorted(latency for _, latency, _, _ in samples)
+        # 5xx 和连接失败计为错误；4xx 是业务规则拒绝（如重复提交），单独计数
+        errors = sum(1 for status, _, _, _ in samples if status == 0 or status >= 500)
+        rejected = sum(1 for status, _, _, _ in samples if 400 <= status < 500)
+        endpoints[name] = {
+            'requests': len(samples),
+            'errors': errors,
+            'rejected': rejected,
+            'throughput_rps': round(len(samples) / duration, 2),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+            'queries_per_request': round(sum(q for _, _, q, _ in samples) / len(samples), 2),
+            'db_ms_per_request': round(sum(d for _, _, _, d in samples) / len(samples), 2),
+        }
+    all_latencies = sorted(latency for samples in results.values() for _, latency, _, _ in samples)
+    total = len(all_latencies)
+    overall = {
+        'requests': total,
+        'errors': sum(e['errors'] for e in endpoints.values()),
+        'throughput_rps': round(total / duration, 2),
+        'p50_ms': round(percentile(all_latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(all_latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(all_latencies, 99) * 1000, 2),
+    }
+    return overall, endpoints
+
+
+def compare(current, baseline, threshold, min_requests=20):
+    """与基线对比：p95 延迟或每请求SQL数上升、吞吐下降超过阈值时记为回退"""
+    regressions = []
+    for name, now in current['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before or min(now['requests'], before['requests']) < min_requests:
+            continue
+        if before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now['queries_per_request'] > before['queries_per_request'] + 0.5:
+            regressions.append(f"{name}: 每请求SQL {before['queries_per_request']} -> {now['queries_per_request']}")
+        if now['errors'] / now['requests'] > before['errors'] / before['requests'] + 0.01:
+            regressions.append(f"{name}: 错误数 {before['errors']}/{before['requests']} -> "
+                               f"{now['errors']}/{now['requests']}")
+    before, now = baseline.get('overall', {}), current['overall']
+    if before.get('throughput_rps') and now['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+        regressions.append(f"总吞吐量 {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+    return regressions
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(overall, endpoints):
+    print(f"{'接口':<60}{'请求':>7}{'错误':>6}{'拒绝':>6}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+          f"{'SQL/请求':>10}{'DB ms':>8}")
+    for name, s in endpoints.items():
+        print(f"{name:<60}{s['requests']:>7}{s['errors']:>6}{s.get('rejected', 0):>6}{s['throughput_rps']:>8}"
+              f"{s['p50_ms']:>9}"
+              f"{s['p95_ms']:>9}{s['p99_ms']:>9}{s['queries_per_request']:>10}{s['db_ms_per_request']:>8}")
+    print(f"总计: {overall['requests']} 请求, {overall['errors']} 错误, {overall['throughput_rps']} req/s, "
+          f"p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms")
+
+
+def run(args):
+    path = None
+    db_uri = args.database
+    if db_uri is None:
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        db_uri = f'sqlite:///{path}'
+    server = None
+    try:
+        app = build_app(db_uri)
+        if not args.no_seed:
+            seed(app, args.users, args.seed, drop_tables=args.i_know_this_drops_tables)
+        users_by_role = virtual_users(app)
+        record_profile(app, users_by_role)
+        workloads, skipped = workloads_for(db_uri)
+        if skipped:
+            print(f"当前数据库不支持、未计入负载的接口（需要 MySQL）: {', '.join(skipped)}")
+
+        # 关闭逐请求访问日志，避免终端输出影响测量
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = run_load(server.server_port, users_by_role, args.duration, args.warmup,
+                           args.concurrency, args.seed, workloads)
+        overall, endpoints = summarize(results, args.duration)
+        print_report(overall, endpoints)
+
+        report = {
+            'meta': {
+                'created_at': datetime.now().isoformat(),
+                'git_revision': _git_revision(),
+                'database': db_uri.split(':', 1)[0],
+                'users': args.users,
+                'duration': args.duration,
+                'concurrency': args.concurrency,
+                'python': sys.version.split()[0],
+                'skipped': skipped,
+            },
+            'overall': overall,
+            'endpoints': endpoints,
+        }
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"结果已保存到 {args.output}")
+
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare(report, baseline, args.threshold)
+            if regressions:
+                print(f"与 {args.compare} 相比发现 {len(regressions)} 处回退：")
+                for line in regressions:
+                    print(f"  - {line}")
+                return False
+            print(f"与 {args.compare} 相比未发现回退")
+        return True
+    finally:
+        if server is not None:
+            server.shutdown()
+        if path:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='端到端 HTTP 负载基准测试')
+    parser.add_argument('--database', default=None, help='数据库连接串，默认临时 SQLite 文件')
+    parser.add_argument('--no-seed', action='store_true', help='使用库中已有数据，不重新写入')
+    parser.add_argument('--i-know-this-drops-tables', action='store_true',
+                        help='允许在非 SQLite 数据库上删除重建所有表后写入测试数据')
+    parser.add_argument('--users', type=int, default=200, help='写入的用户数，其他数据按比例生成')
+    parser.add_argument('--duration', type=float, default=20.0, help='计入统计的压测时长（秒）')
+    parser.add_argument('--warmup', type=float, default=3.0, help='预热时长（秒），不计入统计')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42, help='随机种子，保证多次运行的请求序列一致')
+    parser.add_argument('--output', default=None, help='保存结果的 JSON 文件')
+    parser.add_argument('--compare', default=None, help='作为基线对比的上次结果 JSON 文件')
+    parser.add_argument('--threshold', type=float, default=0.2, help='判定回退的相对阈值，默认 20%%')
+    raise SystemExit(0 if run(parser.parse_args()) else 1)
+
+
+if __name__ == '__main__':
+    main()
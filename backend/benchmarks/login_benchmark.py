@@ -0,0 +1,104 @@
+"""
+登录吞吐量基准测试
+
+在临时 SQLite 数据库上启动应用，用多线程并发调用 /api/login，
+统计吞吐量、延迟分位数以及因哈希队列已满而被拒绝（503）的请求数。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.login_benchmark --requests 200 --concurrency 32 --rounds 10
+    python -m benchmarks.login_benchmark --stored-rounds 10 --rounds 11   # 测量重新哈希开销
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app_new import create_app
+from config import Config
+from models import db, User
+from passwords import hash_password, password_hasher
+
+PASSWORD = 'benchmark-password'
+
+
+def build_app(db_uri, rounds, workers, queue_limit):
+    return create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': db_uri,
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+        'SQLALCHEMY_BINDS': {},
+        'BCRYPT_ROUNDS': rounds,
+        'PASSWORD_HASH_WORKERS': workers,
+        'PASSWORD_HASH_QUEUE_LIMIT': queue_limit,
+    })
+
+
+def seed_users(app, count, rounds):
+    password_hash = hash_password(PASSWORD, rounds)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(user_name=f'bench{i}', real_name=f'bench{i}', role='项目参与者', password_hash=password_hash)
+            for i in range(count)
+        ])
+        db.session.commit()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(args):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{path}', args.rounds, args.workers, args.queue_limit)
+        seed_users(app, args.users, args.stored_rounds or args.rounds)
+
+        def login(i):
+            client = app.test_client()
+            started = time.perf_counter()
+            response = client.post('/api/login', json={'user_name': f'bench{i % args.users}', 'password': PASSWORD})
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(login, range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for status, latency in results if status == 200)
+        statuses = {}
+        for status, _ in results:
+            statuses[status] = statuses.get(status, 0) + 1
+
+        print(f"bcrypt rounds={args.rounds} workers={password_hasher.workers} "
+              f"queue_limit={args.queue_limit} concurrency={args.concurrency}")
+        print(f"requests={args.requests} elapsed={elapsed:.2f}s "
+              f"throughput={len(latencies) / elapsed:.1f} logins/s")
+        print(f"status codes: {statuses}")
+        if latencies:
+            print(f"latency p50={percentile(latencies, 50) * 1000:.1f}ms "
+                  f"p95={percentile(latencies, 95) * 1000:.1f}ms "
+                  f"p99={percentile(latencies, 99) * 1000:.1f}ms")
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='登录吞吐量基准测试')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=Config.BCRYPT_ROUNDS)
+    parser.add_argument('--stored-rounds', type=int, default=None,
+                        help='种子用户的哈希cost，与 --rounds 不同时会触发登录时重新哈希')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--queue-limit', type=int, default=Config.PASSWORD_HASH_QUEUE_LIMIT)
+    run(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
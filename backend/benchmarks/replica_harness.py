@@ -0,0 +1,130 @@
+"""
+读写分离验证脚本
+
+用两个独立数据库分别充当主库和只读副本（默认两个临时 SQLite 文件），
+两边写入内容不同的同一批数据，通过响应内容判断每个请求实际读的是哪个库：
+- GET 请求读副本，POST 请求写主库
+- 用户提交写操作后，在固定窗口内其 GET 请求读主库，其他用户仍读副本
+- 窗口过期后恢复读副本
+- @on_replica 装饰的后台只读任务（如全局统计快照）走副本
+
+用法（在 backend 目录下）：
+    python -m benchmarks.replica_harness
+    python -m benchmarks.replica_harness --primary mysql://u:p@127.0.0.1:3306/poc --replica mysql://u:p@127.0.0.1:3307/poc
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy.orm import Session
+
+from app_new import create_app
+from db_routing import on_replica
+from models import db, User, Team, UserInTeam, Project
+from tokens import build_claims
+
+
+def build_app(primary_uri, replica_uri, pin_seconds):
+    return create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': primary_uri,
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+        'SQLALCHEMY_BINDS': {'replica_0': replica_uri},
+        'DB_REPLICA_PIN_SECONDS': pin_seconds,
+    })
+
+
+def seed(app, label):
+    """在指定库中写入两名用户、一个团队和一个以库名命名的项目"""
+    engine = db.engines[None if label == 'primary' else 'replica_0']
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    with Session(bind=engine) as session:
+        users = [User(user_name=f'user{i}', real_name=f'user{i}', role='项目参与者', password_hash='-')
+                 for i in range(2)]
+        session.add_all(users)
+        session.flush()
+        team = Team(team_name='团队', leader_id=users[0].user_id)
+        session.add(team)
+        session.flush()
+        session.add_all([UserInTeam(user_id=u.user_id, team_id=team.team_id) for u in users])
+        session.add(Project(project_name=label, team_id=team.team_id, principal_id=users[0].user_id,
+                            maturity_level='研发阶段', status='待初审'))
+        session.commit()
+        return [u.user_id for u in users]
+
+
+@on_replica
+def count_projects():
+    return db.session.query(Project).count()
+
+
+def project_names(client, headers):
+    return sorted(p['project_name'] for p in client.get('/api/projects', headers=headers).get_json())
+
+
+def check(label, actual, expected):
+    status = 'OK  ' if actual == expected else 'FAIL'
+    print(f"[{status}] {label}: {actual}")
+    return actual == expected
+
+
+def run(args):
+    paths = []
+    primary, replica = args.primary, args.replica
+    for name in ('primary', 'replica'):
+        if (primary if name == 'primary' else replica) is None:
+            fd, path = tempfile.mkstemp(suffix=f'-{name}.db')
+            os.close(fd)
+            paths.append(path)
+            if name == 'primary':
+                primary = f'sqlite:///{path}'
+            else:
+                replica = f'sqlite:///{path}'
+    try:
+        app = build_app(primary, replica, args.pin_seconds)
+        with app.app_context():
+            writer, reader = seed(app, 'primary')
+            seed(app, 'replica')
+            headers = {}
+            for uid in (writer, reader):
+                user = db.session.get(User, uid)
+                token = create_access_token(identity=str(uid), additional_claims=build_claims(user))
+                headers[uid] = {'Authorization': f'Bearer {token}'}
+            db.session.remove()
+
+        client = app.test_client()
+        results = [
+            check('GET 读副本', project_names(client, headers[writer]), ['replica']),
+        ]
+        response = client.post('/api/projects', json={'project_name': 'new'}, headers=headers[writer])
+        results.append(check('POST 写主库', response.status_code, 201))
+        results.append(check('写入者在固定窗口内读主库', project_names(client, headers[writer]), ['new', 'primary']))
+        results.append(check('其他用户仍读副本', project_names(client, headers[reader]), ['replica']))
+
+        time.sleep(args.pin_seconds + 0.2)
+        results.append(check('窗口过期后写入者恢复读副本', project_names(client, headers[writer]), ['replica']))
+
+        with app.app_context():
+            total = count_projects()
+            db.session.remove()
+        results.append(check('后台只读任务读副本', total, 1))
+
+        print(f"{sum(results)}/{len(results)} 项通过")
+        return all(results)
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='读写分离验证')
+    parser.add_argument('--primary', default=None, help='主库连接串，默认临时 SQLite 文件')
+    parser.add_argument('--replica', default=None, help='副本连接串，默认临时 SQLite 文件')
+    parser.add_argument('--pin-seconds', type=float, default=1.0)
+    raise SystemExit(0 if run(parser.parse_args()) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+行序列化基准测试
+
+对比项目列表和留言列表的三种写法的每行耗时（查询 + 转换，每轮使用新会话，与单个请求一致）：
+- orm：查询完整 ORM 对象，逐字段手写字典（改造前的写法）
+- schema：只选取 Schema 声明的列，用编译后的 dump_all 转换
+- dto：只选取声明的列，转为带 __slots__ 的 DTO 对象
+另外单独测量已取出行的纯转换耗时。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.row_serializer_benchmark --users 2000 --repeat 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.http_benchmark import build_app, seed
+from models import db, User, Project, IncubationComment
+from schemas import ProjectListSchema, CommentSchema
+
+
+def orm_projects():
+    rows = db.session.query(Project, User.user_name) \
+        .outerjoin(User, Project.principal_id == User.user_id).all()
+    return [{
+        'project_id': p.project_id,
+        'project_name': p.project_name,
+        'domain': p.domain,
+        'status': p.status,
+        'principal_name': p_name or '未知'
+    } for p, p_name in rows]
+
+
+def schema_projects():
+    return ProjectListSchema.dump_all(ProjectListSchema.query()
+                                      .outerjoin(User, Project.principal_id == User.user_id))
+
+
+def dto_projects():
+    return ProjectListSchema.load_all(ProjectListSchema.query()
+                                      .outerjoin(User, Project.principal_id == User.user_id))
+
+
+def orm_comments():
+    rows = db.session.query(IncubationComment, User.real_name, User.role, User.affiliation) \
+        .join(User, IncubationComment.user_id == User.user_id).all()
+    return [{
+        'comment_id': c.IncubationComment.comment_id,
+        'project_id': c.IncubationComment.project_id,
+        'user_id': c.IncubationComment.user_id,
+        'content': c.IncubationComment.content,
+        'parent_id': c.IncubationComment.parent_id,
+        'create_time': str(c.IncubationComment.create_time),
+        'user_name': c.real_name or '未知',
+        'user_role': c.role,
+        'user_affiliation': c.affiliation or ''
+    } for c in rows]
+
+
+def schema_comments():
+    return CommentSchema.dump_all(CommentSchema.query().join(User, IncubationComment.user_id == User.user_id))
+
+
+def dto_comments():
+    return CommentSchema.load_all(CommentSchema.query().join(User, IncubationComment.user_id == User.user_id))
+
+
+CASES = {
+    '项目列表': (orm_projects, schema_projects, dto_projects),
+    '留言列表': (orm_comments, schema_comments, dto_comments),
+}
+
+
+def measure(fn, repeat):
+    """返回 (每行微秒中位数, 行数)"""
+    samples, count = [], 0
+    for _ in range(repeat):
+        db.session.remove()
+        started = time.perf_counter()
+        count = len(fn())
+        samples.append(time.perf_counter() - started)
+    db.session.remove()
+    return statistics.median(samples) / max(count, 1) * 1e6, count
+
+
+def measure_convert(repeat):
+    """只测转换：行已取出，比较手写字典和编译后的 dump_all，返回每行微秒"""
+    join = (User, Project.principal_id == User.user_id)
+    orm_rows = db.session.query(Project, User.user_name).outerjoin(*join).all()
+    rows = ProjectListSchema.query().outerjoin(*join).all()
+
+    def manual():
+        return [{'project_id': p.project_id, 'project_name': p.project_name, 'domain': p.domain,
+                 'status': p.status, 'principal_name': p_name or '未知'} for p, p_name in orm_rows]
+
+    costs = []
+    for fn in (manual, lambda: ProjectListSchema.dump_all(rows)):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        costs.append(statistics.median(samples) / len(rows) * 1e6)
+    db.session.remove()
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='行序列化基准测试')
+    parser.add_argument('--users', type=int, default=2000, help='生成的用户数，其他数据按比例生成')
+    parser.add_argument('--repeat', type=int, default=10, help='每种写法重复次数，取中位数')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{path}')
+        seed(app, args.users, args.seed)
+        with app.app_context():
+            print(f"{'列表':<10}{'行数':>8}{'orm us/行':>12}{'schema us/行':>14}{'dto us/行':>12}{'加速':>8}")
+            for name, (orm_fn, schema_fn, dto_fn) in CASES.items():
+                orm_cost, count = measure(orm_fn, args.repeat)
+                schema_cost, _ = measure(schema_fn, args.repeat)
+                dto_cost, _ = measure(dto_fn, args.repeat)
+                print(f'{name:<10}{count:>8}{orm_cost:>12.2f}{schema_cost:>14.2f}{dto_cost:>12.2f}'
+                      f'{orm_cost / schema_cost:>7.1f}x')
+
+            manual_cost, compiled_cost = measure_convert(args.repeat)
+            print(f'仅转换（项目列表）: 手写 {manual_cost:.3f} us/行, 编译 {compiled_cost:.3f} us/行, '
+                  f'{manual_cost / compiled_cost:.1f}x')
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+响应编码基准测试
+
+用 datagen 在临时 SQLite 库中生成数据，以秘书、管理员、企业支持者、项目负责人身份请求数据量最大的几个列表接口，
+取得接口返回的数据后分别用 flask-restful 默认的 stdlib json、serialization.dumps 以及 MessagePack（已安装时）
+重复编码，比较每次编码耗时和响应体大小。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.serialization_benchmark --users 2000 --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from flask_jwt_extended import create_access_token
+
+from benchmarks.http_benchmark import build_app, seed
+from models import db, IncubationComment, Notification, Project, User
+from serialization import dumps, msgpack
+from tokens import build_claims
+
+ENDPOINTS = (
+    ('秘书', '/api/projects'),
+    ('管理员', '/api/admin/users'),
+    ('企业支持者', '/api/supporter/projects'),
+    ('企业支持者', '/api/public/resources'),
+    ('项目参与者', '/api/notifications'),
+    ('项目负责人', '/api/projects/<busiest>/comments'),
+)
+
+
+def capture_payloads(app):
+    """请求各接口，返回 {接口: 解码后的响应数据}"""
+    payloads = {}
+    with app.app_context():
+        busiest = db.session.query(IncubationComment.project_id).group_by(IncubationComment.project_id)\
+            .order_by(db.func.count().desc()).limit(1).scalar()
+        users = {}
+        for role, _ in ENDPOINTS:
+            if role == '项目参与者':
+                # 通知最多的用户
+                user = db.session.get(User, db.session.query(Notification.user_id).group_by(Notification.user_id)
+                                      .order_by(db.func.count().desc()).limit(1).scalar())
+            elif role == '项目负责人':
+                # 留言最多的项目的负责人
+                user = db.session.get(User, db.session.get(Project, busiest).principal_id)
+            else:
+                user = User.query.filter_by(role=role).first()
+            users[role] = create_access_token(identity=str(user.user_id), additional_claims=build_claims(user))
+        db.session.remove()
+
+    client = app.test_client()
+    for role, path in ENDPOINTS:
+        url = path.replace('<busiest>', str(busiest))
+        resp = client.get(url, headers={'Authorization': f'Bearer {users[role]}'})
+        if resp.status_code != 200:
+            print(f'{url} 返回 {resp.status_code}，跳过')
+            continue
+        payloads[path] = resp.get_json()
+    return payloads
+
+
+def _time(fn, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(data)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='响应编码基准测试')
+    parser.add_argument('--users', type=int, default=2000, help='生成的用户数，其他数据按比例生成')
+    parser.add_argument('--repeat', type=int, default=20, help='每种编码重复次数，取中位数')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    try:
+        app = build_app(f'sqlite:///{path}')
+        seed(app, args.users, args.seed)
+        payloads = capture_payloads(app)
+    finally:
+        os.remove(path)
+
+    encoders = [('json', lambda data: (json.dumps(data) + '\n').encode('utf-8')), ('fast', dumps)]
+    if msgpack is not None:
+        encoders.append(('msgpack', lambda data: msgpack.packb(data, use_bin_type=True)))
+
+    header = f"{'接口':<36}{'条数':>8}" + ''.join(f'{name + " ms":>12}{name + " KB":>12}' for name, _ in encoders)
+    print(header + f"{'加速':>8}")
+    for path, data in payloads.items():
+        rows = len(data) if isinstance(data, list) else len(next((v for v in data.values() if isinstance(v, list)), []))
+        line = f'{path:<36}{rows:>8}'
+        times = {}
+        for name, encode in encoders:
+            times[name] = _time(encode, data, args.repeat)
+            line += f'{times[name]:>12.3f}{len(encode(data)) / 1024:>12.1f}'
+        print(line + f"{times['json'] / times['fast']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
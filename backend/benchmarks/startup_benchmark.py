@@ -0,0 +1,108 @@
+"""
+冷启动基准测试
+
+每次在全新的子进程中测量：导入 app_new、create_app() 完成、首个请求（登录）返回的耗时，取中位数。
+Flask、SQLAlchemy 等框架本身的导入耗时随机器差异很大，另起进程只导入框架作为基线，
+预算针对 create_app() 完成耗时减去框架基线后的应用自身开销：
+超过 --budget-ms 时以状态码 1 退出，可接入 CI。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.startup_benchmark --runs 10 --budget-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 子进程中执行的测量脚本，结果以一行 JSON 输出
+PROBE = r'''
+import time
+started = time.perf_counter()
+from app_new import create_app
+imported = time.perf_counter()
+app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': %(uri)r, 'SQLALCHEMY_ENGINE_OPTIONS': {}, 'SQLALCHEMY_BINDS': {}})
+created = time.perf_counter()
+response = app.test_client().post('/api/login', json={'user_name': 'nobody', 'password': 'x'})
+first = time.perf_counter()
+import json, sys
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_ms': (created - started) * 1000,
+    'first_request_ms': (first - started) * 1000,
+    'status': response.status_code,
+    'modules': len(sys.modules),
+}))
+'''
+
+# 框架基线：应用启动必然导入的第三方包
+FLOOR = r'''
+import time
+started = time.perf_counter()
+import flask, flask_cors, flask_jwt_extended, flask_restful, flask_sqlalchemy, sqlalchemy.orm
+import json
+print(json.dumps({'import_ms': (time.perf_counter() - started) * 1000}))
+'''
+
+SETUP = r'''
+from app_new import create_app
+from models import db
+app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': %(uri)r, 'SQLALCHEMY_ENGINE_OPTIONS': {}, 'SQLALCHEMY_BINDS': {}})
+with app.app_context():
+    db.create_all()
+'''
+
+METRICS = ('import_ms', 'create_ms', 'first_request_ms')
+
+
+def run_probe(script):
+    env = dict(os.environ)
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    result = subprocess.run([sys.executable, '-c', script], env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(uri, runs):
+    samples = [run_probe(PROBE % {'uri': uri}) for _ in range(runs)]
+    summary = {key: statistics.median(s[key] for s in samples) for key in METRICS}
+    summary['modules'] = samples[-1]['modules']
+    summary['status'] = samples[-1]['status']
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='冷启动基准测试')
+    parser.add_argument('--runs', type=int, default=10, help='启动的进程数，取中位数')
+    parser.add_argument('--budget-ms', type=float, default=150,
+                        help='create_app() 完成耗时减去框架基线后的上限')
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    uri = f'sqlite:///{path}'
+    try:
+        subprocess.run([sys.executable, '-c', SETUP % {'uri': uri}], check=True, capture_output=True)
+        # 预热一次，使 .pyc 和文件系统缓存就绪，不计入统计
+        run_probe(PROBE % {'uri': uri})
+
+        floor = statistics.median(run_probe(FLOOR)['import_ms'] for _ in range(args.runs))
+        r = measure(uri, args.runs)
+        print(f'框架基线导入: {floor:.1f}ms')
+        print(f"{'导入ms':>10}{'create_app ms':>16}{'首个请求ms':>14}{'应用开销ms':>14}{'模块数':>10}")
+        print(f"{r['import_ms']:>10.1f}{r['create_ms']:>16.1f}"
+              f"{r['first_request_ms']:>14.1f}{r['create_ms'] - floor:>14.1f}{r['modules']:>10}")
+
+        overhead = r['create_ms'] - floor
+        if overhead > args.budget_ms:
+            print(f'超出启动预算: 应用开销 {overhead:.1f}ms > {args.budget_ms:.0f}ms')
+            sys.exit(1)
+        print(f'启动预算内: 应用开销 {overhead:.1f}ms <= {args.budget_ms:.0f}ms')
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
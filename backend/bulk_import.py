@@ -0,0 +1,389 @@
+"""
+批量导入
+从CSV/JSON批量导入用户、团队、团队成员和项目：
+- 密码并行哈希：Web 请求使用 passwords.password_hasher 的有界线程池，命令行使用独立的进程池
+- 重名检查每类只用一次 IN 查询
+- 逐行校验必填项、取值和字段长度，分块批量插入，并返回逐行错误报告
+"""
+import csv
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import insert
+
+from models import db, User, Team, UserInTeam, Project
+from passwords import hash_password, password_hasher
+
+logger = logging.getLogger(__name__)
+
+# 每批插入的行数
+IMPORT_CHUNK_SIZE = 1000
+
+# 命令行导入时，少于该数量的密码直接在当前进程哈希，避免进程池启动开销
+POOL_THRESHOLD = 32
+
+# 导入顺序：后面的数据会引用前面导入的用户和团队
+IMPORT_KINDS = ('users', 'teams', 'memberships', 'projects')
+
+USER_ROLES = User.role.type.enums
+MATURITY_LEVELS = Project.maturity_level.type.enums
+PROJECT_STATUSES = Project.status.type.enums
+
+
+def hash_passwords(passwords, workers=None):
+    """并行计算bcrypt哈希，结果顺序与输入一致
+
+    workers 为 None 时（Web 请求）使用 password_hasher 的有界线程池（bcrypt 计算期间释放GIL）；
+    指定时（命令行）使用该数量的进程池。进程以 spawn 方式启动，不继承父进程中其他线程持有的锁
+    """
+    if workers is None:
+        return password_hasher.hash_many(passwords)
+    rounds = password_hasher.rounds
+    if len(passwords) < POOL_THRESHOLD:
+        return [hash_password(p, rounds) for p in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        return list(pool.map(hash_password, passwords, repeat(rounds), chunksize=chunksize))
+
+
+def parse_rows(content, fmt):
+    """把CSV文本或JSON文本解析为字典列表"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if fmt == 'json':
+        rows = json.loads(content)
+        if not isinstance(rows, list):
+            raise ValueError('JSON 数据必须是对象数组')
+        return rows
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def _clean(row, key):
+    if not isinstance(row, dict):
+        return None
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _raw(row, key):
+    """原样读取字段，不去除首尾空白（如密码）"""
+    if not isinstance(row, dict):
+        return None
+    value = row.get(key)
+    if value is None:
+        return None
+    return str(value) or None
+
+
+def _not_object(row, report, row_no):
+    """行不是对象（如 JSON 数组中的数字、字符串）时记录该行错误"""
+    if isinstance(row, dict):
+        return False
+    report.error(row_no, '数据格式错误：每行必须是对象')
+    return True
+
+
+def _too_long(model, record, report, row_no):
+    """字段超过列长度时记录该行错误，避免一行超长数据导致整批插入失败"""
+    for key, value in record.items():
+        length = getattr(model.__table__.c[key].type, 'length', None)
+        if length and isinstance(value, str) and len(value) > length:
+            report.error(row_no, f'字段 {key} 超过 {length} 个字符')
+            return True
+    return False
+
+
+def _bulk_insert(model, records):
+    for start in range(0, len(records), IMPORT_CHUNK_SIZE):
+        db.session.execute(insert(model), records[start:start + IMPORT_CHUNK_SIZE])
+
+
+class ImportReport:
+    """单类数据的导入结果"""
+
+    def __init__(self, total):
+        self.total = total
+        self.created = 0
+        self.errors = []
+
+    def error(self, row_no, message):
+        self.errors.append({'row': row_no, 'message': message})
+
+    def to_dict(self):
+        errors = sorted(self.errors, key=lambda e: e['row'] or 0)
+        return {'total': self.total, 'created': self.created, 'errors': errors}
+
+
+def _user_ids(user_names):
+    """用户名 -> user_id，一次 IN 查询"""
+    if not user_names:
+        return {}
+    return dict(db.session.query(User.user_name, User.user_id)
+                .filter(User.user_name.in_(list(user_names))).all())
+
+
+def _team_ids(team_names):
+    """团队名 -> team_id 列表（团队名不唯一），一次 IN 查询"""
+    if not team_names:
+        return {}
+    mapping = {}
+    for name, team_id in db.session.query(Team.team_name, Team.team_id)\
+            .filter(Team.team_name.in_(list(team_names))).all():
+        mapping.setdefault(name, []).append(team_id)
+    return mapping
+
+
+def _resolve_team(team_ids, name, report, row_no):
+    candidates = team_ids.get(name)
+    if not candidates:
+        report.error(row_no, f'团队不存在: {name}')
+        return None
+    if len(candidates) > 1:
+        report.error(row_no, f'团队名称不唯一: {name}')
+        return None
+    return candidates[0]
+
+
+def import_users(rows, workers=None):
+    """字段：user_name, password, real_name, role, affiliation, email"""
+    report = ImportReport(len(rows))
+    valid, seen = [], set()
+    for row_no, row in enumerate(rows, start=1):
+        user_name, password = _clean(row, 'user_name'), _raw(row, 'password')
+        role = _clean(row, 'role') or '项目参与者'
+        if _not_object(row, report, row_no):
+            continue
+        record = {
+            'user_name': user_name,
+            'real_name': _clean(row, 'real_name'),
+            'role': role,
+            'affiliation': _clean(row, 'affiliation'),
+            'email': _clean(row, 'email'),
+        }
+        if not user_name or not password:
+            report.error(row_no, '用户名和密码不能为空')
+        elif role not in USER_ROLES:
+            report.error(row_no, f'角色无效: {role}')
+        elif _too_long(User, record, report, row_no):
+            continue
+        elif user_name in seen:
+            report.error(row_no, f'文件中用户名重复: {user_name}')
+        else:
+            seen.add(user_name)
+            valid.append((row_no, record, password))
+
+    existing = set(_user_ids(seen))
+    pending = []
+    for item in valid:
+        if item[1]['user_name'] in existing:
+            report.error(item[0], f"用户名已存在: {item[1]['user_name']}")
+        else:
+            pending.append(item)
+
+    hashes = hash_passwords([item[2] for item in pending], workers=workers)
+    records = [dict(record, password_hash=password_hash)
+               for (_, record, _), password_hash in zip(pending, hashes)]
+
+    _bulk_insert(User, records)
+    report.created = len(records)
+    return report
+
+
+def import_teams(rows):
+    """字段：team_name, leader (用户名), domain, team_profile；队长自动加入团队"""
+    report = ImportReport(len(rows))
+    leader_ids = _user_ids({_clean(r, 'leader') for r in rows if _clean(r, 'leader')})
+    team_names = {_clean(r, 'team_name') for r in rows if _clean(r, 'team_name')}
+    existing = set()
+    if team_names:
+        existing = set(db.session.query(Team.team_name, Team.leader_id)
+                       .filter(Team.team_name.in_(team_names)).all())
+
+    records, seen = [], set()
+    for row_no, row in enumerate(rows, start=1):
+        team_name, leader = _clean(row, 'team_name'), _clean(row, 'leader')
+        if _not_object(row, report, row_no):
+            continue
+        record = {
+            'team_name': team_name,
+            'leader_id': leader_ids.get(leader),
+            'domain': _clean(row, 'domain'),
+            'team_profile': _clean(row, 'team_profile'),
+        }
+        if not team_name or not leader:
+            report.error(row_no, '团队名称和队长不能为空')
+        elif _too_long(Team, record, report, row_no):
+            continue
+        elif leader not in leader_ids:
+            report.error(row_no, f'队长用户不存在: {leader}')
+        elif (team_name, leader_ids[leader]) in existing:
+            report.error(row_no, f'该队长已有同名团队: {team_name}')
+        elif (team_name, leader) in seen:
+            report.error(row_no, f'文件中团队重复: {team_name}')
+        else:
+            seen.add((team_name, leader))
+            records.append(record)
+
+    _bulk_insert(Team, records)
+    report.created = len(records)
+
+    # 取回新团队ID后批量写入队长的成员关系
+    if records:
+        created = {(r['team_name'], r['leader_id']) for r in records}
+        team_rows = db.session.query(Team.team_id, Team.team_name, Team.leader_id)\
+            .filter(Team.team_name.in_({r['team_name'] for r in records})).all()
+        _bulk_insert(UserInTeam, [
+            {'user_id': t.leader_id, 'team_id': t.team_id}
+            for t in team_rows if (t.team_name, t.leader_id) in created
+        ])
+    return report
+
+
+def import_memberships(rows):
+    """字段：user_name, team_name"""
+    report = ImportReport(len(rows))
+    user_ids = _user_ids({_clean(r, 'user_name') for r in rows if _clean(r, 'user_name')})
+    team_ids = _team_ids({_clean(r, 'team_name') for r in rows if _clean(r, 'team_name')})
+
+    candidates = []
+    for row_no, row in enumerate(rows, start=1):
+        user_name, team_name = _clean(row, 'user_name'), _clean(row, 'team_name')
+        if _not_object(row, report, row_no):
+            continue
+        if not user_name or not team_name:
+            report.error(row_no, '用户名和团队名称不能为空')
+            continue
+        if user_name not in user_ids:
+            report.error(row_no, f'用户不存在: {user_name}')
+            continue
+        team_id = _resolve_team(team_ids, team_name, report, row_no)
+        if team_id is not None:
+            candidates.append((row_no, user_ids[user_name], team_id))
+
+    existing = set()
+    if candidates:
+        existing = {(m.user_id, m.team_id) for m in db.session.query(UserInTeam.user_id, UserInTeam.team_id)
+                    .filter(UserInTeam.team_id.in_({c[2] for c in candidates}),
+                            UserInTeam.user_id.in_({c[1] for c in candidates})).all()}
+
+    records = []
+    for row_no, user_id, team_id in candidates:
+        if (user_id, team_id) in existing:
+            report.error(row_no, '该用户已在团队中')
+        else:
+            existing.add((user_id, team_id))
+            records.append({'user_id': user_id, 'team_id': team_id})
+
+    _bulk_insert(UserInTeam, records)
+    report.created = len(records)
+    return report
+
+
+def import_projects(rows):
+    """字段：project_name, principal (用户名), team_name, domain, maturity_level, status, project_description"""
+    report = ImportReport(len(rows))
+    user_ids = _user_ids({_clean(r, 'principal') for r in rows if _clean(r, 'principal')})
+    team_ids = _team_ids({_clean(r, 'team_name') for r in rows if _clean(r, 'team_name')})
+
+    records = []
+    for row_no, row in enumerate(rows, start=1):
+        project_name, principal = _clean(row, 'project_name'), _clean(row, 'principal')
+        team_name = _clean(row, 'team_name')
+        maturity_level = _clean(row, 'maturity_level') or '研发阶段'
+        status = _clean(row, 'status') or '待初审'
+        if _not_object(row, report, row_no):
+            continue
+        if not project_name or not principal or not team_name:
+            report.error(row_no, '项目名称、负责人和团队名称不能为空')
+            continue
+        if principal not in user_ids:
+            report.error(row_no, f'负责人用户不存在: {principal}')
+            continue
+        if maturity_level not in MATURITY_LEVELS:
+            report.error(row_no, f'成熟度无效: {maturity_level}')
+            continue
+        if status not in PROJECT_STATUSES:
+            report.error(row_no, f'项目状态无效: {status}')
+            continue
+        team_id = _resolve_team(team_ids, team_name, report, row_no)
+        if team_id is None:
+            continue
+        record = {
+            'project_name': project_name,
+            'team_id': team_id,
+            'principal_id': user_ids[principal],
+            'domain': _clean(row, 'domain') or '未分类',
+            'maturity_level': maturity_level,
+            'status': status,
+            'project_description': _clean(row, 'project_description'),
+        }
+        if not _too_long(Project, record, report, row_no):
+            records.append(record)
+
+    _bulk_insert(Project, records)
+    report.created = len(records)
+    return report
+
+
+def run_import(datasets, workers=None):
+    """按依赖顺序导入，每类数据单独提交；返回 {kind: report}
+
+    workers: 密码哈希进程数，只由命令行传入；Web 请求不传，使用 password_hasher 的线程池
+    """
+    importers = {
+        'users': lambda rows: import_users(rows, workers=workers),
+        'teams': import_teams,
+        'memberships': import_memberships,
+        'projects': import_projects,
+    }
+    results = {}
+    for kind in IMPORT_KINDS:
+        rows = datasets.get(kind)
+        if not rows:
+            continue
+        try:
+            report = importers[kind](rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"批量导入 {kind} 失败: {str(e)}", exc_info=True)
+            report = ImportReport(len(rows))
+            report.error(None, '写入数据库失败，请稍后重试')
+        results[kind] = report.to_dict()
+        logger.info(f"批量导入 {kind}: 共 {report.total} 行, 成功 {report.created} 行, 错误 {len(report.errors)} 行")
+    return results
+
+
+@click.command('import-data')
+@click.option('--users', type=click.Path(exists=True, dir_okay=False), help='用户数据文件')
+@click.option('--teams', type=click.Path(exists=True, dir_okay=False), help='团队数据文件')
+@click.option('--memberships', type=click.Path(exists=True, dir_okay=False), help='团队成员数据文件')
+@click.option('--projects', type=click.Path(exists=True, dir_okay=False), help='项目数据文件')
+@click.option('--workers', type=int, default=None, help='密码哈希进程数，默认CPU核数')
+@with_appcontext
+def import_command(users, teams, memberships, projects, workers):
+    """从CSV/JSON文件批量导入数据"""
+    datasets = {}
+    for kind, path in (('users', users), ('teams', teams),
+                       ('memberships', memberships), ('projects', projects)):
+        if path:
+            with open(path, 'rb') as f:
+                datasets[kind] = parse_rows(f.read(), 'json' if path.endswith('.json') else 'csv')
+    if not datasets:
+        raise click.UsageError('请至少指定一个数据文件')
+
+    results = run_import(datasets, workers=workers or os.cpu_count() or 1)
+    for kind, report in results.items():
+        click.echo(f"{kind}: 共 {report['total']} 行, 成功 {report['created']} 行, 错误 {len(report['errors'])} 行")
+        for err in report['errors']:
+            click.echo(f"  第 {err['row']} 行: {err['message']}")
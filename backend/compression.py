@@ -0,0 +1,186 @@
+"""
+响应压缩
+- 按 Accept-Encoding 协商 br（需安装 brotli）或 gzip，只压缩 JSON/文本/CSV 等可压缩类型
+- 小于 COMPRESSION_MIN_SIZE 的响应不压缩；生成器（流式）响应逐块压缩并同步刷新，客户端可边收边解
+- 资源调用 cache_compressed() 标记多人共享的热点响应（统计快照、孵化项目列表、资源集市等），
+  压缩结果按响应体摘要缓存，相同内容只压缩一次
+"""
+import hashlib
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import g, request
+
+from metrics import registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/msgpack', 'application/javascript', 'application/xml',
+    'image/svg+xml',
+}
+
+COMPRESSION_CACHE = registry.counter(
+    'http_compression_cache_total', '压缩结果缓存的命中与未命中次数', ('result',))
+COMPRESSION_BYTES = registry.counter(
+    'http_compression_bytes_total', '压缩前后的响应字节数', ('stage',))
+
+
+def cache_compressed():
+    """标记当前响应可复用已缓存的压缩结果"""
+    g._compression_cacheable = True
+
+
+def _compressible(mimetype):
+    return mimetype in COMPRESSIBLE_MIMETYPES or mimetype.startswith('text/')
+
+
+class CompressedCache:
+    """按 (摘要, 编码) 缓存压缩后的字节，按条数和总字节数 LRU 淘汰"""
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class Compressor:
+    """响应压缩中间件"""
+
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=5, cache=None):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache or CompressedCache()
+
+    def init_app(self, app):
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', self.brotli_quality)
+        self.cache.max_entries = app.config.get('COMPRESSION_CACHE_ENTRIES', self.cache.max_entries)
+        self.cache.max_bytes = app.config.get('COMPRESSION_CACHE_MAX_BYTES', self.cache.max_bytes)
+
+        @app.after_request
+        def compress_response(response):
+            return self.process(response)
+
+    def encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self, accepted=None):
+        """客户端接受的最优编码，不接受压缩时返回 None；accepted 默认取当前请求的 Accept-Encoding"""
+        if accepted is None:
+            accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for encoding in self.encodings():
+            quality = accepted[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks, encoding):
+        """逐块压缩生成器响应，每块后同步刷新"""
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            for chunk in chunks:
+                data = compressor.process(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+            for chunk in chunks:
+                data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+            yield compressor.flush()
+
+    def process(self, response):
+        cacheable = g.pop('_compression_cacheable', False)
+        if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or not _compressible(response.mimetype or '')):
+            return response
+
+        if response.is_streamed:
+            response.vary.add('Accept-Encoding')
+            encoding = self.negotiate()
+            if encoding is None:
+                return response
+            response.response = self.compress_stream(response.response, encoding)
+            response.headers['Content-Encoding'] = encoding
+            response.headers.pop('Content-Length', None)
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        response.set_data(self.compress_body(data, encoding, cacheable))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def compress_body(self, data, encoding, cacheable=False):
+        """压缩完整响应体，cacheable 时复用按摘要缓存的结果"""
+        if cacheable:
+            key = (hashlib.blake2b(data, digest_size=16).digest(), encoding)
+            compressed = self.cache.get(key)
+            if compressed is None:
+                COMPRESSION_CACHE.labels('miss').inc()
+                compressed = self.compress(data, encoding)
+                self.cache.put(key, compressed)
+            else:
+                COMPRESSION_CACHE.labels('hit').inc()
+        else:
+            compressed = self.compress(data, encoding)
+
+        COMPRESSION_BYTES.labels('original').inc(len(data))
+        COMPRESSION_BYTES.labels('compressed').inc(len(compressed))
+        return compressed
+
+
+compressor = Compressor()
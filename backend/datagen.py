@@ -0,0 +1,592 @@
+"""
+合成测试数据生成
+按可配置规模为 models.py 中的所有表生成数据，用于性能测试：
+- 主键按顺序分配（接在现有最大ID之后），子表直接按ID引用父表，不需要把整张表保存在内存中
+- 角色、项目状态、成熟度、评审打分等按加权分布生成；团队规模、项目数、留言和通知的分布带长尾
+- 审核记录、评审任务、孵化记录、里程碑、经费、概念验证、成果按项目所处的状态流转阶段生成
+- 写入方式：insert（按批 executemany，MySQL 下关闭外键/唯一性检查）或 load-data（MySQL LOAD DATA LOCAL INFILE）
+
+用法（在 backend 目录下）：
+    flask --app app_new generate-data --preset small
+    flask --app app_new generate-data --users 100000 --projects 500000 \\
+        --notifications 5000000 --comments 2000000 --method load-data
+"""
+import logging
+import math
+import os
+import random
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import create_engine, func
+
+from models import (
+    db, User, Team, UserInTeam, Project, FundRecord, Expenditure, ReviewTask, ReviewOpinion,
+    AuditRecord, Achievement, AchievementOfProject, Notification, IncubationRecord, ProofOfConcept,
+    Milestone, IncubationComment, SupportIntention, IncubationResource, ResourceApplication
+)
+from passwords import hash_password, password_hasher
+
+logger = logging.getLogger(__name__)
+
+PRESETS = {
+    'small': {'users': 2000, 'projects': 5000, 'notifications': 50000, 'comments': 20000},
+    'medium': {'users': 20000, 'projects': 100000, 'notifications': 1000000, 'comments': 400000},
+    'large': {'users': 100000, 'projects': 500000, 'notifications': 5000000, 'comments': 2000000},
+}
+
+ROLE_WEIGHTS = (('项目参与者', 82), ('评审人', 8), ('企业支持者', 7), ('秘书', 2), ('管理员', 1))
+
+# 项目状态及其在流转中的阶段；已取消的项目在初审或复审阶段被淘汰
+PROJECT_STATUS_WEIGHTS = (('待初审', 10), ('初审中', 6), ('复审中', 9), ('公示中', 4), ('已通过', 8),
+                          ('孵化中', 24), ('概念验证中', 12), ('孵化完成', 15), ('已取消', 12))
+STATUS_STAGE = {'待初审': 0, '初审中': 1, '复审中': 2, '公示中': 3, '已通过': 4,
+                '孵化中': 5, '概念验证中': 6, '孵化完成': 7, '已取消': -1}
+STAGE_STATUS = {stage: status for status, stage in STATUS_STAGE.items()}
+MATURITY_LEVELS = ('研发阶段', '小试阶段', '中试阶段', '小批量生产阶段')
+DOMAINS = (('人工智能', 30), ('新材料', 15), ('生物医药', 15), ('新能源', 12), ('集成电路', 10),
+           ('智能制造', 10), ('现代农业', 5), (None, 3))
+AFFILIATIONS = ('计算机学院', '材料学院', '生命科学学院', '能源学院', '电子学院', '机械学院', '农学院')
+NOTIFICATION_TEMPLATES = (
+    ('项目审核结果', '您的项目已完成初审', '/projects'),
+    ('新的评审任务', '您有新的评审任务待处理', '/reviewer/tasks'),
+    ('新留言', '您参与的项目有新的留言', '/projects'),
+    ('对接意向', '有企业对您的项目提交了对接意向', '/projects'),
+    ('资源申请', '您发布的资源收到新的申请', '/supporter/resources'),
+)
+
+DAY = 86400
+
+
+class Scale:
+    """数据规模：用户、项目、通知、留言总数，其他表按比例推算"""
+
+    def __init__(self, users, projects, notifications, comments):
+        self.users = users
+        self.projects = projects
+        self.notifications = notifications
+        self.comments = comments
+
+
+def _weighted_picker(rng, pairs):
+    values = [value for value, _ in pairs]
+    cum_weights = []
+    total = 0
+    for _, weight in pairs:
+        total += weight
+        cum_weights.append(total)
+    return lambda k=1: rng.choices(values, cum_weights=cum_weights, k=k)
+
+
+def _long_tail_weights(rng, n, alpha=1.5):
+    """帕累托分布的权重（累积），少数对象占据大部分数据"""
+    cum, total = [], 0.0
+    for _ in range(n):
+        total += rng.paretovariate(alpha)
+        cum.append(total)
+    return cum
+
+
+def _poisson(rng, mean):
+    if mean <= 0:
+        return 0
+    if mean > 30:
+        return max(0, int(rng.gauss(mean, math.sqrt(mean)) + 0.5))
+    threshold, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= threshold:
+            return k
+        k += 1
+
+
+def _ts(seconds):
+    return datetime.fromtimestamp(int(seconds))
+
+
+class InsertWriter:
+    """按批 executemany 写入"""
+
+    def __init__(self, connection, batch_size=5000):
+        self.connection = connection
+        self.batch_size = batch_size
+        dialect = connection.dialect
+        self._quote = dialect.identifier_preparer.quote
+        self._placeholder = '?' if dialect.paramstyle == 'qmark' else '%s'
+        if dialect.name == 'mysql':
+            connection.exec_driver_sql('SET foreign_key_checks = 0')
+            connection.exec_driver_sql('SET unique_checks = 0')
+        elif dialect.name == 'sqlite':
+            connection.exec_driver_sql('PRAGMA synchronous = OFF')
+
+    def write(self, table, columns, rows):
+        sql = (f'INSERT INTO {self._quote(table)} ({", ".join(self._quote(c) for c in columns)}) '
+               f'VALUES ({", ".join([self._placeholder] * len(columns))})')
+        count, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.connection.exec_driver_sql(sql, batch)
+                self.connection.commit()
+                count += len(batch)
+                batch = []
+        if batch:
+            self.connection.exec_driver_sql(sql, batch)
+            self.connection.commit()
+            count += len(batch)
+        return count
+
+    def close(self):
+        if self.connection.dialect.name == 'mysql':
+            self.connection.exec_driver_sql('SET foreign_key_checks = 1')
+            self.connection.exec_driver_sql('SET unique_checks = 1')
+
+
+class LoadDataWriter(InsertWriter):
+    """写入临时 TSV 文件后用 LOAD DATA LOCAL INFILE 导入（仅 MySQL，需开启 local_infile）"""
+
+    def __init__(self, connection, batch_size=5000):
+        if connection.dialect.name != 'mysql':
+            raise click.UsageError('load-data 方式只支持 MySQL')
+        super().__init__(connection, batch_size)
+
+    @staticmethod
+    def _field(value):
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return '1' if value else '0'
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+    def write(self, table, columns, rows):
+        fd, path = tempfile.mkstemp(suffix=f'-{table}.tsv')
+        count = 0
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+                for row in rows:
+                    f.write('\t'.join(self._field(v) for v in row))
+                    f.write('\n')
+                    count += 1
+            self.connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {self._quote(table)} CHARACTER SET utf8mb4 "
+                f"({', '.join(self._quote(c) for c in columns)})"
+            )
+            self.connection.commit()
+        finally:
+            os.remove(path)
+        return count
+
+
+class Generator:
+    """按规模生成各表数据"""
+
+    def __init__(self, scale, rng, base_ids, password_hash, now=None):
+        self.scale = scale
+        self.rng = rng
+        self.base = base_ids
+        self.password_hash = password_hash
+        self.now = (now or datetime.now()).timestamp()
+        self.start = self.now - 3 * 365 * DAY
+
+    # ---------- 用户与团队 ----------
+    def users(self):
+        pick_role = _weighted_picker(self.rng, ROLE_WEIGHTS)
+        roles = pick_role(self.scale.users)
+        # 每个角色至少一个用户
+        for i, (role, _) in enumerate(ROLE_WEIGHTS[:self.scale.users]):
+            roles[i] = role
+        self.by_role = {role: array('i') for role, _ in ROLE_WEIGHTS}
+        base = self.base['User']
+        for i, role in enumerate(roles, start=1):
+            uid = base + i
+            self.by_role[role].append(uid)
+            yield (uid, f'syn{uid}', self.password_hash, f'用户{uid}', role,
+                   self.rng.choice(AFFILIATIONS), f'syn{uid}@example.com', None, 0)
+
+    def teams(self):
+        participants = self.by_role['项目参与者']
+        team_count = max(1, int(len(participants) / 3.5))
+        leaders = self.rng.sample(list(participants), min(team_count, len(participants)))
+        self.team_ids = array('i')
+        self.team_leader = {}
+        base = self.base['Team']
+        pick_domain = _weighted_picker(self.rng, DOMAINS[:-1])
+        for i, leader in enumerate(leaders, start=1):
+            team_id = base + i
+            self.team_ids.append(team_id)
+            self.team_leader[team_id] = leader
+            yield (team_id, f'团队{team_id}', leader, pick_domain()[0], None)
+
+    def memberships(self):
+        participants = self.by_role['项目参与者']
+        self.team_members = {team_id: [leader] for team_id, leader in self.team_leader.items()}
+        leader_ids = set(self.team_leader.values())
+        cum = _long_tail_weights(self.rng, len(self.team_ids), alpha=2.0)
+        team_list = list(self.team_ids)
+        for uid in participants:
+            if uid in leader_ids:
+                continue
+            for team_id in set(self.rng.choices(team_list, cum_weights=cum, k=1 if self.rng.random() < 0.9 else 2)):
+                self.team_members[team_id].append(uid)
+        base, n = self.base['UserInTeam'], 0
+        for team_id, members in self.team_members.items():
+            for uid in members:
+                n += 1
+                yield (base + n, uid, team_id)
+
+    # ---------- 项目 ----------
+    def projects(self):
+        pick_status = _weighted_picker(self.rng, PROJECT_STATUS_WEIGHTS)
+        pick_domain = _weighted_picker(self.rng, DOMAINS)
+        cum = _long_tail_weights(self.rng, len(self.team_ids))
+        team_list = list(self.team_ids)
+        n = self.scale.projects
+        self.project_team = array('i')
+        self.project_principal = array('i')
+        self.project_stage = array('b')
+        self.project_submit = array('d')
+        self.project_quality = array('f')
+        base = self.base['Project']
+        span = self.now - self.start
+        for i in range(1, n + 1):
+            team_id = self.rng.choices(team_list, cum_weights=cum)[0]
+            members = self.team_members[team_id]
+            principal = self.team_leader[team_id] if self.rng.random() < 0.7 else self.rng.choice(members)
+            status = pick_status()[0]
+            stage = STATUS_STAGE[status]
+            # 申报量逐年增长：提交时间偏向近期；阶段越靠后的项目提交越早
+            submit = self.start + span * math.sqrt(self.rng.random())
+            if stage >= 5:
+                submit = min(submit, self.now - (stage - 3) * 60 * DAY * self.rng.random())
+            maturity = MATURITY_LEVELS[min(3, max(0, stage // 2 + self.rng.randint(-1, 1)))]
+            quality = self.rng.gauss(70, 10) + (8 if stage >= 3 else 0) - (15 if stage < 0 else 0)
+            self.project_team.append(team_id)
+            self.project_principal.append(principal)
+            self.project_stage.append(stage)
+            self.project_submit.append(submit)
+            self.project_quality.append(quality)
+            yield (base + i, f'项目{base + i}', team_id, principal, pick_domain()[0], maturity,
+                   _ts(submit), status, '合成数据')
+
+    def _project_index(self, stage_min):
+        return [i for i, stage in enumerate(self.project_stage) if stage >= stage_min]
+
+    def _cancel_stage(self, index):
+        """已取消项目被淘汰的阶段（确定性，保证审核记录和评审任务一致）"""
+        return 1 if (index * 2654435761) % 100 < 55 else 2
+
+    def _effective_stage(self, index):
+        stage = self.project_stage[index]
+        return self._cancel_stage(index) if stage < 0 else stage
+
+    # ---------- 审核与评审 ----------
+    def audits(self):
+        secretaries = self.by_role['秘书'] or self.by_role['管理员']
+        base, n = self.base['AuditRecord'], 0
+        for index, stage in enumerate(self.project_stage):
+            pid = self.base['Project'] + index + 1
+            submit = self.project_submit[index]
+            cancelled = stage < 0
+            stage = self._effective_stage(index)
+            steps = []
+            if stage >= 1:
+                rejected = cancelled and stage == 1
+                steps.append(('项目初审', '未通过' if rejected else ('通过' if stage >= 2 else None), 7))
+            if stage >= 2 and (stage >= 3 or cancelled):
+                steps.append(('复审遴选', '未通过' if cancelled else '通过', 40))
+            if stage >= 5:
+                steps.append(('经费审核', '通过', 70))
+            for audit_type, result, days in steps:
+                n += 1
+                yield (base + n, pid, self.rng.choice(secretaries), audit_type, result,
+                       _ts(min(self.now, submit + days * DAY * (0.5 + self.rng.random()))),
+                       '同意' if result == '通过' else ('材料不足' if result else None))
+
+    def review_tasks(self):
+        reviewers = list(self.by_role['评审人'])
+        if not reviewers:
+            return
+        self.reviewer_bias = {uid: self.rng.gauss(0, 5) for uid in reviewers}
+        self.completed_tasks = []
+        base, n = self.base['ReviewTask'], 0
+        for index, stage in enumerate(self.project_stage):
+            cancelled = stage < 0
+            stage = self._effective_stage(index)
+            if stage < 2:
+                continue
+            pid = self.base['Project'] + index + 1
+            assigned = self.project_submit[index] + 20 * DAY
+            for reviewer in self.rng.sample(reviewers, min(3, len(reviewers))):
+                n += 1
+                if stage > 2 or cancelled:
+                    status = '已完成'
+                else:
+                    status = self.rng.choice(('待确认', '进行中', '已完成'))
+                if status == '已完成':
+                    self.completed_tasks.append((base + n, index, reviewer))
+                yield (base + n, pid, reviewer, _ts(min(self.now, assigned)),
+                       _ts(min(self.now + 30 * DAY, assigned + 30 * DAY)), status)
+
+    def review_opinions(self):
+        base = self.base['ReviewOpinion']
+        for n, (task_id, index, reviewer) in enumerate(getattr(self, 'completed_tasks', ()), start=1):
+            total = self.project_quality[index] + self.reviewer_bias[reviewer] + self.rng.gauss(0, 6)
+            total = int(min(100, max(0, total)))
+            parts = [total // 4] * 4
+            for k in range(total - sum(parts)):
+                parts[k] += 1
+            # 各项之间加入相互抵消的扰动，保持总分不变
+            shift = self.rng.randint(0, min(3, min(parts), 25 - max(parts)))
+            parts[0] += shift
+            parts[1] -= shift
+            submit = self.project_submit[index] + (20 + self.rng.uniform(1, 25)) * DAY
+            yield (base + n, task_id, parts[0], parts[2], parts[1], parts[3], total,
+                   _ts(min(self.now, submit)), '评审意见')
+
+    # ---------- 孵化 ----------
+    def incubation_records(self):
+        base = self.base['IncubationRecord']
+        for n, index in enumerate(self._project_index(5), start=1):
+            stage = self.project_stage[index]
+            start = self.project_submit[index] + 75 * DAY
+            done = stage == 7
+            progress = 100 if done else self.rng.randint(10, 90)
+            yield (base + n, self.base['Project'] + index + 1, _ts(start), _ts(start + 365 * DAY),
+                   _ts(start + self.rng.uniform(200, 400) * DAY) if done else None,
+                   '已完成' if done else self.rng.choice(('进行中', '进行中', '进行中', '已暂停')),
+                   progress, '孵化计划', None, None, None, None, _ts(self.now))
+
+    def milestones(self):
+        base, n = self.base['Milestone'], 0
+        for index in self._project_index(5):
+            stage = self.project_stage[index]
+            start = self.project_submit[index] + 75 * DAY
+            count = self.rng.randint(3, 6)
+            for k in range(count):
+                n += 1
+                if stage == 7 or k < count * self.rng.random():
+                    status = '已完成'
+                else:
+                    status = self.rng.choice(('未开始', '进行中'))
+                yield (base + n, self.base['Project'] + index + 1, f'节点{k + 1}',
+                       _ts(start + (k + 1) * 60 * DAY), status, '交付物', _ts(start), _ts(start))
+
+    def proofs_of_concept(self):
+        base, n = self.base['ProofOfConcept'], 0
+        pick_status = _weighted_picker(self.rng, (('进行中', 30), ('已完成', 25), ('已验证', 30), ('未通过', 10),
+                                                  ('待开始', 5)))
+        for index in self._project_index(6):
+            start = self.project_submit[index] + 150 * DAY
+            for k in range(self.rng.randint(1, 3)):
+                n += 1
+                created = min(self.now, start + k * 30 * DAY)
+                yield (base + n, self.base['Project'] + index + 1, None, f'概念验证{k + 1}', '验证描述',
+                       '验证目标', '验证方法', None, pick_status()[0], _ts(created), None, None, None, None,
+                       _ts(created), _ts(created))
+
+    def funds(self):
+        fund_base, expenditure_base = self.base['FundRecord'], self.base['Expenditure']
+        self.expenditure_rows = []
+        n = 0
+        for index in self._project_index(5):
+            pid = self.base['Project'] + index + 1
+            granted = 0
+            for k in range(self.rng.randint(1, 3)):
+                n += 1
+                amount = round(self.rng.lognormvariate(11.5, 0.6), 2)
+                granted += amount
+                yield (fund_base + n, pid, f'第{k + 1}期经费', amount)
+            spent_ratio = self.rng.uniform(0.2, 0.95)
+            for k in range(self.rng.randint(0, 4)):
+                self.expenditure_rows.append((pid, f'支出{k + 1}', round(granted * spent_ratio / 4, 2)))
+        self.expenditure_base = expenditure_base
+
+    def expenditures(self):
+        for n, (pid, title, amount) in enumerate(self.expenditure_rows, start=1):
+            yield (self.expenditure_base + n, pid, title, amount)
+
+    def achievements(self):
+        types = ('论文', '专利', '软件著作权', '标准', '产品')
+        base = self.base['Achievement']
+        self.achievement_links = []
+        n = 0
+        for index in self._project_index(6):
+            for _ in range(self.rng.randint(0, 3)):
+                n += 1
+                self.achievement_links.append((base + n, self.base['Project'] + index + 1))
+                yield (base + n, f'成果{base + n}', self.rng.choice(types),
+                       _ts(min(self.now, self.project_submit[index] + self.rng.uniform(150, 500) * DAY)), '合成数据')
+
+    def achievement_links_rows(self):
+        base = self.base['AchievementOfProject']
+        for n, (achievement_id, pid) in enumerate(self.achievement_links, start=1):
+            yield (base + n, achievement_id, pid)
+
+    def comments(self):
+        incubating = self._project_index(5)
+        if not incubating:
+            return
+        reviewers = list(self.by_role['评审人'])
+        cum = _long_tail_weights(self.rng, len(incubating))
+        last_comment = {}
+        base = self.base['IncubationComment']
+        chunk = 10000
+        n = 0
+        while n < self.scale.comments:
+            for index in self.rng.choices(incubating, cum_weights=cum, k=min(chunk, self.scale.comments - n)):
+                n += 1
+                pid = self.base['Project'] + index + 1
+                if reviewers and self.rng.random() < 0.3:
+                    author = self.rng.choice(reviewers)
+                else:
+                    author = self.rng.choice(self.team_members[self.project_team[index]])
+                parent = last_comment.get(pid) if self.rng.random() < 0.3 else None
+                last_comment[pid] = base + n
+                start = self.project_submit[index] + 75 * DAY
+                created = start + (self.now - start) * self.rng.random() if start < self.now else self.now
+                yield (base + n, pid, author, f'留言内容{base + n}', parent, _ts(created))
+
+    def notifications(self):
+        users = [uid for ids in self.by_role.values() for uid in ids]
+        cum = _long_tail_weights(self.rng, len(users), alpha=1.2)
+        base = self.base['Notification']
+        chunk = 10000
+        n = 0
+        while n < self.scale.notifications:
+            for uid in self.rng.choices(users, cum_weights=cum, k=min(chunk, self.scale.notifications - n)):
+                n += 1
+                title, content, url = self.rng.choice(NOTIFICATION_TEMPLATES)
+                age = self.rng.expovariate(1 / (60 * DAY))
+                is_read = self.rng.random() < (0.9 if age > 7 * DAY else 0.3)
+                yield (base + n, title, uid, content, _ts(max(self.start, self.now - age)), is_read, url)
+
+    # ---------- 企业支持与资源集市 ----------
+    def support_intentions(self):
+        supporters = list(self.by_role['企业支持者'])
+        incubating = self._project_index(5)
+        if not supporters or not incubating:
+            return
+        pick_status = _weighted_picker(self.rng, (('待处理', 30), ('已对接', 50), ('已婉拒', 20)))
+        pick_type = _weighted_picker(self.rng, (('资金支持', 25), ('产业资源', 25), ('市场渠道', 20),
+                                                ('技术支持', 25), ('其他', 5)))
+        base, n = self.base['SupportIntention'], 0
+        for supporter in supporters:
+            count = min(len(incubating), _poisson(self.rng, 6))
+            for index in self.rng.sample(incubating, count):
+                n += 1
+                created = min(self.now, self.project_submit[index] + self.rng.uniform(80, 400) * DAY)
+                status = pick_status()[0]
+                updated = created if status == '待处理' else min(self.now, created + self.rng.expovariate(1 / (5 * DAY)))
+                yield (base + n, self.base['Project'] + index + 1, supporter, pick_type()[0], '对接留言', status,
+                       _ts(created), _ts(updated))
+
+    def resources(self):
+        types = ('生产合同', '技术支持', '供应链服务', '场地支持', '资金支持', '其他')
+        base, n = self.base['IncubationResource'], 0
+        self.resource_ids = array('i')
+        for supporter in self.by_role['企业支持者']:
+            for _ in range(_poisson(self.rng, 2)):
+                n += 1
+                self.resource_ids.append(base + n)
+                created = self.now - self.rng.uniform(0, 700) * DAY
+                yield (base + n, supporter, f'资源{base + n}', self.rng.choice(types), '资源描述',
+                       '开放中' if self.rng.random() < 0.75 else '已关闭', _ts(created), _ts(created))
+
+    def resource_applications(self):
+        incubating = self._project_index(5)
+        if not incubating:
+            return
+        pick_status = _weighted_picker(self.rng, (('待处理', 30), ('对接中', 25), ('已达成', 25), ('已拒绝', 20)))
+        base, n = self.base['ResourceApplication'], 0
+        for resource_id in self.resource_ids:
+            for index in self.rng.sample(incubating, min(len(incubating), _poisson(self.rng, 3))):
+                n += 1
+                created = self.now - self.rng.uniform(0, 600) * DAY
+                status = pick_status()[0]
+                updated = created if status == '待处理' else min(self.now, created + self.rng.expovariate(1 / (3 * DAY)))
+                yield (base + n, resource_id, self.base['Project'] + index + 1, self.project_principal[index], status,
+                       '申请说明', '已收到' if status != '待处理' else None, _ts(created), _ts(updated))
+
+
+def _columns(model):
+    return [column.name for column in model.__table__.columns]
+
+
+# 写入顺序：父表在前；每项为 (模型, 生成方法名)
+PLAN = (
+    (User, 'users'), (Team, 'teams'), (UserInTeam, 'memberships'), (Project, 'projects'),
+    (AuditRecord, 'audits'), (ReviewTask, 'review_tasks'), (ReviewOpinion, 'review_opinions'),
+    (IncubationRecord, 'incubation_records'), (Milestone, 'milestones'), (ProofOfConcept, 'proofs_of_concept'),
+    (FundRecord, 'funds'), (Expenditure, 'expenditures'), (Achievement, 'achievements'),
+    (AchievementOfProject, 'achievement_links_rows'), (IncubationComment, 'comments'),
+    (Notification, 'notifications'), (SupportIntention, 'support_intentions'),
+    (IncubationResource, 'resources'), (ResourceApplication, 'resource_applications'),
+)
+
+
+def generate(engine, scale, seed=42, method='insert', batch_size=5000, password='password123', echo=None):
+    """生成并写入全部表，返回 {表名: 行数}"""
+    rng = random.Random(seed)
+    with engine.connect() as connection:
+        base_ids = {}
+        for model, _ in PLAN:
+            pk = model.__table__.primary_key.columns.values()[0]
+            base_ids[model.__tablename__] = connection.execute(func.coalesce(func.max(pk), 0).select()).scalar()
+        connection.commit()
+
+        generator = Generator(scale, rng, base_ids, hash_password(password, password_hasher.rounds))
+        writer_cls = LoadDataWriter if method == 'load-data' else InsertWriter
+        writer = writer_cls(connection, batch_size)
+        counts = {}
+        try:
+            for model, method_name in PLAN:
+                started = time.perf_counter()
+                rows = getattr(generator, method_name)() or ()
+                counts[model.__tablename__] = writer.write(model.__tablename__, _columns(model), rows)
+                if echo:
+                    echo(f"{model.__tablename__}: {counts[model.__tablename__]} 行, "
+                         f"{time.perf_counter() - started:.1f}s")
+        finally:
+            writer.close()
+    return counts
+
+
+@click.command('generate-data')
+@click.option('--preset', type=click.Choice(sorted(PRESETS)), default=None, help='预设规模')
+@click.option('--users', type=int, default=None, help='用户数')
+@click.option('--projects', type=int, default=None, help='项目数')
+@click.option('--notifications', type=int, default=None, help='通知总数')
+@click.option('--comments', type=int, default=None, help='留言总数')
+@click.option('--method', type=click.Choice(['insert', 'load-data']), default='insert',
+              help='写入方式，load-data 需 MySQL 服务端和客户端开启 local_infile')
+@click.option('--batch-size', type=int, default=5000)
+@click.option('--seed', type=int, default=42, help='随机种子')
+@click.option('--password', default='password123', help='所有生成用户的登录密码')
+@with_appcontext
+def generate_data_command(preset, users, projects, notifications, comments, method, batch_size, seed, password):
+    """生成性能测试用的合成数据（追加在现有数据之后）"""
+    sizes = dict(PRESETS[preset or 'small'])
+    for key, value in (('users', users), ('projects', projects),
+                       ('notifications', notifications), ('comments', comments)):
+        if value is not None:
+            sizes[key] = value
+    if sizes['users'] < len(ROLE_WEIGHTS):
+        raise click.UsageError(f'用户数至少为 {len(ROLE_WEIGHTS)}')
+
+    started = time.perf_counter()
+    engine = db.engine
+    if method == 'load-data':
+        if engine.dialect.name != 'mysql':
+            raise click.UsageError('load-data 方式只支持 MySQL')
+        # LOAD DATA LOCAL 需要客户端显式开启 local_infile
+        engine = create_engine(engine.url, connect_args={'local_infile': 1})
+    counts = generate(engine, Scale(**sizes), seed=seed, method=method, batch_size=batch_size,
+                      password=password, echo=click.echo)
+    click.echo(f"共写入 {sum(counts.values())} 行，耗时 {time.perf_counter() - started:.1f}s")
+
@@ -0,0 +1,142 @@
+"""
+数据库连接池
+- 从环境变量生成 SQLAlchemy 引擎参数（连接池大小、溢出、回收、预检测、语句超时）
+- InstrumentedQueuePool 统计取连接的等待时间、超时次数，配合池本身的占用/溢出数用于容量评估
+"""
+import os
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# 等待时间分布的桶上限（秒）
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def engine_options_from_env(database_uri, pool_size=10, max_overflow=20, pool_recycle=1800,
+                            pool_timeout=30, pool_pre_ping=True, statement_timeout_ms=0):
+    """生成 SQLALCHEMY_ENGINE_OPTIONS，参数默认值可被 DB_* 环境变量覆盖"""
+    if database_uri.startswith('sqlite'):
+        # SQLite 使用 SQLAlchemy 默认的单连接池，连接池参数不适用
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': _env_int('DB_POOL_SIZE', pool_size),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', max_overflow),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', pool_recycle),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', pool_timeout),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', pool_pre_ping),
+    }
+
+    timeout_ms = _env_int('DB_STATEMENT_TIMEOUT_MS', statement_timeout_ms)
+    if timeout_ms and database_uri.startswith('mysql'):
+        # MySQL 5.7.8+：限制只读语句的最长执行时间；导出等长查询用 without_statement_timeout 豁免
+        options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={int(timeout_ms)}'}
+    return options
+
+
+def without_statement_timeout(stmt):
+    """不受 DB_STATEMENT_TIMEOUT_MS 限制的 SELECT（数据导出、后台统计等预期耗时较长的查询）
+
+    MySQL 的 MAX_EXECUTION_TIME(0) 优化器提示覆盖会话设置；其他数据库上语句不变。
+    UNION 等复合查询的提示须放在第一个 SELECT 上，对整条语句生效
+    """
+    return stmt.prefix_with('/*+ MAX_EXECUTION_TIME(0) */', dialect='mysql')
+
+
+class PoolMetrics:
+    """取连接等待时间统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_total_seconds': round(self.wait_total, 6),
+                'wait_avg_ms': round(self.wait_total / attempts * 1000, 3) if attempts else 0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+                'wait_buckets': {
+                    **{f'le_{bound}': count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)},
+                    'le_inf': self.wait_buckets[-1],
+                },
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """记录每次取连接等待时间的 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() 会重建连接池，保留累计统计
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_stats(engine):
+    """连接池当前占用情况及累计等待统计"""
+    pool = engine.pool
+    stats = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+            'max_overflow': pool._max_overflow,
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,174 @@
+"""
+读写分离
+- GET/HEAD 请求中的查询路由到只读副本，写请求、flush、DML（含非只读的 text() 语句）以及 SELECT ... FOR UPDATE 走主库
+- 用户提交写事务后的一段时间内（DB_REPLICA_PIN_SECONDS），其读请求固定走主库，保证读到自己的写入
+- 未配置副本（DB_REPLICA_URLS 为空）时所有查询走主库
+"""
+import functools
+import itertools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.elements import TextClause
+
+from db_pool import engine_options_from_env
+
+REPLICA_BIND_PREFIX = 'replica_'
+READ_METHODS = ('GET', 'HEAD')
+
+# text() 语句无法从结构上判断读写，只把明确的只读语句交给副本
+_READ_ONLY_SQL = re.compile(r'\s*(SELECT|SHOW|EXPLAIN|DESCRIBE)\b', re.IGNORECASE)
+_FOR_UPDATE_SQL = re.compile(r'\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b', re.IGNORECASE)
+
+
+def replica_binds_from_env():
+    """由 DB_REPLICA_URLS（逗号分隔）生成 SQLALCHEMY_BINDS 中的副本项"""
+    urls = [url.strip() for url in os.environ.get('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    return {
+        f'{REPLICA_BIND_PREFIX}{i}': {'url': url, **engine_options_from_env(url)}
+        for i, url in enumerate(urls)
+    }
+
+
+def _is_write_clause(clause):
+    """DML、SELECT ... FOR UPDATE 以及非只读的 text() 语句必须走主库"""
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return not _READ_ONLY_SQL.match(clause.text) or bool(_FOR_UPDATE_SQL.search(clause.text))
+    return getattr(clause, 'is_dml', False) or getattr(clause, '_for_update_arg', None) is not None
+
+
+def _current_user_id():
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # 未经过 jwt_required 的请求
+        return None
+
+
+class ReplicaRouter:
+    """副本选择与写后固定主库窗口"""
+
+    def __init__(self, pin_seconds=10):
+        self.pin_seconds = pin_seconds
+        self.replica_keys = []
+        self._cycle = None
+        self._pins = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        self.pin_seconds = app.config.get('DB_REPLICA_PIN_SECONDS', self.pin_seconds)
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replica_keys = sorted(key for key in binds if key.startswith(REPLICA_BIND_PREFIX))
+        self._cycle = itertools.cycle(self.replica_keys) if self.replica_keys else None
+        with self._lock:
+            self._pins.clear()
+
+    def pin(self, user_id):
+        """用户刚提交写事务，窗口期内读主库"""
+        if user_id is None or self.pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._pins[str(user_id)] = now + self.pin_seconds
+            # 顺带清理过期条目
+            if len(self._pins) > 1024:
+                self._pins = {uid: until for uid, until in self._pins.items() if until > now}
+
+    def is_pinned(self, user_id):
+        with self._lock:
+            until = self._pins.get(str(user_id))
+        return until is not None and until > time.monotonic()
+
+    @contextmanager
+    def force(self, use_replica):
+        """在代码块内强制走副本（True）或主库（False），用于请求之外的只读任务"""
+        previous = getattr(self._local, 'force', None)
+        self._local.force = use_replica
+        try:
+            yield
+        finally:
+            self._local.force = previous
+
+    def should_use_replica(self, clause=None):
+        if not self.replica_keys:
+            return False
+        if _is_write_clause(clause):
+            return False
+        forced = getattr(self._local, 'force', None)
+        if forced is not None:
+            return forced
+        if not has_request_context() or request.method not in READ_METHODS:
+            return False
+        user_id = _current_user_id()
+        return user_id is None or not self.is_pinned(user_id)
+
+    def next_replica(self):
+        with self._lock:
+            return next(self._cycle)
+
+
+replica_router = ReplicaRouter()
+
+
+def on_replica(fn):
+    """装饰只读函数，使其查询走副本（后台任务等无请求上下文的场景）"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with replica_router.force(True):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """按请求类型在主库和副本之间选择连接的会话"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        # 只路由默认库上的查询，显式 bind 和其他 bind_key 不受影响
+        if bind is not None or self._flushing or engine is not self._db.engines.get(None):
+            return engine
+        if not replica_router.should_use_replica(clause):
+            return engine
+        # 同一事务内固定使用一个副本，避免为每条查询各占一个连接
+        key = self.info.get('db_routing_replica')
+        if key is None:
+            key = self.info['db_routing_replica'] = replica_router.next_replica()
+        return self._db.engines[key]
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_written(session, flush_context):
+    session.info['db_routing_written'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_bulk_written(orm_execute_state):
+    if (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+            or (isinstance(orm_execute_state.statement, TextClause)
+                and _is_write_clause(orm_execute_state.statement))):
+        orm_execute_state.session.info['db_routing_written'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_writer(session):
+    session.info.pop('db_routing_replica', None)
+    if session.info.pop('db_routing_written', False):
+        replica_router.pin(_current_user_id())
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _clear_written(session):
+    session.info.pop('db_routing_replica', None)
+    session.info.pop('db_routing_written', None)
@@ -25,3 +25,9 @@ class PermissionError(APIException):
     """权限错误"""
     def __init__(self, message="权限不足"):
         super().__init__(message, 403)
+
+
+class ServiceUnavailableError(APIException):
+    """服务繁忙错误"""
+    def __init__(self, message="服务繁忙，请稍后重试"):
+        super().__init__(message, 503)
@@ -0,0 +1,94 @@
+"""
+并行查询
+- 相互独立的只读查询在有界线程池中并发执行，各自使用独立的会话和连接，总耗时约等于最慢的一条
+- 调用方线程执行第一条查询，线程池执行其余查询；线程池全局共享，额外占用的连接数不超过 DB_FANOUT_WORKERS
+- 工作线程沿用调用方的主库/副本选择（GET 请求走副本），执行的SQL计入调用方请求的统计
+- DB_FANOUT_WORKERS=0、单连接的连接池（SQLite 内存库）或已在工作线程中时退化为顺序执行
+连接池大小应不小于 请求线程数 + DB_FANOUT_WORKERS
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from flask import current_app
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
+
+from models import db
+from db_routing import replica_router
+from query_stats import capture_query_stats, merge_query_stats
+
+
+def fetch_all(statement):
+    """在当前线程的会话中执行语句，返回全部行（供 run 的任务使用）"""
+    return db.session.execute(statement).all()
+
+
+class QueryFanout:
+    """并行执行相互独立的只读查询"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def init_app(self, app):
+        self.max_workers = app.config.get('DB_FANOUT_WORKERS', self.max_workers)
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='query-fanout')
+        return self._executor
+
+    def _parallel(self):
+        if self.max_workers <= 0 or getattr(self._local, 'worker', False):
+            return False
+        # 每个线程一个连接（SQLite 内存库）或全局单连接时，并行查询看不到同一份数据
+        return not isinstance(db.engine.pool, (SingletonThreadPool, StaticPool))
+
+    def _call(self, app, use_replica, fn):
+        self._local.worker = True
+        try:
+            with app.app_context(), replica_router.force(use_replica), capture_query_stats() as stats:
+                return fn(), stats
+        finally:
+            self._local.worker = False
+
+    def run(self, tasks):
+        """并发执行 {名称: 无参函数}，返回 {名称: 结果}；任一任务出错时在全部结束后抛出第一个异常
+
+        任务在独立的应用上下文中执行，只能使用 db.session 和参数，不能读取 request 或 JWT
+        """
+        names = list(tasks)
+        if len(names) < 2 or not self._parallel():
+            return {name: tasks[name]() for name in names}
+
+        app = current_app._get_current_object()
+        use_replica = replica_router.should_use_replica()
+        executor = self._get_executor()
+        futures = {name: executor.submit(self._call, app, use_replica, tasks[name]) for name in names[1:]}
+
+        results, error = {}, None
+        try:
+            results[names[0]] = tasks[names[0]]()
+        except Exception as e:
+            error = e
+        for name, future in futures.items():
+            try:
+                results[name], stats = future.result()
+                merge_query_stats(stats)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return {name: results[name] for name in names}
+
+    def all(self, statements):
+        """并发执行 {名称: select 语句}，返回 {名称: 行列表}"""
+        return self.run({name: partial(fetch_all, statement) for name, statement in statements.items()})
+
+
+query_fanout = QueryFanout()
@@ -0,0 +1,189 @@
+"""
+索引顾问
+以各角色用户的身份依次请求所有 GET 接口，记录期间执行的 SELECT 语句，
+逐条 EXPLAIN 并报告全表扫描、文件排序和临时表
+
+用法（在 backend 目录下，建议连接测试/预发库，部分 GET 接口会修正项目状态）：
+    flask --app app_new index-advisor
+    flask --app app_new index-advisor --path /api/projects --all
+"""
+import threading
+from contextlib import contextmanager
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from models import db, User, Team, Project, IncubationResource, Milestone, ResourceApplication
+from tokens import build_claims
+
+ROLES = ('项目参与者', '评审人', '秘书', '管理员', '企业支持者')
+
+
+class CapturedStatement:
+    def __init__(self, engine, statement, parameters):
+        self.engine = engine
+        self.statement = statement
+        self.parameters = parameters
+        self.count = 0
+        self.paths = set()
+        self.issues = []
+
+
+@contextmanager
+def capture_statements(engines):
+    """记录代码块内各引擎执行的 SELECT 语句，按语句文本去重"""
+    captured = {}
+    state = {'path': None}
+    lock = threading.Lock()
+    listeners = []
+
+    for engine in engines:
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany, engine=engine):
+            if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                return
+            with lock:
+                item = captured.get(statement)
+                if item is None:
+                    item = captured[statement] = CapturedStatement(engine, statement, parameters)
+                item.count += 1
+                if state['path']:
+                    item.paths.add(state['path'])
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        listeners.append((engine, before_cursor_execute))
+    try:
+        yield captured, state
+    finally:
+        for engine, listener in listeners:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+
+def _mysql_issues(rows):
+    issues = []
+    for row in rows:
+        table = row.get('table')
+        extra = row.get('Extra') or ''
+        if row.get('type') == 'ALL':
+            issues.append(f"全表扫描 {table}（约 {row.get('rows')} 行）")
+        if 'Using filesort' in extra:
+            issues.append(f"文件排序 {table}")
+        if 'Using temporary' in extra:
+            issues.append(f"临时表 {table}")
+    return issues
+
+
+def _sqlite_issues(rows):
+    issues = []
+    for row in rows:
+        detail = row.get('detail', '')
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            issues.append(f"全表扫描 {detail[5:]}")
+        elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            issues.append('文件排序')
+        elif detail.startswith('USE TEMP B-TREE'):
+            issues.append(f"临时表（{detail[len('USE TEMP B-TREE FOR '):]}）")
+    return issues
+
+
+def explain(item):
+    """对捕获的语句执行 EXPLAIN，返回问题列表（不支持的数据库返回 None）"""
+    dialect = item.engine.dialect.name
+    if dialect == 'mysql':
+        prefix, analyze = 'EXPLAIN ', _mysql_issues
+    elif dialect == 'sqlite':
+        prefix, analyze = 'EXPLAIN QUERY PLAN ', _sqlite_issues
+    else:
+        return None
+    with item.engine.connect() as conn:
+        result = conn.exec_driver_sql(prefix + item.statement, item.parameters)
+        rows = [dict(row._mapping) for row in result]
+    return analyze(rows)
+
+
+def _sample_ids():
+    """为路径参数取一个示例ID"""
+    samples = {
+        'project_id': db.session.query(Project.project_id).order_by(Project.project_id).limit(1).scalar(),
+        'team_id': db.session.query(Team.team_id).order_by(Team.team_id).limit(1).scalar(),
+        'resource_id': db.session.query(IncubationResource.resource_id)
+                                 .order_by(IncubationResource.resource_id).limit(1).scalar(),
+        'milestone_id': db.session.query(Milestone.milestone_id).order_by(Milestone.milestone_id).limit(1).scalar(),
+        'application_id': db.session.query(ResourceApplication.application_id)
+                                    .order_by(ResourceApplication.application_id).limit(1).scalar(),
+    }
+    return {name: value for name, value in samples.items() if value is not None}
+
+
+def default_workload(app):
+    """所有无参数或参数可用示例ID填充的 GET 接口"""
+    samples = _sample_ids()
+    paths = []
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in rule.methods or rule.endpoint == 'static':
+            continue
+        if not set(rule.arguments) <= set(samples):
+            continue
+        paths.append(rule.build({name: samples[name] for name in rule.arguments}, append_unknown=False)[1])
+    return sorted(set(paths))
+
+
+def role_headers():
+    """每个角色取一个用户，签发访问令牌"""
+    headers = {}
+    for role in ROLES:
+        user = User.query.filter_by(role=role).order_by(User.user_id).first()
+        if user:
+            token = create_access_token(identity=str(user.user_id), additional_claims=build_claims(user))
+            headers[role] = {'Authorization': f'Bearer {token}'}
+    return headers
+
+
+def run_workload(app, paths):
+    """以各角色身份请求 paths，返回去重后的 SELECT 语句"""
+    headers = role_headers()
+    db.session.remove()
+    client = app.test_client()
+    with capture_statements(db.engines.values()) as (captured, state):
+        for path in paths:
+            for role, header in headers.items():
+                state['path'] = f'{path} ({role})'
+                client.get(path, headers=header)
+        state['path'] = None
+    return list(captured.values())
+
+
+@click.command('index-advisor')
+@click.option('--path', 'paths', multiple=True, help='只分析指定的 GET 路径，可重复，默认所有 GET 接口')
+@click.option('--all', 'show_all', is_flag=True, help='同时列出未发现问题的语句')
+@with_appcontext
+def index_advisor_command(paths, show_all):
+    """运行 GET 接口负载，EXPLAIN 捕获的查询并报告全表扫描和文件排序"""
+    app = current_app._get_current_object()
+    paths = list(paths) or default_workload(app)
+    click.echo(f"运行 {len(paths)} 个接口 × {len(ROLES)} 个角色 ...")
+    statements = run_workload(app, paths)
+
+    flagged = 0
+    for item in sorted(statements, key=lambda s: -s.count):
+        try:
+            item.issues = explain(item)
+        except Exception as e:
+            click.echo(f"EXPLAIN 失败: {str(e).splitlines()[0]}")
+            continue
+        if item.issues is None:
+            raise click.ClickException(f'不支持的数据库: {item.engine.dialect.name}')
+        if item.issues:
+            flagged += 1
+        elif not show_all:
+            continue
+
+        click.echo('-' * 80)
+        click.echo(f"执行 {item.count} 次 | " + ('；'.join(item.issues) if item.issues else '无问题'))
+        click.echo(f"  {' '.join(item.statement.split())}")
+        for path in sorted(item.paths)[:5]:
+            click.echo(f"  来自 {path}")
+    click.echo('-' * 80)
+    click.echo(f"共 {len(statements)} 条不同的查询，{flagged} 条存在全表扫描/文件排序/临时表")
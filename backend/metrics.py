@@ -0,0 +1,287 @@
+"""
+Prometheus 指标
+- 轻量的 Counter / Gauge / Histogram 实现，按 Prometheus 文本格式输出，无额外依赖
+- init_metrics 为每个请求记录按 Resource 和方法划分的延迟直方图、状态码计数、数据库耗时和处理中请求数
+- 缓存、任务队列等组件可用 registry.register_collector 注册采集函数，在抓取时读取当前值
+指标保存在进程内，多进程部署时每个 worker 需分别抓取
+"""
+import bisect
+import threading
+import time
+
+from flask import current_app, g, request
+
+from models import db
+from db_pool import pool_stats
+from query_stats import get_request_query_stats
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values):
+    if not labelnames:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _Value:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f'{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}']
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ('upper_bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child):
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        labelnames = self.labelnames + ('le',)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.upper_bounds + (float('inf'),), counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{_format_labels(labelnames, values + (_format_value(bound),))} '
+                         f'{cumulative}')
+        label_text = _format_labels(self.labelnames, values)
+        lines.append(f'{self.name}_sum{label_text} {_format_value(total)}')
+        lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f'指标 {name} 已以不同的类型或标签注册')
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector):
+        """注册采集函数：抓取时调用，返回 [(name, type, help, [(labels_dict, value), ...]), ...]"""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        """Prometheus 文本格式"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(tuple(labels), tuple(labels.values()))} '
+                                 f'{_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', '请求处理耗时（秒）', ('resource', 'method'))
+REQUEST_DB_TIME = registry.histogram(
+    'http_request_db_seconds', '单个请求的数据库耗时（秒）', ('resource', 'method'),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+REQUEST_DB_QUERIES = registry.counter(
+    'http_request_db_queries_total', '请求执行的SQL语句数', ('resource', 'method'))
+RESPONSES = registry.counter(
+    'http_responses_total', '按状态码统计的响应数', ('resource', 'method', 'status'))
+IN_FLIGHT = registry.gauge('http_requests_in_flight', '正在处理的请求数')
+
+_resource_names = {}
+
+
+def _resource_name():
+    """flask-restful Resource 类名，非 Resource 的视图使用 endpoint 名"""
+    endpoint = request.endpoint
+    if endpoint is None:
+        return 'unmatched'
+    name = _resource_names.get(endpoint)
+    if name is None:
+        view = current_app.view_functions.get(endpoint)
+        view_class = getattr(view, 'view_class', None)
+        name = _resource_names[endpoint] = view_class.__name__ if view_class else endpoint
+    return name
+
+
+def _record(status):
+    started = g.pop('_metrics_started', None)
+    if started is None:
+        return
+    resource, method = _resource_name(), request.method
+    REQUEST_LATENCY.labels(resource, method).observe(time.perf_counter() - started)
+    RESPONSES.labels(resource, method, str(status)).inc()
+    stats = get_request_query_stats()
+    if stats is not None:
+        REQUEST_DB_TIME.labels(resource, method).observe(stats.seconds)
+        REQUEST_DB_QUERIES.labels(resource, method).inc(stats.count)
+
+
+def collect_db_pool_metrics():
+    """各数据库引擎连接池的占用、溢出和取连接等待"""
+    gauges = {
+        'checked_out': ('db_pool_connections_in_use', 'gauge', '已借出的连接数'),
+        'overflow': ('db_pool_overflow', 'gauge', '当前溢出连接数'),
+        'size': ('db_pool_size', 'gauge', '连接池常驻连接数'),
+        'checkouts': ('db_pool_checkouts_total', 'counter', '取连接次数'),
+        'timeouts': ('db_pool_timeouts_total', 'counter', '取连接超时次数'),
+        'wait_total_seconds': ('db_pool_wait_seconds_total', 'counter', '取连接累计等待时间（秒）'),
+    }
+    samples = {key: [] for key in gauges}
+    for name, engine in db.engines.items():
+        stats = pool_stats(engine)
+        for key in gauges:
+            if key in stats:
+                samples[key].append(({'engine': name or 'default'}, stats[key]))
+    return [(*gauges[key], samples[key]) for key in gauges if samples[key]]
+
+
+def init_metrics(app):
+    """注册请求指标钩子"""
+    in_flight = IN_FLIGHT.labels()
+    registry.register_collector(collect_db_pool_metrics)
+
+    @app.before_request
+    def start_request_metrics():
+        g._metrics_started = time.perf_counter()
+        g._metrics_in_flight = True
+        in_flight.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        _record(response.status_code)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        # 未被错误处理器转换为响应的异常不会经过 after_request
+        if '_metrics_started' in g:
+            _record(500)
+        if g.pop('_metrics_in_flight', False):
+            in_flight.dec()
@@ -1,9 +1,11 @@
 from datetime import datetime
 
-import bcrypt
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from passwords import password_hasher
+from db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class User(db.Model):
@@ -17,14 +19,14 @@ class User(db.Model):
     affiliation = db.Column(db.String(50))
     email = db.Column(db.String(50))
     user_profile = db.Column(db.Text)
+    # 角色变更、移出团队时递增，使已签发的令牌失效
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     def set_password(self, password):
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'),
-                                           bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'),
-                              self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
 
 
 class Team(db.Model):
@@ -61,6 +63,11 @@ class Project(db.Model):
                                '公示中', '已通过', '孵化中', '概念验证中', 
                                '孵化完成', '已取消'), nullable=False)
     project_description = db.Column(db.Text)
+    # 按状态筛选的列表/统计，以及按提交时间排序、按月份统计趋势
+    __table_args__ = (
+        db.Index('ix_project_status_submit_time', 'status', 'submit_time'),
+        db.Index('ix_project_submit_time', 'submit_time'),
+    )
 
 
 class FundRecord(db.Model):
@@ -92,6 +99,10 @@ class ReviewTask(db.Model):
     assign_time = db.Column(db.DateTime, default=datetime.now)
     deadline = db.Column(db.DateTime)
     status = db.Column(db.Enum('待确认', '进行中', '已完成'), default='待确认')
+    __table_args__ = (
+        db.Index('ix_review_task_reviewer_status', 'reviewer_id', 'status'),
+        db.Index('ix_review_task_project_status', 'project_id', 'status'),
+    )
 
 
 class ReviewOpinion(db.Model):
@@ -151,6 +162,9 @@ class Notification(db.Model):
     create_time = db.Column(db.DateTime, default=datetime.now)
     is_read = db.Column(db.Boolean, default=False)
     redirect_url = db.Column(db.String(255))
+    __table_args__ = (
+        db.Index('ix_notification_user_create_time', 'user_id', 'create_time'),
+    )
 
 
 class IncubationRecord(db.Model):
@@ -194,6 +208,9 @@ class ProofOfConcept(db.Model):
     conclusion = db.Column(db.Text)  # 结论
     create_time = db.Column(db.DateTime, default=datetime.now)
     update_time = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (
+        db.Index('ix_proof_of_concept_project_create_time', 'project_id', 'create_time'),
+    )
 
 
 class Milestone(db.Model):
@@ -222,6 +239,9 @@ class IncubationComment(db.Model):
     content = db.Column(db.Text, nullable=False)  # 留言内容
     parent_id = db.Column(db.Integer, db.ForeignKey('IncubationComment.comment_id'))  # 父评论ID，用于回复
     create_time = db.Column(db.DateTime, default=datetime.now)
+    __table_args__ = (
+        db.Index('ix_incubation_comment_project_create_time', 'project_id', 'create_time'),
+    )
 
 
 class SupportIntention(db.Model):
@@ -239,6 +259,10 @@ class SupportIntention(db.Model):
                        default='待处理', nullable=False)
     create_time = db.Column(db.DateTime, default=datetime.now)
     update_time = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (
+        db.Index('ix_support_intention_project_create_time', 'project_id', 'create_time'),
+        db.Index('ix_support_intention_supporter_create_time', 'supporter_id', 'create_time'),
+    )
 
 
 class IncubationResource(db.Model):
@@ -255,6 +279,10 @@ class IncubationResource(db.Model):
                        default='开放中', nullable=False)
     create_time = db.Column(db.DateTime, default=datetime.now)
     update_time = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (
+        db.Index('ix_incubation_resource_status_create_time', 'status', 'create_time'),
+        db.Index('ix_incubation_resource_provider_create_time', 'provider_id', 'create_time'),
+    )
 
 
 class ResourceApplication(db.Model):
@@ -273,3 +301,7 @@ class ResourceApplication(db.Model):
     reply = db.Column(db.Text)  # 企业回复内容
     create_time = db.Column(db.DateTime, default=datetime.now)
     update_time = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    __table_args__ = (
+        db.Index('ix_resource_application_resource_create_time', 'resource_id', 'create_time'),
+        db.Index('ix_resource_application_applicant_create_time', 'applicant_id', 'create_time'),
+    )
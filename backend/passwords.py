@@ -0,0 +1,95 @@
+"""
+密码哈希
+bcrypt 计算在有界线程池中执行（bcrypt 计算期间释放GIL），
+排队数超过上限时立即返回503，避免登录高峰占满所有请求线程
+bcrypt 在首次哈希/校验时才导入，不计入 worker 启动时间
+"""
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """有界bcrypt执行器"""
+
+    def __init__(self, rounds=12, workers=None, queue_limit=64):
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = queue_limit
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_ROUNDS', self.rounds)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or self.workers
+        self.queue_limit = app.config.get('PASSWORD_HASH_QUEUE_LIMIT', self.queue_limit)
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._slots = None
+
+    def _start(self, fn, *args):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._slots = threading.BoundedSemaphore(self.workers + self.queue_limit)
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                        thread_name_prefix='bcrypt')
+        # 执行中 + 排队中的任务数达到上限时快速失败
+        if not self._slots.acquire(blocking=False):
+            logger.warning("密码哈希队列已满，拒绝请求")
+            raise ServiceUnavailableError('服务繁忙，请稍后重试')
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _submit(self, fn, *args):
+        return self._start(fn, *args).result()
+
+    def hash(self, password):
+        return self._submit(hash_password, password, self.rounds)
+
+    def hash_many(self, passwords):
+        """批量哈希，结果顺序与输入一致；同时占用的名额不超过线程数，排队名额留给登录请求"""
+        results, running = [], deque()
+        for password in passwords:
+            if len(running) >= self.workers:
+                results.append(running.popleft().result())
+            running.append(self._start(hash_password, password, self.rounds))
+        results.extend(future.result() for future in running)
+        return results
+
+    def verify(self, password, password_hash):
+        return self._submit(_checkpw, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        """哈希的cost与当前配置不一致时需要重新哈希"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+
+def hash_password(password, rounds=12):
+    import bcrypt
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _checkpw(password, password_hash):
+    import bcrypt
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+password_hasher = PasswordHasher()
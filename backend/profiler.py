@@ -0,0 +1,215 @@
+"""
+按需请求性能分析
+管理员在请求上携带 X-Profile: 1 请求头或 ?_profile=1 参数时，对该请求：
+- 由采样线程定时抓取请求线程的调用栈，生成 flamegraph.pl / speedscope 可读的折叠栈（folded）格式
+- 用 tracemalloc 记录内存分配：请求期间的峰值，以及请求结束时仍存活、分配量最大的前 N 个代码行
+结果写入 PROFILE_DIR，通过 /api/admin/profiles 下载；未带标记的请求只多一次字典查找
+非管理员（含未登录）请求中的标记直接忽略，请求照常处理
+同一时间只分析一个请求，其余带标记的请求照常处理、不做分析。
+tracemalloc 为进程全局，无法按线程区分：分析期间同一进程中其他并发请求的内存分配也会计入峰值和 Top N，
+内存数据只在该进程没有其他请求时准确（如单 worker 的预发环境）；调用栈采样只针对被分析请求的线程，不受影响
+"""
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from flask import g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from utils import get_current_role
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ARG = '_profile'
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{14}-[0-9a-f]{8}$')
+
+
+class StackSampler(threading.Thread):
+    """定时采样目标线程的调用栈"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RequestProfiler:
+    """管理员按需触发的单请求性能分析"""
+
+    def __init__(self, interval=0.005, top_n=30, max_profiles=50, storage_dir=None):
+        self.interval = interval
+        self.top_n = top_n
+        self.max_profiles = max_profiles
+        self.storage_dir = storage_dir or os.path.join(tempfile.gettempdir(), 'poc_profiles')
+        self._busy = threading.Lock()
+
+    def init_app(self, app):
+        self.interval = app.config.get('PROFILE_SAMPLE_INTERVAL', self.interval)
+        self.top_n = app.config.get('PROFILE_TOP_N', self.top_n)
+        self.max_profiles = app.config.get('PROFILE_MAX_FILES', self.max_profiles)
+        self.storage_dir = app.config.get('PROFILE_DIR') or self.storage_dir
+
+        @app.before_request
+        def start_profile():
+            if PROFILE_HEADER in request.headers or PROFILE_ARG in request.args:
+                self._start()
+
+        @app.after_request
+        def finish_profile(response):
+            profile_id = self._finish()
+            if profile_id:
+                response.headers['X-Profile-Id'] = profile_id
+            return response
+
+        @app.teardown_request
+        def cleanup_profile(exc):
+            # 异常未转换为响应时也要停止采样和 tracemalloc
+            self._finish()
+
+    def _is_admin(self):
+        """当前请求是否带有管理员令牌；令牌缺失或无效时不分析，由接口自身的鉴权处理"""
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity() is not None and get_current_role() == '管理员'
+        except Exception:
+            return False
+
+    def _start(self):
+        if not self._is_admin():
+            return
+        if not self._busy.acquire(blocking=False):
+            logger.info("已有请求在进行性能分析，跳过本次分析")
+            return
+        # 进程已在跟踪（如 PYTHONTRACEMALLOC 或其他工具启动）时沿用，结束时不停止
+        was_tracing = tracemalloc.is_tracing()
+        try:
+            if was_tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            sampler = StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+        except Exception:
+            if not was_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._busy.release()
+            raise
+        g._profile = {
+            'was_tracing': was_tracing,
+            'sampler': sampler,
+            'started': time.perf_counter(),
+            'user_id': get_jwt_identity(),
+        }
+
+    def _finish(self):
+        state = g.pop('_profile', None)
+        if state is None:
+            return None
+        try:
+            state['sampler'].stop()
+            duration = time.perf_counter() - state['started']
+            # 进程全局：包含分析期间其他线程的分配（见模块说明）
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, threading.__file__),
+            ])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not state['was_tracing']:
+                tracemalloc.stop()
+            self._busy.release()
+
+        allocations = [{
+            'location': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}',
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+        } for stat in snapshot.statistics('lineno')[:self.top_n]]
+        meta = {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'user_id': state['user_id'],
+            'created_at': datetime.now().isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'sample_interval_ms': self.interval * 1000,
+            'samples': sum(state['sampler'].stacks.values()),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'allocations': allocations,
+        }
+        try:
+            return self._save(state['sampler'].stacks, meta)
+        except OSError as e:
+            logger.error(f"保存性能分析结果失败: {str(e)}", exc_info=True)
+            return None
+
+    def _save(self, stacks, meta):
+        os.makedirs(self.storage_dir, exist_ok=True)
+        profile_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        with open(os.path.join(self.storage_dir, f'{profile_id}.folded'), 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        with open(os.path.join(self.storage_dir, f'{profile_id}.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        logger.info(f"已保存请求 {meta['method']} {meta['path']} 的性能分析 {profile_id}")
+        self._prune()
+        return profile_id
+
+    def _prune(self):
+        """只保留最近 max_profiles 份结果"""
+        for profile_id in self.list_ids()[self.max_profiles:]:
+            for ext in ('folded', 'json'):
+                try:
+                    os.remove(os.path.join(self.storage_dir, f'{profile_id}.{ext}'))
+                except FileNotFoundError:
+                    pass
+
+    def list_ids(self):
+        """按时间倒序返回已保存的分析ID"""
+        if not os.path.isdir(self.storage_dir):
+            return []
+        ids = {name.rsplit('.', 1)[0] for name in os.listdir(self.storage_dir)}
+        return sorted((pid for pid in ids if PROFILE_ID_PATTERN.match(pid)), reverse=True)
+
+    def path_for(self, profile_id, ext):
+        """分析结果文件路径，ID格式不合法或文件不存在时返回 None"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = os.path.join(self.storage_dir, f'{profile_id}.{ext}')
+        return path if os.path.isfile(path) else None
+
+    def load_meta(self, profile_id):
+        path = self.path_for(profile_id, 'json')
+        if path is None:
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+
+request_profiler = RequestProfiler()
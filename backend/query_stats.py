@@ -0,0 +1,135 @@
+"""
+请求级SQL统计
+- 通过 before/after_cursor_execute 统计每个请求执行的语句数和数据库耗时
+- 调试模式下在响应头中返回 X-DB-Query-Count / X-DB-Time（毫秒）
+- 同一请求内相同语句（忽略参数）执行次数超过阈值时记录 N+1 警告
+- 请求之外的线程（如并行查询的工作线程）用 capture_query_stats() 统计，再由请求线程 merge_query_stats() 合并
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# IN (?, ?, ?) 之类长度可变的参数列表归一为 IN (?)
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_local = threading.local()
+
+
+def normalize_statement(statement):
+    return _PLACEHOLDER_LIST.sub('(?)', _WHITESPACE.sub(' ', statement).strip())
+
+
+class RequestQueryStats:
+    """单个请求的SQL统计"""
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+
+def get_request_query_stats():
+    """当前请求的SQL统计，请求中尚未执行查询时返回 None"""
+    if not has_request_context():
+        return None
+    return g.get('_query_stats')
+
+
+@contextmanager
+def capture_query_stats():
+    """在当前线程中统计代码块执行的SQL（请求之外），产出 RequestQueryStats"""
+    previous = getattr(_local, 'stats', None)
+    stats = _local.stats = RequestQueryStats()
+    try:
+        yield stats
+    finally:
+        _local.stats = previous
+
+
+def merge_query_stats(stats):
+    """把其他线程统计的SQL计入当前请求"""
+    if stats is None or not stats.count or not has_request_context():
+        return
+    current = g.get('_query_stats')
+    if current is None:
+        current = g._query_stats = RequestQueryStats()
+    current.count += stats.count
+    current.seconds += stats.seconds
+    current.statements.update(stats.statements)
+
+
+def _tracking():
+    return has_request_context() or getattr(_local, 'stats', None) is not None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _tracking():
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not _tracking():
+        return
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = getattr(_local, 'stats', None)
+    if stats is None:
+        stats = g.get('_query_stats')
+        if stats is None:
+            stats = g._query_stats = RequestQueryStats()
+    stats.count += 1
+    stats.seconds += elapsed
+    stats.statements[normalize_statement(statement)] += 1
+
+
+def _handle_error(exception_context):
+    # 语句执行失败时不会触发 after_cursor_execute，丢弃对应的开始时间
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_started'):
+        conn.info['query_started'].pop()
+
+
+def init_query_stats(app):
+    """注册SQL统计的引擎事件和响应钩子"""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+    threshold = app.config.get('DB_N_PLUS_ONE_THRESHOLD', 10)
+
+    @app.before_request
+    def reset_query_stats():
+        # 外层已有应用上下文时多个请求共用 g，每个请求开始时清零
+        g._query_stats = None
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = get_request_query_stats()
+        if stats is None:
+            return response
+
+        if threshold:
+            for statement, count in stats.statements.most_common():
+                if count <= threshold:
+                    break
+                logger.warning(f"疑似N+1查询: {request.method} {request.path} 中同一语句执行了 {count} 次: "
+                               f"{statement[:300]}")
+
+        if app.debug or app.config.get('DB_QUERY_HEADERS'):
+            response.headers['X-DB-Query-Count'] = str(stats.count)
+            response.headers['X-DB-Time'] = f'{stats.seconds * 1000:.2f}'
+        return response
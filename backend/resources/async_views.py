@@ -0,0 +1,55 @@
+"""
+ASGI 模式下异步处理的只读接口
+查询语句与同步资源共用（各资源模块中的 *_statement 函数），在异步会话上执行后用同一 Schema 转换；
+权限判断调用与同步资源相同的 utils 函数
+"""
+from asgi import async_view
+from schemas import (
+    ProjectListSchema, ReviewerTaskSchema, NotificationSchema, SupporterProjectSchema, PublicResourceSchema
+)
+from resources.projects import project_list_statement
+from resources.reviewer import reviewer_tasks_statement, notifications_statement
+from resources.supporter import supporter_projects_statement
+from resources.marketplace import public_resources_statement
+from resources.statistics import global_statistics_payload, user_statistics_statement, user_statistics_result
+from utils import require_statistics_viewer, require_incubation_browser
+
+
+@async_view('/api/statistics', 'StatisticsResource', '获取统计数据失败', cacheable=True)
+async def global_statistics(request):
+    require_statistics_viewer(await request.role())
+    # 快照通常已由后台线程算好；冷启动时的首次计算在线程中执行，不阻塞事件循环
+    return await request.run_sync(global_statistics_payload)
+
+
+@async_view('/api/statistics/user', 'UserStatisticsResource', '获取统计数据失败')
+async def user_statistics(request):
+    return user_statistics_result(await request.session.execute(user_statistics_statement(request.uid)))
+
+
+@async_view('/api/projects', 'ProjectResource', '获取项目列表失败')
+async def project_list(request):
+    rows = await request.session.execute(project_list_statement(request.uid, await request.role()))
+    return ProjectListSchema.dump_all(rows)
+
+
+@async_view('/api/reviews/my-tasks', 'ReviewerTasksResource', '获取评审任务列表失败')
+async def reviewer_tasks(request):
+    return ReviewerTaskSchema.dump_all(await request.session.execute(reviewer_tasks_statement(request.uid)))
+
+
+@async_view('/api/notifications', 'NotificationResource', '获取通知列表失败')
+async def notifications(request):
+    return NotificationSchema.dump_all(await request.session.execute(notifications_statement(request.uid)))
+
+
+@async_view('/api/supporter/projects', 'SupporterProjectsResource', '获取孵化项目列表失败', cacheable=True)
+async def supporter_projects(request):
+    require_incubation_browser(await request.role())
+    return SupporterProjectSchema.dump_all(await request.session.execute(supporter_projects_statement()))
+
+
+@async_view('/api/public/resources', 'PublicResourcesResource', '获取资源列表失败', cacheable=True)
+async def public_resources(request):
+    statement = public_resources_statement(request.args.get('resource_type'))
+    return PublicResourceSchema.dump_all(await request.session.execute(statement))
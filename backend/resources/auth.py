@@ -9,6 +9,8 @@ from flask_restful import Resource
 from models import db, User
 from exceptions import ValidationError, NotFoundError, APIException
 from utils import get_current_user
+from passwords import password_hasher
+from tokens import build_claims
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +27,17 @@ class Login(Resource):
             if not user or not user.check_password(data['password']):
                 raise ValidationError('用户名或密码错误')
 
-            token = create_access_token(identity=str(user.user_id))
+            # bcrypt cost 配置变化后，登录成功时透明地重新哈希
+            if password_hasher.needs_rehash(user.password_hash):
+                try:
+                    user.set_password(data['password'])
+                    db.session.commit()
+                except Exception as e:
+                    logger.warning(f"用户 {user.user_id} 密码重新哈希失败: {str(e)}")
+                    db.session.rollback()
+
+            # 角色、团队与令牌版本写入声明，后续请求的权限判断无需再查库
+            token = create_access_token(identity=str(user.user_id), additional_claims=build_claims(user))
             return {
                 'token': token,
                 'user_id': user.user_id,
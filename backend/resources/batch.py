@@ -0,0 +1,142 @@
+"""
+批量请求API资源
+看板一次提交多个 GET 请求，在进程内依次分发到已注册的接口，合并为一个响应返回
+"""
+import io
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlsplit, unquote_to_bytes
+
+from flask import current_app, request
+from flask_jwt_extended import jwt_required
+from flask_restful import Resource
+from sqlalchemy import event
+
+from models import db
+from exceptions import ValidationError, APIException
+from query_stats import get_request_query_stats, merge_query_stats
+from serialization import loads, JSON_MEDIATYPE
+
+logger = logging.getLogger(__name__)
+
+# 子请求不继承的请求头：请求体、压缩协商和内容协商（子响应统一为 JSON）
+_DROPPED_ENVIRON = ('CONTENT_TYPE', 'HTTP_ACCEPT_ENCODING', 'HTTP_X_PROFILE', 'REQUEST_URI', 'RAW_URI')
+
+
+def _sub_environ(path, query):
+    """以当前请求的 WSGI 环境为基础构造子请求（保留 Authorization 等请求头）"""
+    environ = {key: value for key, value in request.environ.items() if key not in _DROPPED_ENVIRON}
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+        'QUERY_STRING': query,
+        'CONTENT_LENGTH': '0',
+        'HTTP_ACCEPT': JSON_MEDIATYPE,
+        'wsgi.input': io.BytesIO(),
+    })
+    return environ
+
+
+@contextmanager
+def _sub_request(environ, session):
+    """子请求使用独立的 g 和请求上下文，但与外层请求共用数据库会话"""
+    app = current_app._get_current_object()
+    with app.app_context():
+        db.session.registry.set(session)
+        try:
+            with app.request_context(environ):
+                yield
+        finally:
+            # 会话由外层请求负责关闭，子请求的应用上下文结束时不能移除它
+            db.session.registry.clear()
+
+
+@contextmanager
+def _hold_loaded(session):
+    """批量请求期间保持已加载对象的强引用：会话的标识映射是弱引用，
+    不保持时子请求结束后对象即被回收，下一个子请求 get 同一对象仍要查询"""
+    loaded = []
+
+    def hold(session, instance):
+        loaded.append(instance)
+
+    event.listen(session, 'loaded_as_persistent', hold)
+    try:
+        yield
+    finally:
+        event.remove(session, 'loaded_as_persistent', hold)
+
+
+def _dispatch():
+    """按 Flask 的方式分发当前（子）请求，异常交给已注册的错误处理器"""
+    app = current_app
+    try:
+        rv = app.dispatch_request()
+    except Exception as e:
+        rv = app.handle_user_exception(e)
+    return app.make_response(rv)
+
+
+def dispatch_get(path, session):
+    """在进程内执行一个 GET 子请求，返回 (状态码, 响应数据)"""
+    url = urlsplit(path)
+    with _sub_request(_sub_environ(url.path, url.query), session):
+        response = _dispatch()
+        stats = get_request_query_stats()
+        try:
+            if response.mimetype != JSON_MEDIATYPE:
+                result = 406, {'message': '该接口不支持批量请求'}
+            else:
+                data = response.get_data()
+                result = response.status_code, loads(data) if data else None
+        finally:
+            response.close()
+    # 子请求执行的SQL计入外层请求的统计
+    merge_query_stats(stats)
+    return result
+
+
+class BatchResource(Resource):
+    """批量请求"""
+    @jwt_required()
+    def post(self):
+        """依次执行 requests 中的 GET 请求，返回各请求的状态码和响应数据
+
+        请求体：{"requests": [{"path": "/api/projects/1"}, {"path": "/api/projects/1/milestones"}]}
+        子请求使用同一令牌和数据库会话，同一对象在会话中只加载一次；某项失败不影响其他项
+        """
+        try:
+            data = request.get_json(silent=True) or {}
+            items = data.get('requests')
+            if not isinstance(items, list) or not items:
+                raise ValidationError('requests 必须是非空列表')
+            limit = current_app.config['BATCH_MAX_REQUESTS']
+            if len(items) > limit:
+                raise ValidationError(f'单次最多 {limit} 个请求')
+
+            paths = []
+            for item in items:
+                path = item.get('path') if isinstance(item, dict) else None
+                if not isinstance(path, str) or not path.startswith('/api/'):
+                    raise ValidationError('每个请求都需要以 /api/ 开头的 path')
+                if item.get('method', 'GET').upper() != 'GET':
+                    raise ValidationError('批量请求只支持 GET')
+                if urlsplit(path).path.rstrip('/') == request.path:
+                    raise ValidationError('批量请求不能嵌套')
+                paths.append(path)
+
+            session = db.session()
+            responses = []
+            with _hold_loaded(session):
+                for path in paths:
+                    status, body = dispatch_get(path, session)
+                    if status >= 500:
+                        # 失败的查询可能使事务不可用，回滚后继续执行其余请求
+                        session.rollback()
+                    responses.append({'path': path, 'status': status, 'body': body})
+            return {'responses': responses}
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"批量请求失败: {str(e)}", exc_info=True)
+            raise APIException('批量请求失败，请稍后重试', 500)
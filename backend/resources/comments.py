@@ -8,7 +8,9 @@ from flask_restful import Resource
 
 from models import db, User, UserInTeam, Project, ReviewTask, IncubationComment
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role, is_team_member
+from schemas import CommentSchema
+from compression import cache_compressed
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +30,7 @@ class ProjectCommentsResource(Resource):
                 has_permission = True
             else:
                 # 检查是否为团队成员
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id in my_team_ids:
+                if is_team_member(project.team_id):
                     has_permission = True
                 else:
                     # 检查是否为曾评审过该项目的评审人
@@ -45,22 +45,12 @@ class ProjectCommentsResource(Resource):
                 raise PermissionError('无权查看此项目的留言')
             
             # 获取所有留言，包含用户信息
-            comments = db.session.query(IncubationComment, User.real_name, User.role, User.affiliation)\
+            cache_compressed()
+            comments = CommentSchema.query()\
                 .join(User, IncubationComment.user_id == User.user_id)\
                 .filter(IncubationComment.project_id == project_id)\
-                .order_by(IncubationComment.create_time.asc()).all()
-            
-            return [{
-                'comment_id': c.IncubationComment.comment_id,
-                'project_id': c.IncubationComment.project_id,
-                'user_id': c.IncubationComment.user_id,
-                'content': c.IncubationComment.content,
-                'parent_id': c.IncubationComment.parent_id,
-                'create_time': str(c.IncubationComment.create_time),
-                'user_name': c.real_name or '未知',
-                'user_role': c.role,
-                'user_affiliation': c.affiliation or ''
-            } for c in comments]
+                .order_by(IncubationComment.create_time.asc())
+            return CommentSchema.dump_all(comments)
         except APIException:
             raise
         except Exception as e:
@@ -79,9 +69,7 @@ class ProjectCommentsResource(Resource):
             if str(project.principal_id) == str(uid):
                 has_permission = True
             else:
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id in my_team_ids:
+                if is_team_member(project.team_id):
                     has_permission = True
                 else:
                     reviewed = ReviewTask.query.filter_by(
@@ -0,0 +1,155 @@
+"""
+数据导出API资源
+"""
+import logging
+from datetime import datetime
+from urllib.parse import quote
+
+from flask import Response, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_restful import Resource
+from sqlalchemy import Select, func, literal, select, union_all
+from sqlalchemy.orm import aliased
+
+from models import (
+    db, User, Team, Project, FundRecord, Expenditure,
+    ReviewTask, ReviewOpinion, AuditRecord
+)
+from exceptions import ValidationError, PermissionError, APIException
+from utils import get_current_role
+from db_pool import without_statement_timeout
+from streaming import csv_stream, xlsx_stream, CSV_MIMETYPE, XLSX_MIMETYPE
+
+logger = logging.getLogger(__name__)
+
+# 服务端游标每批拉取的行数
+EXPORT_BATCH_SIZE = 1000
+
+
+def _projects_export():
+    """项目（含负责人、团队、评审均分）"""
+    avg_scores = select(
+        ReviewTask.project_id,
+        func.avg(ReviewOpinion.total_score).label('avg_score'),
+        func.count(ReviewOpinion.opinion_id).label('review_count')
+    ).join(ReviewOpinion, ReviewOpinion.task_id == ReviewTask.task_id)\
+     .group_by(ReviewTask.project_id).subquery()
+
+    stmt = select(
+        Project.project_id, Project.project_name, Project.domain, Project.maturity_level,
+        Project.status, Project.submit_time,
+        User.user_name, User.real_name, Team.team_id, Team.team_name,
+        func.round(avg_scores.c.avg_score, 1), func.coalesce(avg_scores.c.review_count, 0)
+    ).outerjoin(User, Project.principal_id == User.user_id)\
+     .outerjoin(Team, Project.team_id == Team.team_id)\
+     .outerjoin(avg_scores, avg_scores.c.project_id == Project.project_id)\
+     .order_by(Project.project_id)
+    header = ['项目ID', '项目名称', '领域', '成熟度', '状态', '提交时间',
+              '负责人账号', '负责人姓名', '团队ID', '团队名称', '评审均分', '评审数']
+    return header, stmt
+
+
+def _reviews_export():
+    """评审意见"""
+    stmt = select(
+        ReviewOpinion.opinion_id, ReviewTask.task_id, Project.project_id, Project.project_name,
+        User.user_id, User.real_name,
+        ReviewOpinion.innovation_score, ReviewOpinion.feasibility_score,
+        ReviewOpinion.potentiality_score, ReviewOpinion.teamwork_score,
+        ReviewOpinion.total_score, ReviewOpinion.submit_time, ReviewOpinion.comment
+    ).join(ReviewTask, ReviewOpinion.task_id == ReviewTask.task_id)\
+     .join(Project, ReviewTask.project_id == Project.project_id)\
+     .outerjoin(User, ReviewTask.reviewer_id == User.user_id)\
+     .order_by(ReviewOpinion.opinion_id)
+    header = ['意见ID', '任务ID', '项目ID', '项目名称', '评审人ID', '评审人',
+              '创新性', '可行性', '潜力', '团队协作', '总分', '提交时间', '评语']
+    return header, stmt
+
+
+def _funds_export():
+    """经费下拨与支出记录"""
+    # 复合查询的超时豁免提示放在第一个 SELECT 上
+    stmt = union_all(
+        without_statement_timeout(select(
+            literal('下拨').label('record_type'), FundRecord.fund_id.label('record_id'),
+            Project.project_id, Project.project_name, FundRecord.title, FundRecord.amount
+        ).join(Project, FundRecord.project_id == Project.project_id)),
+        select(
+            literal('支出'), Expenditure.expenditure_id,
+            Project.project_id, Project.project_name, Expenditure.title, Expenditure.amount
+        ).join(Project, Expenditure.project_id == Project.project_id),
+    )
+    header = ['类型', '记录ID', '项目ID', '项目名称', '名目', '金额']
+    return header, stmt
+
+
+def _audits_export():
+    """审核记录"""
+    auditor = aliased(User)
+    stmt = select(
+        AuditRecord.record_id, Project.project_id, Project.project_name,
+        AuditRecord.audit_type, AuditRecord.result,
+        auditor.user_id, auditor.real_name, AuditRecord.submit_time, AuditRecord.comment
+    ).join(Project, AuditRecord.project_id == Project.project_id)\
+     .outerjoin(auditor, AuditRecord.auditor_id == auditor.user_id)\
+     .order_by(AuditRecord.record_id)
+    header = ['记录ID', '项目ID', '项目名称', '审核类型', '结果', '审核人ID', '审核人', '提交时间', '意见']
+    return header, stmt
+
+
+EXPORT_DATASETS = {
+    'projects': ('项目', _projects_export),
+    'reviews': ('评审意见', _reviews_export),
+    'funds': ('经费记录', _funds_export),
+    'audits': ('审核记录', _audits_export),
+}
+
+
+def _stream_rows(stmt):
+    """使用服务端游标分批读取，每次只在内存中保留一批；导出耗时与数据量成正比，不受只读语句超时限制"""
+    if isinstance(stmt, Select):
+        stmt = without_statement_timeout(stmt)
+    stmt = stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    result = db.session.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+class DataExportResource(Resource):
+    """数据导出（仅管理员）"""
+    @jwt_required()
+    def get(self, dataset):
+        """流式导出数据集，?format=csv|xlsx"""
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以导出数据')
+
+            if dataset not in EXPORT_DATASETS:
+                raise ValidationError(f'不支持的导出数据集: {dataset}')
+            fmt = request.args.get('format', 'csv')
+            if fmt not in ['csv', 'xlsx']:
+                raise ValidationError('导出格式只支持 csv 或 xlsx')
+
+            title, build = EXPORT_DATASETS[dataset]
+            header, stmt = build()
+            rows = _stream_rows(stmt)
+            if fmt == 'csv':
+                body, mimetype = csv_stream(header, rows), CSV_MIMETYPE
+            else:
+                body, mimetype = xlsx_stream(title, header, rows), XLSX_MIMETYPE
+
+            filename = f"{title}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+            logger.info(f"用户 {get_jwt_identity()} 导出数据集 {dataset} ({fmt})")
+            return Response(
+                stream_with_context(body),
+                mimetype=mimetype,
+                headers={'Content-Disposition': f"attachment; filename*=UTF-8''{quote(filename)}"}
+            )
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"导出数据失败: {str(e)}", exc_info=True)
+            raise APIException('导出数据失败，请稍后重试', 500)
@@ -9,7 +9,7 @@ from sqlalchemy import func
 
 from models import db, User, UserInTeam, Project, FundRecord, Expenditure
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role, is_team_member
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +20,7 @@ class FundResource(Resource):
     def post(self):
         """下拨经费（仅管理员或秘书可用）"""
         try:
-            user = get_current_user()
-            if user.role not in ['管理员', '秘书']:
+            if get_current_role() not in ['管理员', '秘书']:
                 raise PermissionError('只有管理员或秘书可以下拨经费')
             
             data = request.get_json()
@@ -70,9 +69,7 @@ class ExpenditureResource(Resource):
         """提交报销（仅项目参与者可用）"""
         try:
             uid = get_jwt_identity()
-            user = get_current_user()
-            
-            if user.role != '项目参与者':
+            if get_current_role() != '项目参与者':
                 raise PermissionError('只有项目参与者可以提交报销')
             
             data = request.get_json()
@@ -82,14 +79,7 @@ class ExpenditureResource(Resource):
             project = Project.query.get_or_404(data['project_id'])
             
             # 检查是否为项目成员（负责人或团队成员）
-            is_member = False
-            if str(project.principal_id) == str(uid):
-                is_member = True
-            else:
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id in my_team_ids:
-                    is_member = True
+            is_member = str(project.principal_id) == str(uid) or is_team_member(project.team_id)
             
             if not is_member:
                 raise PermissionError('只有项目成员可以提交报销')
@@ -153,18 +143,9 @@ class ProjectFundsResource(Resource):
             project = Project.query.get_or_404(project_id)
             
             # 权限检查：项目成员、管理员、秘书可见
-            has_permission = False
-            if str(project.principal_id) == str(uid):
-                has_permission = True
-            else:
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id in my_team_ids:
-                    has_permission = True
-                else:
-                    user = User.query.get(uid)
-                    if user and user.role in ['管理员', '秘书']:
-                        has_permission = True
+            has_permission = (str(project.principal_id) == str(uid)
+                              or get_current_role() in ['管理员', '秘书']
+                              or is_team_member(project.team_id))
             
             if not has_permission:
                 raise PermissionError('无权查看此项目的经费信息')
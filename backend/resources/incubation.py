@@ -10,7 +10,7 @@ from flask_restful import Resource
 
 from models import db, User, UserInTeam, Project, IncubationRecord, ProofOfConcept
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user, create_default_milestones
+from utils import get_current_user, get_current_role, is_team_member, create_default_milestones
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +25,9 @@ class IncubationResourceAPI(Resource):
             project = Project.query.get_or_404(project_id)
             
             # 权限检查：项目负责人、团队成员、管理员、秘书可见
-            if str(project.principal_id) != str(uid):
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id not in my_team_ids:
-                    user = User.query.get(uid)
-                    if not user or user.role not in ['管理员', '秘书']:
-                        raise PermissionError('无权查看此项目的孵化信息')
+            if str(project.principal_id) != str(uid) and not is_team_member(project.team_id):
+                if get_current_role() not in ['管理员', '秘书']:
+                    raise PermissionError('无权查看此项目的孵化信息')
             
             incubation = IncubationRecord.query.filter_by(project_id=project_id).first()
             if not incubation:
@@ -176,13 +172,9 @@ class ProofOfConceptResource(Resource):
             project = Project.query.get_or_404(project_id)
             
             # 权限检查
-            if str(project.principal_id) != str(uid):
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id not in my_team_ids:
-                    user = User.query.get(uid)
-                    if user.role not in ['管理员', '秘书']:
-                        raise PermissionError('无权查看此项目的概念验证信息')
+            if str(project.principal_id) != str(uid) and not is_team_member(project.team_id):
+                if get_current_role() not in ['管理员', '秘书']:
+                    raise PermissionError('无权查看此项目的概念验证信息')
             
             pocs = ProofOfConcept.query.filter_by(project_id=project_id).order_by(ProofOfConcept.create_time.desc()).all()
             
@@ -312,13 +304,9 @@ class ProofOfConceptDetailResource(Resource):
             project = Project.query.get(poc.project_id)
             
             # 权限检查
-            if str(project.principal_id) != str(uid):
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id not in my_team_ids:
-                    user = User.query.get(uid)
-                    if user.role not in ['管理员', '秘书']:
-                        raise PermissionError('无权查看此概念验证记录')
+            if str(project.principal_id) != str(uid) and not is_team_member(project.team_id):
+                if get_current_role() not in ['管理员', '秘书']:
+                    raise PermissionError('无权查看此概念验证记录')
             
             return {
                 'poc_id': poc.poc_id,
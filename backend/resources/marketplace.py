@@ -9,11 +9,23 @@ from flask_restful import Resource
 
 from models import db, User, Project, IncubationResource, ResourceApplication
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role
+from schemas import PublicResourceSchema
+from compression import cache_compressed
 
 logger = logging.getLogger(__name__)
 
 
+def public_resources_statement(resource_type=None):
+    """开放中的资源（含提供方信息），可按类型筛选，按发布时间倒序"""
+    stmt = PublicResourceSchema.select()\
+        .join(User, IncubationResource.provider_id == User.user_id)\
+        .where(IncubationResource.status == '开放中')
+    if resource_type:
+        stmt = stmt.where(IncubationResource.resource_type == resource_type)
+    return stmt.order_by(IncubationResource.create_time.desc())
+
+
 class SupporterResourcesResource(Resource):
     """企业支持者发布资源"""
     @jwt_required()
@@ -21,8 +33,7 @@ class SupporterResourcesResource(Resource):
         """发布新资源（仅企业支持者）"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role != '企业支持者':
+            if get_current_role() != '企业支持者':
                 raise PermissionError('只有企业支持者可以发布资源')
             
             data = request.get_json()
@@ -52,8 +63,7 @@ class SupporterResourcesResource(Resource):
         """查看我发布的资源（仅企业支持者）"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role != '企业支持者':
+            if get_current_role() != '企业支持者':
                 raise PermissionError('只有企业支持者可以查看资源')
             
             resources = IncubationResource.query.filter_by(provider_id=uid)\
@@ -165,28 +175,8 @@ class PublicResourcesResource(Resource):
             uid = get_jwt_identity()
             resource_type = request.args.get('resource_type')
             
-            resources = db.session.query(
-                IncubationResource,
-                User.real_name,
-                User.affiliation
-            ).join(User, IncubationResource.provider_id == User.user_id)\
-            .filter(IncubationResource.status == '开放中')\
-            .order_by(IncubationResource.create_time.desc()).all()
-            
-            if resource_type:
-                resources = [r for r in resources if r.IncubationResource.resource_type == resource_type]
-            
-            return [{
-                'resource_id': r.IncubationResource.resource_id,
-                'provider_id': r.IncubationResource.provider_id,
-                'title': r.IncubationResource.title,
-                'resource_type': r.IncubationResource.resource_type,
-                'description': r.IncubationResource.description,
-                'status': r.IncubationResource.status,
-                'create_time': str(r.IncubationResource.create_time),
-                'provider_name': r.real_name or '未知',
-                'provider_affiliation': r.affiliation or '',
-            } for r in resources]
+            cache_compressed()
+            return PublicResourceSchema.dump_all(db.session.execute(public_resources_statement(resource_type)))
         except APIException:
             raise
         except Exception as e:
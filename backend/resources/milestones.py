@@ -9,7 +9,7 @@ from flask_restful import Resource
 
 from models import db, User, UserInTeam, Project, Milestone
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role, is_team_member
 
 logger = logging.getLogger(__name__)
 
@@ -24,18 +24,9 @@ class ProjectMilestonesResource(Resource):
             project = Project.query.get_or_404(project_id)
             
             # 权限检查：项目成员、管理员、秘书可见
-            has_permission = False
-            if str(project.principal_id) == str(uid):
-                has_permission = True
-            else:
-                my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-                my_team_ids = [tid[0] for tid in my_team_ids]
-                if project.team_id in my_team_ids:
-                    has_permission = True
-                else:
-                    user = User.query.get(uid)
-                    if user and user.role in ['管理员', '秘书']:
-                        has_permission = True
+            has_permission = (str(project.principal_id) == str(uid)
+                              or get_current_role() in ['管理员', '秘书']
+                              or is_team_member(project.team_id))
             
             if not has_permission:
                 raise PermissionError('无权查看此项目的里程碑信息')
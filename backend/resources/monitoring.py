@@ -0,0 +1,114 @@
+"""
+运行状态监控API资源
+"""
+import hmac
+import logging
+
+from flask import Response, current_app, request, send_file
+from flask_jwt_extended import get_jwt_identity, jwt_required, verify_jwt_in_request
+from flask_restful import Resource
+
+from models import db
+from exceptions import ValidationError, NotFoundError, PermissionError, APIException
+from utils import get_current_role
+from db_pool import pool_stats
+from metrics import registry
+from profiler import request_profiler
+
+logger = logging.getLogger(__name__)
+
+
+class DbPoolResource(Resource):
+    """数据库连接池状态（仅管理员）"""
+    @jwt_required()
+    def get(self):
+        """返回连接池占用、溢出数及取连接等待时间统计"""
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以查看连接池状态')
+
+            return {
+                'engines': {
+                    name or 'default': pool_stats(engine)
+                    for name, engine in db.engines.items()
+                }
+            }, 200
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"获取连接池状态失败: {str(e)}", exc_info=True)
+            raise APIException('获取连接池状态失败，请稍后重试', 500)
+
+
+def _is_admin_request():
+    """请求是否带有有效的管理员令牌"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity() is not None and get_current_role() == '管理员'
+    except Exception:
+        return False
+
+
+class MetricsResource(Resource):
+    """Prometheus 指标"""
+    def get(self):
+        """Prometheus 文本格式
+
+        配置了 METRICS_TOKEN 或 METRICS_REQUIRE_AUTH（生产环境默认开启）时，
+        需携带 Authorization: Bearer <METRICS_TOKEN> 或管理员令牌
+        """
+        expected = current_app.config.get('METRICS_TOKEN')
+        if expected or current_app.config.get('METRICS_REQUIRE_AUTH'):
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+            if not (expected and hmac.compare_digest(supplied, expected)) and not _is_admin_request():
+                raise PermissionError('无权访问监控指标')
+        return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class ProfileListResource(Resource):
+    """请求性能分析结果列表（仅管理员）"""
+    @jwt_required()
+    def get(self):
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以查看性能分析结果')
+
+            profiles = []
+            for profile_id in request_profiler.list_ids():
+                meta = request_profiler.load_meta(profile_id)
+                if meta:
+                    meta.pop('allocations', None)
+                    profiles.append({'profile_id': profile_id, **meta})
+            return profiles, 200
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"获取性能分析列表失败: {str(e)}", exc_info=True)
+            raise APIException('获取性能分析列表失败，请稍后重试', 500)
+
+
+class ProfileDownloadResource(Resource):
+    """下载请求性能分析结果（仅管理员）"""
+    @jwt_required()
+    def get(self, profile_id):
+        """?format=folded（折叠栈，默认）| json（耗时、内存分配 Top N）"""
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以下载性能分析结果')
+
+            fmt = request.args.get('format', 'folded')
+            if fmt not in ['folded', 'json']:
+                raise ValidationError('格式只支持 folded 或 json')
+            path = request_profiler.path_for(profile_id, fmt)
+            if path is None:
+                raise NotFoundError('性能分析结果不存在')
+
+            if fmt == 'json':
+                return request_profiler.load_meta(profile_id), 200
+            return send_file(path, mimetype='text/plain', as_attachment=True,
+                             download_name=f'{profile_id}.folded')
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"下载性能分析结果失败: {str(e)}", exc_info=True)
+            raise APIException('下载性能分析结果失败，请稍后重试', 500)
@@ -0,0 +1,252 @@
+"""
+项目全景API资源
+打开项目页所需的详情、孵化、概念验证、里程碑、经费、成果和对接意向一次返回：
+权限只检查一次，各分区的查询相互独立、并行执行，查询数量固定，与记录数无关
+"""
+import logging
+from functools import partial
+
+from flask import current_app, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_restful import Resource
+from sqlalchemy import func, select
+
+from models import (
+    db, User, Project, ReviewTask, ReviewOpinion, IncubationRecord, ProofOfConcept, Milestone,
+    FundRecord, Expenditure, Achievement, AchievementOfProject, SupportIntention
+)
+from exceptions import ValidationError, NotFoundError, PermissionError, APIException
+from utils import get_current_role, is_team_member
+from fanout import query_fanout, fetch_all
+from schemas import (
+    IncubationSchema, ProofOfConceptSchema, MilestoneSchema, FundRecordSchema, ExpenditureSchema,
+    ProjectAchievementSchema, ProjectIntentionSchema
+)
+
+logger = logging.getLogger(__name__)
+
+# 分区 -> (负责人和团队成员之外可查看的角色, 团队成员是否可查看, 无权查看时的提示)，与各分区对应接口的权限一致
+SECTIONS = {
+    'detail': (('秘书', '管理员', '评审人'), True, '无权查看此项目'),
+    'incubation': (('管理员', '秘书'), True, '无权查看此项目的孵化信息'),
+    'poc': (('管理员', '秘书'), True, '无权查看此项目的概念验证信息'),
+    'milestones': (('管理员', '秘书'), True, '无权查看此项目的里程碑信息'),
+    'funds': (('管理员', '秘书'), True, '无权查看此项目的经费信息'),
+    'achievements': (('管理员', '秘书'), True, '无权查看此项目的成果信息'),
+    'intentions': ((), False, '只有项目负责人可以查看对接意向'),
+}
+DEFAULT_PER_PAGE = 20
+
+
+def _parse_include():
+    """?include=poc,milestones，未指定时返回 None（全部有权查看的分区）"""
+    value = request.args.get('include')
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown:
+        raise ValidationError(f'未知的分区: {", ".join(unknown)}，可选: {", ".join(SECTIONS)}')
+    return list(dict.fromkeys(names))
+
+
+def _page_args(section):
+    """分区的分页参数 <分区>_page（从1开始）和 <分区>_per_page"""
+    max_per_page = current_app.config['OVERVIEW_MAX_PER_PAGE']
+    try:
+        page = int(request.args.get(f'{section}_page', 1))
+        per_page = int(request.args.get(f'{section}_per_page', DEFAULT_PER_PAGE))
+    except ValueError:
+        raise ValidationError(f'{section} 的分页参数必须是整数')
+    if page < 1 or not 1 <= per_page <= max_per_page:
+        raise ValidationError(f'{section}_page 从1开始，{section}_per_page 取值 1-{max_per_page}')
+    return page, per_page
+
+
+class PagedSection:
+    """分页分区：一条语句同时取当前页和总数（窗口函数），页码超出范围时再补一次计数"""
+
+    def __init__(self, schema, statement, order_by, page, per_page, *totals):
+        self.schema = schema
+        self.statement = statement.add_columns(func.count().over(), *totals).order_by(*order_by)
+        self.extra = len(totals)
+        self.page = page
+        self.per_page = per_page
+
+    def fetch(self):
+        """在当前线程的会话中执行（可作为 query_fanout 的任务）"""
+        rows = fetch_all(self.statement.limit(self.per_page).offset((self.page - 1) * self.per_page))
+        if not rows and self.page > 1:
+            # 当前页没有数据时无法从窗口函数得到总数，取第一行补齐
+            first = fetch_all(self.statement.limit(1))
+            return rows, first[0][len(self.schema.fields):] if first else None
+        return rows, rows[0][len(self.schema.fields):] if rows else None
+
+    def result(self, fetched):
+        """返回 (分页结果, 附加的窗口合计列)"""
+        rows, totals = fetched
+        size = len(self.schema.fields)
+        total, extra = (totals[0], tuple(totals[1:])) if totals else (0, (None,) * self.extra)
+        return {
+            'items': self.schema.dump_all(row[:size] for row in rows),
+            'total': total,
+            'page': self.page,
+            'per_page': self.per_page,
+        }, extra
+
+
+def _detail_statement(project_id, with_reviews):
+    """项目、负责人，以及（需要详情时）评审均分和评审数"""
+    columns = [Project, User.user_name]
+    if with_reviews:
+        columns += [
+            select(aggregate).join(ReviewTask, ReviewOpinion.task_id == ReviewTask.task_id)
+            .where(ReviewTask.project_id == project_id).scalar_subquery()
+            for aggregate in (func.avg(ReviewOpinion.total_score), func.count(ReviewOpinion.opinion_id))
+        ]
+    return select(*columns).outerjoin(User, Project.principal_id == User.user_id)\
+        .where(Project.project_id == project_id)
+
+
+def _detail(p, principal_name, avg_score, review_count):
+    """与 ProjectResource 详情的输出一致"""
+    review_info = {}
+    if review_count:
+        review_info = {'avg_score': round(float(avg_score) if avg_score else 0, 1), 'review_count': review_count}
+    return {
+        'project_id': p.project_id,
+        'project_name': p.project_name,
+        'domain': p.domain,
+        'status': p.status,
+        'maturity_level': p.maturity_level,
+        'project_description': p.project_description,
+        'submit_time': str(p.submit_time),
+        'principal_name': principal_name or '未知',
+        'team_id': p.team_id,
+        'review_info': review_info,
+    }
+
+
+def _funds_result(section, fetched):
+    fund_records, (total_funds,) = section['fund_records'].result(fetched['fund_records'])
+    expenditure_records, (total_expenditures,) = section['expenditure_records'].result(
+        fetched['expenditure_records'])
+    total_funds = float(total_funds or 0)
+    total_expenditures = float(total_expenditures or 0)
+    return {
+        'total_funds': total_funds,
+        'total_expenditures': total_expenditures,
+        'balance': total_funds - total_expenditures,
+        'usage_rate': round(total_expenditures / total_funds * 100, 2) if total_funds > 0 else 0,
+        'fund_records': fund_records,
+        'expenditure_records': expenditure_records,
+    }
+
+
+def _section_queries(project_id, sections):
+    """各分区的查询任务 {任务名: 无参函数}，以及汇总结果所需的分页对象"""
+    tasks, paged = {}, {}
+    if 'incubation' in sections:
+        tasks['incubation'] = partial(fetch_all, IncubationSchema.select().where(
+            IncubationRecord.project_id == project_id).limit(1))
+    if 'poc' in sections:
+        paged['poc'] = PagedSection(
+            ProofOfConceptSchema, ProofOfConceptSchema.select().where(ProofOfConcept.project_id == project_id),
+            (ProofOfConcept.create_time.desc(), ProofOfConcept.poc_id.desc()), *_page_args('poc'))
+    if 'milestones' in sections:
+        paged['milestones'] = PagedSection(
+            MilestoneSchema, MilestoneSchema.select().where(Milestone.project_id == project_id),
+            (Milestone.due_date.asc(), Milestone.milestone_id.asc()), *_page_args('milestones'))
+    if 'funds' in sections:
+        # 下拨和支出记录共用 funds_page / funds_per_page，合计由窗口函数随当前页一并返回
+        page_args = _page_args('funds')
+        paged['funds'] = {
+            'fund_records': PagedSection(
+                FundRecordSchema, FundRecordSchema.select().where(FundRecord.project_id == project_id),
+                (FundRecord.fund_id.asc(),), *page_args, func.sum(FundRecord.amount).over()),
+            'expenditure_records': PagedSection(
+                ExpenditureSchema, ExpenditureSchema.select().where(Expenditure.project_id == project_id),
+                (Expenditure.expenditure_id.asc(),), *page_args, func.sum(Expenditure.amount).over()),
+        }
+    if 'achievements' in sections:
+        paged['achievements'] = PagedSection(
+            ProjectAchievementSchema,
+            ProjectAchievementSchema.select().join(
+                AchievementOfProject, Achievement.achievement_id == AchievementOfProject.achievement_id
+            ).where(AchievementOfProject.project_id == project_id),
+            (Achievement.publish_time.desc(), AchievementOfProject.record_id.desc()), *_page_args('achievements'))
+    if 'intentions' in sections:
+        paged['intentions'] = PagedSection(
+            ProjectIntentionSchema,
+            ProjectIntentionSchema.select().join(User, SupportIntention.supporter_id == User.user_id)
+            .where(SupportIntention.project_id == project_id),
+            (SupportIntention.create_time.desc(), SupportIntention.intention_id.desc()), *_page_args('intentions'))
+
+    for name, section in paged.items():
+        if isinstance(section, dict):
+            for part, query in section.items():
+                tasks[f'{name}.{part}'] = query.fetch
+        else:
+            tasks[name] = section.fetch
+    return tasks, paged
+
+
+class ProjectOverviewResource(Resource):
+    """项目全景（详情、孵化、概念验证、里程碑、经费、成果、对接意向）"""
+    @jwt_required()
+    def get(self, project_id):
+        """获取项目全景
+
+        ?include=detail,poc,...   只返回指定分区；未指定时返回当前用户有权查看的全部分区
+        ?<分区>_page=1&<分区>_per_page=20   分页分区（poc、milestones、funds、achievements、intentions）各自分页
+        """
+        try:
+            uid = get_jwt_identity()
+            include = _parse_include()
+
+            row = db.session.execute(_detail_statement(
+                project_id, include is None or 'detail' in include)).first()
+            if not row:
+                raise NotFoundError('项目不存在')
+            p = row[0]
+
+            # 权限只检查一次：负责人、角色、团队成员（令牌声明，未命中时查询一次；管理员和秘书无需判断）
+            role = get_current_role()
+            is_principal = str(p.principal_id) == str(uid)
+            is_member = is_principal or (role not in ('管理员', '秘书') and is_team_member(p.team_id))
+
+            def allowed(section):
+                roles, members, _ = SECTIONS[section]
+                return is_principal or role in roles or (members and is_member)
+
+            if include is None:
+                sections = [name for name in SECTIONS if allowed(name)]
+                if not sections:
+                    raise PermissionError(SECTIONS['detail'][2])
+            else:
+                for name in include:
+                    if not allowed(name):
+                        raise PermissionError(SECTIONS[name][2])
+                sections = include
+
+            tasks, paged = _section_queries(project_id, sections)
+            fetched = query_fanout.run(tasks)
+
+            result = {}
+            for name in sections:
+                if name == 'detail':
+                    result['detail'] = _detail(p, *row[1:])
+                elif name == 'incubation':
+                    rows = fetched['incubation']
+                    result['incubation'] = IncubationSchema.dump(rows[0]) if rows else None
+                elif name == 'funds':
+                    result['funds'] = _funds_result(paged['funds'], {
+                        part: fetched[f'funds.{part}'] for part in paged['funds']})
+                else:
+                    result[name], _ = paged[name].result(fetched[name])
+            return result
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"获取项目全景失败: {str(e)}", exc_info=True)
+            raise APIException('获取项目全景失败，请稍后重试', 500)
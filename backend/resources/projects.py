@@ -9,25 +9,34 @@ from sqlalchemy import or_, func
 
 from models import db, User, Team, UserInTeam, Project, ReviewTask, ReviewOpinion
 from exceptions import ValidationError, NotFoundError, PermissionError, APIException
-from utils import get_current_user
+from utils import (
+    get_current_user, get_current_role, my_team_ids_subquery, sees_all_projects, can_view_project
+)
+from schemas import ProjectListSchema
 
 logger = logging.getLogger(__name__)
 
 
+def project_list_statement(uid, role):
+    """项目列表：秘书和管理员看到全部项目，其他人看到自己负责或所在团队的项目"""
+    stmt = ProjectListSchema.select().outerjoin(User, Project.principal_id == User.user_id)
+    if not sees_all_projects(role):
+        stmt = stmt.where(
+            or_(
+                Project.team_id.in_(my_team_ids_subquery(uid)),
+                Project.principal_id == uid
+            )
+        )
+    return stmt.order_by(Project.submit_time.desc())
+
+
 class ProjectResource(Resource):
     """项目管理"""
     @jwt_required()
     def get(self, project_id=None):
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-
-            if not user:
-                raise NotFoundError('用户不存在')
-
-            # 优化：直接获取团队ID列表，避免加载完整对象
-            my_team_ids = db.session.query(UserInTeam.team_id).filter_by(user_id=uid).all()
-            my_team_ids = [tid[0] for tid in my_team_ids]  # 解包元组
+            role = get_current_role()
 
             # === 1. 获取详情 (单条查询) ===
             if project_id:
@@ -40,36 +49,10 @@ class ProjectResource(Resource):
 
                 p, principal_name = result
 
-                # 权限检查
-                is_my_project = (str(p.principal_id) == str(uid))
-                is_team_member = (p.team_id in my_team_ids)
-                has_permission = (is_my_project or is_team_member or user.role in ['秘书', '管理员', '评审人'])
-
-                if not has_permission:
+                # 权限检查（角色与团队取自令牌声明）
+                if not can_view_project(role, uid, p):
                     raise PermissionError('无权查看此项目')
 
-                # 【状态自动修复逻辑】
-                if p.status == '复审中':
-                    finished_reviews = ReviewTask.query.filter_by(project_id=p.project_id, status='已完成').count()
-                    if finished_reviews >= 3:
-                        result = db.session.query(
-                            func.avg(ReviewOpinion.total_score).label('avg_score'),
-                            func.count(ReviewOpinion.opinion_id).label('review_count')
-                        ).join(ReviewTask, ReviewOpinion.task_id == ReviewTask.task_id) \
-                         .filter(ReviewTask.project_id == p.project_id).first()
-
-                        if result and result.review_count > 0:
-                            avg_score = float(result.avg_score) if result.avg_score else 0
-                            if avg_score > 60:
-                                p.status = '已通过'
-                            else:
-                                p.status = '复审未通过'
-                            try:
-                                db.session.commit()
-                            except Exception as e:
-                                logger.error(f"保存项目状态失败: {str(e)}", exc_info=True)
-                                db.session.rollback()
-
                 # 优化：使用聚合查询一次性获取复审信息，避免N+1查询
                 review_info = {}
                 result = db.session.query(
@@ -96,26 +79,7 @@ class ProjectResource(Resource):
                 }
 
             # === 2. 获取列表 (批量 JOIN 查询) ===
-            query = db.session.query(Project, User.user_name) \
-                .outerjoin(User, Project.principal_id == User.user_id)
-
-            if user.role not in ['秘书', '管理员']:
-                query = query.filter(
-                    or_(
-                        Project.team_id.in_(my_team_ids),
-                        Project.principal_id == uid
-                    )
-                )
-
-            results = query.order_by(Project.submit_time.desc()).all()
-
-            return [{
-                'project_id': p.project_id,
-                'project_name': p.project_name,
-                'domain': p.domain,
-                'status': p.status,
-                'principal_name': p_name or '未知'
-            } for p, p_name in results]
+            return ProjectListSchema.dump_all(db.session.execute(project_list_statement(uid, role)))
         except APIException:
             raise
         except Exception as e:
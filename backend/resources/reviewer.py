@@ -9,28 +9,31 @@ from sqlalchemy import func
 
 from models import db, User, Project, ReviewTask, ReviewOpinion, Notification
 from exceptions import ValidationError, NotFoundError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role
+from schemas import ReviewerTaskSchema, NotificationSchema
 
 logger = logging.getLogger(__name__)
 
 
+def reviewer_tasks_statement(uid):
+    """评审人的任务列表"""
+    return ReviewerTaskSchema.select().join(Project, ReviewTask.project_id == Project.project_id) \
+        .where(ReviewTask.reviewer_id == uid)
+
+
+def notifications_statement(uid):
+    """用户的通知，按时间倒序"""
+    return NotificationSchema.select().where(Notification.user_id == uid) \
+        .order_by(Notification.create_time.desc())
+
+
 class ReviewerTasksResource(Resource):
     """评审任务列表"""
     @jwt_required()
     def get(self):
         try:
             uid = get_jwt_identity()
-            tasks = db.session.query(ReviewTask, Project).join(Project, ReviewTask.project_id == Project.project_id) \
-                .filter(ReviewTask.reviewer_id == uid).all()
-
-            return [{
-                'task_id': t.ReviewTask.task_id,
-                'project_id': t.Project.project_id,
-                'project_name': t.Project.project_name,
-                'domain': t.Project.domain,
-                'deadline': str(t.ReviewTask.deadline) if t.ReviewTask.deadline else '无',
-                'status': t.ReviewTask.status
-            } for t in tasks]
+            return ReviewerTaskSchema.dump_all(db.session.execute(reviewer_tasks_statement(uid)))
         except APIException:
             raise
         except Exception as e:
@@ -44,8 +47,7 @@ class ReviewerIncubationProjectsResource(Resource):
     def get(self):
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role != '评审人':
+            if get_current_role() != '评审人':
                 raise PermissionError('只有评审人可以查看孵化项目')
             
             reviewed_project_ids = db.session.query(ReviewTask.project_id)\
@@ -149,7 +151,7 @@ class ReviewerReview(Resource):
                         project.status = '已通过'
                         msg = f"项目通过复审（均分{avg_score:.1f}），进入孵化阶段。"
                     else:
-                        project.status = '复审未通过'
+                        project.status = '已取消'
                         msg = f"项目复审未通过（均分{avg_score:.1f}）。"
 
                     notify = Notification(user_id=project.principal_id, title="复审结果", content=msg)
@@ -166,14 +168,7 @@ class NotificationResource(Resource):
     def get(self):
         try:
             uid = get_jwt_identity()
-            notifs = Notification.query.filter_by(user_id=uid).order_by(Notification.create_time.desc()).all()
-            return [{
-                'id': n.notification_id,
-                'title': n.title,
-                'content': n.content,
-                'create_time': str(n.create_time),
-                'is_read': n.is_read
-            } for n in notifs]
+            return NotificationSchema.dump_all(db.session.execute(notifications_statement(uid)))
         except APIException:
             raise
         except Exception as e:
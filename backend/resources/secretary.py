@@ -4,12 +4,12 @@
 import logging
 from datetime import datetime
 from flask import request
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_restful import Resource
 
 from models import db, Project, ReviewTask, AuditRecord
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +19,7 @@ class ProjectAudit(Resource):
     @jwt_required()
     def post(self, project_id):
         try:
-            user = get_current_user()
-            if user.role != '秘书':
+            if get_current_role() != '秘书':
                 raise PermissionError('只有秘书有权进行初审')
 
             data = request.get_json()
@@ -31,7 +30,7 @@ class ProjectAudit(Resource):
 
             record = AuditRecord(
                 project_id=project_id,
-                auditor_id=user.user_id,
+                auditor_id=get_jwt_identity(),
                 audit_type='项目初审',
                 result=data['result'],
                 comment=data.get('comment')
@@ -58,8 +57,7 @@ class TaskAssignment(Resource):
     @jwt_required()
     def post(self, project_id):
         try:
-            user = get_current_user()
-            if user.role != '秘书':
+            if get_current_role() != '秘书':
                 raise PermissionError('只有秘书有权分配评审人')
 
             data = request.get_json()
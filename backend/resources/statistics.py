@@ -3,100 +3,130 @@
 """
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_restful import Resource
-from sqlalchemy import func, text
+from sqlalchemy import func, text, and_, or_, distinct, select, union_all, literal, type_coerce
 
 from models import (
-    db, User, Project, FundRecord, Expenditure, IncubationRecord,
+    db, User, UserInTeam, Project, FundRecord, Expenditure, IncubationRecord,
     ReviewTask, ReviewOpinion, Milestone, IncubationResource,
     ResourceApplication, SupportIntention
 )
 from exceptions import PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role, require_statistics_viewer
+from snapshot import Snapshot
+from db_routing import on_replica
+from db_pool import without_statement_timeout
+from compression import cache_compressed
+from fanout import query_fanout, fetch_all
 
 logger = logging.getLogger(__name__)
 
 
+@on_replica
+def compute_global_statistics():
+    """计算全局统计数据（由快照后台线程调用）；八项汇总相互独立，并行执行"""
+    twelve_months_ago = datetime.now() - timedelta(days=365)
+    month = func.date_format(Project.submit_time, text("'%Y-%m'"))
+    statements = {
+        # 项目状态统计
+        'project_status': select(
+            Project.status,
+            func.count(Project.project_id).label('count')
+        ).group_by(Project.status),
+        # 项目领域统计
+        'project_domain': select(
+            Project.domain,
+            func.count(Project.project_id).label('count')
+        ).where(Project.domain.isnot(None)).group_by(Project.domain),
+        # 用户角色统计
+        'user_role': select(
+            User.role,
+            func.count(User.user_id).label('count')
+        ).group_by(User.role),
+        # 项目成熟度统计
+        'project_maturity': select(
+            Project.maturity_level,
+            func.count(Project.project_id).label('count')
+        ).group_by(Project.maturity_level),
+        # 项目提交时间趋势（按月统计，最近12个月）
+        'project_trend': select(
+            month.label('month'),
+            func.count(Project.project_id).label('count')
+        ).where(Project.submit_time >= twelve_months_ago).group_by(month).order_by(text('month')),
+        # 经费统计（两表分别汇总，避免笛卡尔积导致重复累加）
+        'fund': select(
+            select(func.sum(FundRecord.amount)).scalar_subquery().label('total_allocated'),
+            select(func.sum(Expenditure.amount)).scalar_subquery().label('total_expended')
+        ),
+        # 孵化项目统计
+        'incubation': select(
+            func.count(IncubationRecord.incubation_id).label('total'),
+            func.avg(IncubationRecord.progress).label('avg_progress')
+        ),
+        # 评审统计
+        'review_status': select(
+            ReviewTask.status,
+            func.count(ReviewTask.task_id).label('count')
+        ).group_by(ReviewTask.status),
+    }
+    # 全表汇总在后台线程中执行，不受只读语句超时限制
+    results = query_fanout.all({name: without_statement_timeout(stmt) for name, stmt in statements.items()})
+    project_status_stats = results['project_status']
+    project_domain_stats = results['project_domain']
+    user_role_stats = results['user_role']
+    project_maturity_stats = results['project_maturity']
+    project_trend = results['project_trend']
+    fund_stats = results['fund'][0]
+    incubation_stats = results['incubation'][0]
+    review_stats = results['review_status']
+
+    return {
+        'project_status': [{'status': s[0], 'count': s[1]} for s in project_status_stats],
+        'project_domain': [{'domain': d[0] or '未分类', 'count': d[1]} for d in project_domain_stats],
+        'user_role': [{'role': r[0], 'count': r[1]} for r in user_role_stats],
+        'project_maturity': [{'level': m[0], 'count': m[1]} for m in project_maturity_stats],
+        'project_trend': [{'month': t[0], 'count': t[1]} for t in project_trend],
+        'fund': {
+            'total_allocated': float(fund_stats[0] or 0),
+            'total_expended': float(fund_stats[1] or 0),
+        },
+        'incubation': {
+            'total': incubation_stats[0] or 0,
+            'avg_progress': float(incubation_stats[1] or 0),
+        },
+        'review_status': [{'status': r[0], 'count': r[1]} for r in review_stats],
+    }
+
+
+# 全局统计快照，刷新间隔由 STATISTICS_REFRESH_INTERVAL 配置
+global_statistics_snapshot = Snapshot('global_statistics', compute_global_statistics)
+
+
+def global_statistics_payload():
+    """全局统计快照及其版本信息"""
+    snapshot = global_statistics_snapshot.get()
+    return {
+        **snapshot['data'],
+        'version': snapshot['version'],
+        'computed_at': snapshot['computed_at'],
+        'refresh_interval': global_statistics_snapshot.interval,
+    }
+
+
 class StatisticsResource(Resource):
     """数据统计API（管理员/秘书可见）"""
     @jwt_required()
     def get(self):
-        """获取全局统计数据"""
+        """获取全局统计数据（读取后台刷新的快照）"""
         try:
-            uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role not in ['管理员', '秘书']:
-                raise PermissionError('只有管理员或秘书可以查看统计数据')
-            
-            # 项目状态统计
-            project_status_stats = db.session.query(
-                Project.status,
-                func.count(Project.project_id).label('count')
-            ).group_by(Project.status).all()
-            
-            # 项目领域统计
-            project_domain_stats = db.session.query(
-                Project.domain,
-                func.count(Project.project_id).label('count')
-            ).filter(Project.domain.isnot(None)).group_by(Project.domain).all()
-            
-            # 用户角色统计
-            user_role_stats = db.session.query(
-                User.role,
-                func.count(User.user_id).label('count')
-            ).group_by(User.role).all()
-            
-            # 项目成熟度统计
-            project_maturity_stats = db.session.query(
-                Project.maturity_level,
-                func.count(Project.project_id).label('count')
-            ).group_by(Project.maturity_level).all()
-            
-            # 项目提交时间趋势（按月统计，最近12个月）
-            twelve_months_ago = datetime.now() - timedelta(days=365)
-            project_trend = db.session.query(
-                func.date_format(Project.submit_time, text("'%Y-%m'")).label('month'),
-                func.count(Project.project_id).label('count')
-            ).filter(Project.submit_time >= twelve_months_ago)\
-            .group_by(func.date_format(Project.submit_time, text("'%Y-%m'")))\
-            .order_by(text('month')).all()
-            
-            # 经费统计
-            fund_stats = db.session.query(
-                func.sum(FundRecord.amount).label('total_allocated'),
-                func.sum(Expenditure.amount).label('total_expended')
-            ).first()
-            
-            # 孵化项目统计
-            incubation_stats = db.session.query(
-                func.count(IncubationRecord.incubation_id).label('total'),
-                func.avg(IncubationRecord.progress).label('avg_progress')
-            ).first()
-            
-            # 评审统计
-            review_stats = db.session.query(
-                ReviewTask.status,
-                func.count(ReviewTask.task_id).label('count')
-            ).group_by(ReviewTask.status).all()
-            
-            return {
-                'project_status': [{'status': s[0], 'count': s[1]} for s in project_status_stats],
-                'project_domain': [{'domain': d[0] or '未分类', 'count': d[1]} for d in project_domain_stats],
-                'user_role': [{'role': r[0], 'count': r[1]} for r in user_role_stats],
-                'project_maturity': [{'level': m[0], 'count': m[1]} for m in project_maturity_stats],
-                'project_trend': [{'month': t[0], 'count': t[1]} for t in project_trend],
-                'fund': {
-                    'total_allocated': float(fund_stats[0] or 0),
-                    'total_expended': float(fund_stats[1] or 0),
-                },
-                'incubation': {
-                    'total': incubation_stats[0] or 0,
-                    'avg_progress': float(incubation_stats[1] or 0),
-                },
-                'review_status': [{'status': r[0], 'count': r[1]} for r in review_stats],
-            }
+            require_statistics_viewer(get_current_role())
+
+            payload = global_statistics_payload()
+            cache_compressed()
+            return payload
         except APIException:
             raise
         except Exception as e:
@@ -104,50 +134,67 @@ class StatisticsResource(Resource):
             raise APIException('获取统计数据失败，请稍后重试', 500)
 
 
+def user_statistics_statement(uid):
+    """用户参与项目的状态、领域、里程碑和经费统计（一条 UNION ALL 语句）"""
+    # 我参与的项目：我负责的项目 + 我所在团队的项目
+    my_team_ids = select(UserInTeam.team_id).where(UserInTeam.user_id == uid)
+    my_project_filter = or_(Project.principal_id == uid, Project.team_id.in_(my_team_ids))
+    my_project_ids = select(Project.project_id).where(my_project_filter)
+
+    domain = func.coalesce(Project.domain, '未分类')
+    return union_all(
+        # 我的项目状态统计
+        select(
+            literal('project_status').label('kind'),
+            type_coerce(Project.status, db.String).label('key'),
+            func.count(Project.project_id).label('value')
+        ).where(my_project_filter).group_by(Project.status),
+        # 我的项目领域统计
+        select(
+            literal('project_domain'), domain, func.count(Project.project_id)
+        ).where(my_project_filter).group_by(domain),
+        # 我的里程碑统计
+        select(
+            literal('milestone_status'),
+            type_coerce(Milestone.status, db.String),
+            func.count(Milestone.milestone_id)
+        ).where(Milestone.project_id.in_(my_project_ids)).group_by(Milestone.status),
+        # 经费与支出分别汇总，避免两表连接后重复累加
+        select(
+            literal('fund'), literal('total_allocated'), func.sum(FundRecord.amount)
+        ).where(FundRecord.project_id.in_(my_project_ids)),
+        select(
+            literal('fund'), literal('total_expended'), func.sum(Expenditure.amount)
+        ).where(Expenditure.project_id.in_(my_project_ids)),
+    )
+
+
+def user_statistics_result(rows):
+    """把 (kind, key, value) 行整理为用户统计结果"""
+    result = {
+        'project_status': [],
+        'project_domain': [],
+        'fund': {'total_allocated': 0.0, 'total_expended': 0.0},
+        'milestone_status': [],
+    }
+    for kind, key, value in rows:
+        if kind == 'fund':
+            result['fund'][key] = float(value or 0)
+        elif kind == 'project_domain':
+            result[kind].append({'domain': key, 'count': int(value)})
+        else:
+            result[kind].append({'status': key, 'count': int(value)})
+    return result
+
+
 class UserStatisticsResource(Resource):
-    """用户个人统计数据（项目负责人）"""
+    """用户个人统计数据（项目负责人及团队成员）"""
     @jwt_required()
     def get(self):
-        """获取当前用户的项目统计数据"""
+        """获取当前用户参与项目的统计数据（单次数据库往返）"""
         try:
             uid = get_jwt_identity()
-            
-            # 我的项目状态统计
-            my_projects = Project.query.filter_by(principal_id=uid).all()
-            project_status_stats = {}
-            for project in my_projects:
-                status = project.status
-                project_status_stats[status] = project_status_stats.get(status, 0) + 1
-            
-            # 我的项目领域统计
-            project_domain_stats = {}
-            for project in my_projects:
-                domain = project.domain or '未分类'
-                project_domain_stats[domain] = project_domain_stats.get(domain, 0) + 1
-            
-            # 我的经费统计
-            my_fund_stats = db.session.query(
-                func.sum(FundRecord.amount).label('total_allocated'),
-                func.sum(Expenditure.amount).label('total_expended')
-            ).join(Project, FundRecord.project_id == Project.project_id)\
-            .filter(Project.principal_id == uid).first()
-            
-            # 我的里程碑统计
-            my_project_ids = [p.project_id for p in my_projects]
-            milestone_stats = db.session.query(
-                Milestone.status,
-                func.count(Milestone.milestone_id).label('count')
-            ).filter(Milestone.project_id.in_(my_project_ids)).group_by(Milestone.status).all() if my_project_ids else []
-            
-            return {
-                'project_status': [{'status': k, 'count': v} for k, v in project_status_stats.items()],
-                'project_domain': [{'domain': k, 'count': v} for k, v in project_domain_stats.items()],
-                'fund': {
-                    'total_allocated': float(my_fund_stats[0] or 0),
-                    'total_expended': float(my_fund_stats[1] or 0),
-                },
-                'milestone_status': [{'status': m[0], 'count': m[1]} for m in milestone_stats],
-            }
+            return user_statistics_result(db.session.execute(user_statistics_statement(uid)))
         except APIException:
             raise
         except Exception as e:
@@ -162,52 +209,36 @@ class ReviewerStatisticsResource(Resource):
         """获取当前评审人的评审统计数据"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role != '评审人':
+            if get_current_role() != '评审人':
                 raise PermissionError('只有评审人可以查看评审统计数据')
             
-            # 我的评审任务状态统计
-            my_tasks = ReviewTask.query.filter_by(reviewer_id=uid).all()
-            task_status_stats = {}
-            for task in my_tasks:
-                status = task.status
-                task_status_stats[status] = task_status_stats.get(status, 0) + 1
-            
-            # 我的评审评分统计（如果有评分数据）
-            my_opinions = db.session.query(ReviewOpinion, ReviewTask)\
-                .join(ReviewTask, ReviewOpinion.task_id == ReviewTask.task_id)\
-                .filter(ReviewTask.reviewer_id == uid).all()
-            
-            score_stats = {
-                'avg_innovation': 0,
-                'avg_feasibility': 0,
-                'avg_teamwork': 0,
-                'avg_potentiality': 0,
-            }
-            
-            if my_opinions:
-                total = len(my_opinions)
-                score_stats = {
-                    'avg_innovation': sum(o[0].innovation_score for o in my_opinions) / total,
-                    'avg_feasibility': sum(o[0].feasibility_score for o in my_opinions) / total,
-                    'avg_teamwork': sum(o[0].teamwork_score for o in my_opinions) / total,
-                    'avg_potentiality': sum(o[0].potentiality_score for o in my_opinions) / total,
-                }
-            
-            # 我评审的项目领域统计
-            reviewed_project_ids = [t.project_id for t in my_tasks]
-            reviewed_domains = db.session.query(Project.domain)\
-                .filter(Project.project_id.in_(reviewed_project_ids)).all() if reviewed_project_ids else []
-            domain_stats = {}
-            for domain_tuple in reviewed_domains:
-                domain = domain_tuple[0] or '未分类'
-                domain_stats[domain] = domain_stats.get(domain, 0) + 1
+            # NumPy 较重，统计快照随应用启动导入本模块，这里按需导入
+            from reviewer_analytics import load_opinion_columns, score_averages
+            domain = func.coalesce(Project.domain, '未分类')
+            # 三项统计相互独立，并行执行
+            results = query_fanout.run({
+                # 我的评审任务状态统计
+                'task_status': partial(fetch_all, select(
+                    ReviewTask.status,
+                    func.count(ReviewTask.task_id).label('count')
+                ).where(ReviewTask.reviewer_id == uid).group_by(ReviewTask.status)),
+                # 我的评审评分（列式加载，随后向量化计算）
+                'columns': partial(load_opinion_columns, reviewer_id=uid),
+                # 我评审的项目领域统计
+                'domain': partial(fetch_all, select(
+                    domain,
+                    func.count(ReviewTask.task_id).label('count')
+                ).select_from(Project).join(ReviewTask, ReviewTask.project_id == Project.project_id)
+                    .where(ReviewTask.reviewer_id == uid).group_by(domain)),
+            })
+            task_status_stats, columns, domain_stats = results['task_status'], results['columns'], results['domain']
+            score_stats = score_averages(columns)
             
             return {
-                'task_status': [{'status': k, 'count': v} for k, v in task_status_stats.items()],
+                'task_status': [{'status': t[0], 'count': t[1]} for t in task_status_stats],
                 'score_stats': score_stats,
-                'reviewed_domains': [{'domain': k, 'count': v} for k, v in domain_stats.items()],
-                'total_reviews': len(my_opinions),
+                'reviewed_domains': [{'domain': d[0], 'count': d[1]} for d in domain_stats],
+                'total_reviews': len(columns['total']),
             }
         except APIException:
             raise
@@ -216,6 +247,24 @@ class ReviewerStatisticsResource(Resource):
             raise APIException('获取统计数据失败，请稍后重试', 500)
 
 
+class ReviewerCalibrationResource(Resource):
+    """评审人评分校准报告（秘书/管理员可见）"""
+    @jwt_required()
+    def get(self):
+        """获取全部评审人的评分校准报告"""
+        try:
+            if get_current_role() not in ['秘书', '管理员']:
+                raise PermissionError('只有秘书或管理员可以查看评审校准报告')
+
+            from reviewer_analytics import load_opinion_columns, calibration_report
+            return calibration_report(load_opinion_columns())
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"获取评审校准报告失败: {str(e)}", exc_info=True)
+            raise APIException('获取评审校准报告失败，请稍后重试', 500)
+
+
 class SupporterStatisticsResource(Resource):
     """企业支持者统计数据"""
     @jwt_required()
@@ -223,44 +272,168 @@ class SupporterStatisticsResource(Resource):
         """获取当前企业支持者的资源统计数据"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            if not user or user.role != '企业支持者':
+            if get_current_role() != '企业支持者':
                 raise PermissionError('只有企业支持者可以查看资源统计数据')
             
-            # 我发布的资源统计
-            my_resources = IncubationResource.query.filter_by(provider_id=uid).all()
-            resource_type_stats = {}
-            resource_status_stats = {}
-            for resource in my_resources:
-                rtype = resource.resource_type
-                resource_type_stats[rtype] = resource_type_stats.get(rtype, 0) + 1
-                status = resource.status
-                resource_status_stats[status] = resource_status_stats.get(status, 0) + 1
-            
-            # 我的资源申请统计
-            my_resource_ids = [r.resource_id for r in my_resources]
-            application_stats = db.session.query(
-                ResourceApplication.status,
-                func.count(ResourceApplication.application_id).label('count')
-            ).filter(ResourceApplication.resource_id.in_(my_resource_ids))\
-            .group_by(ResourceApplication.status).all() if my_resource_ids else []
-            
-            # 对接意向统计
-            intention_stats = db.session.query(
-                SupportIntention.status,
-                func.count(SupportIntention.intention_id).label('count')
-            ).filter(SupportIntention.supporter_id == uid)\
-            .group_by(SupportIntention.status).all()
+            # 三项统计相互独立，并行执行
+            results = query_fanout.run({
+                # 我发布的资源统计（按类型、状态分组，数据库端聚合）
+                'resource': partial(_resource_stats, uid),
+                # 我的资源申请统计
+                'application': partial(fetch_all, select(
+                    ResourceApplication.status,
+                    func.count(ResourceApplication.application_id).label('count')
+                ).join(IncubationResource, ResourceApplication.resource_id == IncubationResource.resource_id)
+                    .where(IncubationResource.provider_id == uid)
+                    .group_by(ResourceApplication.status)),
+                # 对接意向统计
+                'intention': partial(fetch_all, _intention_status_statement(uid)),
+            })
+            resource_stats = results['resource']
+            application_stats, intention_stats = results['application'], results['intention']
             
             return {
-                'resource_type': [{'type': k, 'count': v} for k, v in resource_type_stats.items()],
-                'resource_status': [{'status': k, 'count': v} for k, v in resource_status_stats.items()],
+                'resource_type': resource_stats['resource_type'],
+                'resource_status': resource_stats['resource_status'],
                 'application_status': [{'status': a[0], 'count': a[1]} for a in application_stats],
                 'intention_status': [{'status': i[0], 'count': i[1]} for i in intention_stats],
-                'total_resources': len(my_resources),
+                'total_resources': resource_stats['total'],
             }
         except APIException:
             raise
         except Exception as e:
             logger.error(f"获取企业支持者统计数据失败: {str(e)}", exc_info=True)
             raise APIException('获取统计数据失败，请稍后重试', 500)
+
+
+class SupporterFunnelResource(Resource):
+    """企业支持者转化漏斗分析"""
+    @jwt_required()
+    def get(self):
+        """资源 → 申请 → 对接中 → 已达成 的转化漏斗、意向状态及响应时长中位数
+
+        查询数量固定，与支持者发布的资源数量无关
+        """
+        try:
+            if get_current_role() != '企业支持者':
+                raise PermissionError('只有企业支持者可以查看转化漏斗')
+            uid = get_jwt_identity()
+
+            # 申请按状态分组，同时用标量子查询统计收到过申请的资源数
+            my_applications = and_(
+                ResourceApplication.resource_id == IncubationResource.resource_id,
+                IncubationResource.provider_id == uid
+            )
+            applied_resources = select(func.count(distinct(ResourceApplication.resource_id)))\
+                .where(my_applications).correlate(None).scalar_subquery()
+            application_statement = select(
+                ResourceApplication.status,
+                func.count(ResourceApplication.application_id),
+                applied_resources
+            ).where(my_applications).group_by(ResourceApplication.status)
+
+            # 响应时长中位数（申请与意向一次查询）
+            median_statement = union_all(
+                _median_response_query(
+                    'application', ResourceApplication,
+                    my_applications, ResourceApplication.status != '待处理'
+                ),
+                _median_response_query(
+                    'intention', SupportIntention,
+                    SupportIntention.supporter_id == uid, SupportIntention.status != '待处理'
+                ),
+            )
+
+            # 四项查询相互独立，并行执行
+            results = query_fanout.run({
+                'resource': partial(_resource_stats, uid),
+                'application': partial(fetch_all, application_statement),
+                'intention': partial(fetch_all, _intention_status_statement(uid)),
+                'median': partial(fetch_all, median_statement),
+            })
+            resource_stats, application_rows = results['resource'], results['application']
+            intention_stats, medians = results['intention'], dict(results['median'])
+
+            application_status = {row[0]: row[1] for row in application_rows}
+            applied_resource_count = application_rows[0][2] if application_rows else 0
+            total_applications = sum(application_status.values())
+            in_progress = application_status.get('对接中', 0) + application_status.get('已达成', 0)
+            achieved = application_status.get('已达成', 0)
+
+            def rate(numerator, denominator):
+                return round(numerator / denominator * 100, 2) if denominator else 0
+
+            funnel = [
+                {'stage': '发布资源', 'count': resource_stats['total']},
+                {'stage': '收到申请', 'count': total_applications, 'resources': applied_resource_count},
+                {'stage': '对接中', 'count': in_progress},
+                {'stage': '已达成', 'count': achieved},
+            ]
+            for previous, stage in zip(funnel, funnel[1:]):
+                stage['conversion_rate'] = rate(stage['count'], previous['count'])
+
+            return {
+                'funnel': funnel,
+                'resource_type': resource_stats['resource_type'],
+                'resource_status': resource_stats['resource_status'],
+                'application_status': [{'status': k, 'count': v} for k, v in application_status.items()],
+                'intention_status': [{'status': i[0], 'count': i[1]} for i in intention_stats],
+                'median_response_hours': {
+                    'application': _seconds_to_hours(medians.get('application')),
+                    'intention': _seconds_to_hours(medians.get('intention')),
+                },
+            }
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"获取企业支持者转化漏斗失败: {str(e)}", exc_info=True)
+            raise APIException('获取转化漏斗失败，请稍后重试', 500)
+
+
+def _intention_status_statement(supporter_id):
+    """对接意向按状态计数"""
+    return select(
+        SupportIntention.status,
+        func.count(SupportIntention.intention_id).label('count')
+    ).where(SupportIntention.supporter_id == supporter_id).group_by(SupportIntention.status)
+
+
+def _resource_stats(provider_id):
+    """按（类型, 状态）分组统计资源，一次查询同时得到两个维度"""
+    rows = db.session.query(
+        IncubationResource.resource_type,
+        IncubationResource.status,
+        func.count(IncubationResource.resource_id)
+    ).filter(IncubationResource.provider_id == provider_id)\
+    .group_by(IncubationResource.resource_type, IncubationResource.status).all()
+
+    type_stats, status_stats = {}, {}
+    for rtype, status, count in rows:
+        type_stats[rtype] = type_stats.get(rtype, 0) + count
+        status_stats[status] = status_stats.get(status, 0) + count
+    return {
+        'resource_type': [{'type': k, 'count': v} for k, v in type_stats.items()],
+        'resource_status': [{'status': k, 'count': v} for k, v in status_stats.items()],
+        'total': sum(type_stats.values()),
+    }
+
+
+def _median_response_query(kind, model, *criteria):
+    """用窗口函数计算 update_time - create_time 的中位数（秒）"""
+    seconds = func.timestampdiff(text('SECOND'), model.create_time, model.update_time)
+    ranked = select(
+        seconds.label('seconds'),
+        func.row_number().over(order_by=seconds).label('rn'),
+        func.count().over().label('cnt')
+    ).where(*criteria).subquery()
+    return select(
+        literal(kind).label('kind'),
+        func.avg(ranked.c.seconds).label('median_seconds')
+    ).where(ranked.c.rn.in_([
+        (ranked.c.cnt + 1) // 2,
+        (ranked.c.cnt + 2) // 2,
+    ]))
+
+
+def _seconds_to_hours(seconds):
+    return round(float(seconds) / 3600, 2) if seconds is not None else None
@@ -9,11 +9,21 @@ from flask_restful import Resource
 
 from models import db, User, Project, SupportIntention
 from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role, require_incubation_browser
+from schemas import SupporterProjectSchema
+from compression import cache_compressed
 
 logger = logging.getLogger(__name__)
 
 
+def supporter_projects_statement():
+    """正在孵化的项目（含负责人姓名），按提交时间倒序"""
+    return SupporterProjectSchema.select()\
+        .join(User, Project.principal_id == User.user_id)\
+        .where(Project.status.in_(['孵化中', '概念验证中']))\
+        .order_by(Project.submit_time.desc())
+
+
 class SupporterProjectsResource(Resource):
     """支持者可浏览的孵化项目"""
     @jwt_required()
@@ -21,27 +31,11 @@ class SupporterProjectsResource(Resource):
         """获取正在孵化的项目列表（供支持者浏览）"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            
-            if not user or user.role != '企业支持者':
-                raise PermissionError('只有企业支持者可以浏览孵化项目')
+            require_incubation_browser(get_current_role())
             
             # 只返回状态为"孵化中"或"概念验证中"的项目
-            projects = db.session.query(Project, User.real_name)\
-                .join(User, Project.principal_id == User.user_id)\
-                .filter(Project.status.in_(['孵化中', '概念验证中']))\
-                .order_by(Project.submit_time.desc()).all()
-            
-            return [{
-                'project_id': p.Project.project_id,
-                'project_name': p.Project.project_name,
-                'domain': p.Project.domain,
-                'maturity_level': p.Project.maturity_level,
-                'project_description': p.Project.project_description,
-                'status': p.Project.status,
-                'principal_name': p.real_name or '未知',
-                'submit_time': str(p.Project.submit_time)
-            } for p in projects]
+            cache_compressed()
+            return SupporterProjectSchema.dump_all(db.session.execute(supporter_projects_statement()))
         except APIException:
             raise
         except Exception as e:
@@ -56,9 +50,7 @@ class SupportIntentionResource(Resource):
         """提交对接意向"""
         try:
             uid = get_jwt_identity()
-            user = User.query.get(uid)
-            
-            if not user or user.role != '企业支持者':
+            if get_current_role() != '企业支持者':
                 raise PermissionError('只有企业支持者可以提交对接意向')
             
             data = request.get_json()
@@ -9,7 +9,8 @@ from sqlalchemy import func
 
 from models import db, User, Team, UserInTeam
 from exceptions import ValidationError, NotFoundError, PermissionError, APIException
-from utils import get_current_user
+from utils import get_current_user, get_current_role
+from tokens import bump_token_version
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +21,7 @@ class TeamResource(Resource):
     def get(self):
         """获取所有团队列表 (管理员/秘书可见)"""
         try:
-            current_user = get_current_user()
-            if current_user.role not in ['管理员', '秘书']:
+            if get_current_role() not in ['管理员', '秘书']:
                 raise PermissionError('只有管理员或秘书可以查看所有团队')
 
             # 优化：使用JOIN一次性获取leader信息，使用聚合查询获取成员数量
@@ -91,10 +91,10 @@ class MyTeamsResource(Resource):
                 .filter(UserInTeam.user_id == uid).all()
             
             return [{
-                'team_id': t.Team.team_id,
-                'team_name': t.Team.team_name,
-                'domain': t.Team.domain,
-                'role': '队长' if str(t.Team.leader_id) == str(uid) else '成员',
+                'team_id': t.team_id,
+                'team_name': t.team_name,
+                'domain': t.domain,
+                'role': '队长' if str(t.leader_id) == str(uid) else '成员',
                 'leader_name': leader_name or '未知'
             } for t, leader_name in results]
         except APIException:
@@ -157,3 +157,34 @@ class TeamMembersResource(Resource):
         except Exception as e:
             logger.error(f"获取团队成员列表失败: {str(e)}", exc_info=True)
             raise APIException('获取成员列表失败，请稍后重试', 500)
+
+    @jwt_required()
+    def delete(self, team_id):
+        """将成员移出团队（仅队长）；被移出成员已签发的令牌随即失效"""
+        try:
+            current_uid = get_jwt_identity()
+            team = Team.query.get_or_404(team_id)
+            if str(team.leader_id) != str(current_uid):
+                raise PermissionError('只有队长可以移除成员')
+
+            data = request.get_json(silent=True) or {}
+            user_id = data.get('user_id') or request.args.get('user_id', type=int)
+            if not user_id:
+                raise ValidationError('用户ID不能为空')
+            if str(user_id) == str(team.leader_id):
+                raise ValidationError('不能移除队长')
+
+            member = UserInTeam.query.filter_by(user_id=user_id, team_id=team_id).first()
+            if not member:
+                raise NotFoundError('该用户不在团队中')
+
+            db.session.delete(member)
+            bump_token_version(user_id)
+            db.session.commit()
+            return {'message': '成员已移出团队'}
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"移除团队成员失败: {str(e)}", exc_info=True)
+            db.session.rollback()
+            raise APIException('移除成员失败，请稍后重试', 500)
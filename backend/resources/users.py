@@ -7,8 +7,11 @@ from flask_jwt_extended import jwt_required
 from flask_restful import Resource
 
 from models import db, User
-from exceptions import ValidationError, PermissionError, APIException
-from utils import get_current_user
+from exceptions import ValidationError, NotFoundError, PermissionError, APIException
+from utils import get_current_user, get_current_role
+from bulk_import import IMPORT_KINDS, parse_rows, run_import
+from tokens import bump_token_version
+from schemas import UserListSchema
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +22,7 @@ class AdminUserResource(Resource):
     def post(self):
         """创建用户（仅管理员）"""
         try:
-            current_user = get_current_user()
-            if current_user.role != '管理员':
+            if get_current_role() != '管理员':
                 raise PermissionError('只有管理员可以创建用户')
 
             data = request.get_json()
@@ -52,20 +54,84 @@ class AdminUserResource(Resource):
     def get(self):
         """获取所有用户列表（管理员/秘书可见）"""
         try:
-            current_user = get_current_user()
-            if current_user.role not in ['管理员', '秘书']:
+            if get_current_role() not in ['管理员', '秘书']:
                 raise PermissionError('只有管理员或秘书可以查看用户列表')
 
-            users = User.query.all()
-            return [{
-                'user_id': u.user_id,
-                'user_name': u.user_name,
-                'real_name': u.real_name,
-                'role': u.role,
-                'affiliation': u.affiliation
-            } for u in users]
+            return UserListSchema.dump_all(UserListSchema.query())
         except APIException:
             raise
         except Exception as e:
             logger.error(f"获取用户列表失败: {str(e)}", exc_info=True)
             raise APIException('获取用户列表失败，请稍后重试', 500)
+
+    @jwt_required()
+    def put(self):
+        """修改用户信息（仅管理员）；角色变更会使该用户已签发的令牌失效"""
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以修改用户信息')
+
+            data = request.get_json()
+            if not data or not data.get('user_id'):
+                raise ValidationError('用户ID不能为空')
+
+            user = User.query.get(data['user_id'])
+            if not user:
+                raise NotFoundError('用户不存在')
+
+            if 'role' in data and data['role'] != user.role:
+                if data['role'] not in ['项目参与者', '评审人', '秘书', '管理员', '企业支持者']:
+                    raise ValidationError('角色无效')
+                user.role = data['role']
+                bump_token_version(user.user_id)
+            for field in ['real_name', 'affiliation', 'email']:
+                if field in data:
+                    setattr(user, field, data[field])
+
+            db.session.commit()
+            return {'message': f'已更新用户: {user.real_name or user.user_name}'}
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"修改用户失败: {str(e)}", exc_info=True)
+            db.session.rollback()
+            raise APIException('修改用户失败，请稍后重试', 500)
+
+
+class AdminImportResource(Resource):
+    """批量导入用户、团队、团队成员和项目（仅管理员）"""
+    @jwt_required()
+    def post(self):
+        """上传CSV/JSON文件（表单字段 users/teams/memberships/projects），或提交同名键的JSON"""
+        try:
+            if get_current_role() != '管理员':
+                raise PermissionError('只有管理员可以批量导入数据')
+
+            datasets = {}
+            if request.files:
+                for kind in IMPORT_KINDS:
+                    upload = request.files.get(kind)
+                    if upload:
+                        fmt = 'json' if (upload.filename or '').endswith('.json') else 'csv'
+                        try:
+                            datasets[kind] = parse_rows(upload.read(), fmt)
+                        except (ValueError, UnicodeDecodeError):
+                            raise ValidationError(f'{kind} 文件解析失败，请检查格式')
+            else:
+                data = request.get_json(silent=True) or {}
+                for kind in IMPORT_KINDS:
+                    if kind in data:
+                        if not isinstance(data[kind], list):
+                            raise ValidationError(f'{kind} 必须是数组')
+                        datasets[kind] = data[kind]
+
+            if not datasets:
+                raise ValidationError('没有可导入的数据')
+
+            return run_import(datasets), 200
+        except APIException:
+            raise
+        except Exception as e:
+            logger.error(f"批量导入失败: {str(e)}", exc_info=True)
+            db.session.rollback()
+            raise APIException('批量导入失败，请稍后重试', 500)
@@ -0,0 +1,184 @@
+"""
+评审评分分析
+以列式数组拉取评审意见分数，使用NumPy向量化计算评审人均值/方差、
+相对评审池的z分数校准、宽严指数以及项目内评审一致性
+"""
+import numpy as np
+from sqlalchemy import func, select
+
+from models import db, User, Project, ReviewTask, ReviewOpinion
+
+SCORE_FIELDS = ('innovation', 'feasibility', 'teamwork', 'potentiality')
+
+# 宽严指数超过该阈值（单位：评审池标准差）视为偏宽松/偏严格
+TENDENCY_THRESHOLD = 0.5
+
+
+def load_opinion_columns(reviewer_id=None):
+    """加载评审意见分数，返回列式数组字典
+
+    返回的每个数组长度一致，一个下标对应一条评审意见。
+    """
+    stmt = select(
+        ReviewTask.reviewer_id,
+        ReviewTask.project_id,
+        func.coalesce(ReviewOpinion.innovation_score, 0),
+        func.coalesce(ReviewOpinion.feasibility_score, 0),
+        func.coalesce(ReviewOpinion.teamwork_score, 0),
+        func.coalesce(ReviewOpinion.potentiality_score, 0),
+        func.coalesce(ReviewOpinion.total_score, 0),
+    ).join(ReviewTask, ReviewOpinion.task_id == ReviewTask.task_id)\
+     .where(ReviewTask.reviewer_id.isnot(None))
+    if reviewer_id is not None:
+        stmt = stmt.where(ReviewTask.reviewer_id == reviewer_id)
+
+    rows = db.session.execute(stmt).tuples().all()
+    matrix = np.array(rows, dtype=np.float64).reshape(-1, 7)
+    columns = {
+        'reviewer_id': matrix[:, 0].astype(np.int64),
+        'project_id': matrix[:, 1].astype(np.int64),
+        'total': matrix[:, 6],
+    }
+    for i, field in enumerate(SCORE_FIELDS):
+        columns[field] = matrix[:, 2 + i]
+    return columns
+
+
+def _group_moments(inverse, values, size):
+    """按分组下标计算数量、均值、总体方差"""
+    counts = np.bincount(inverse, minlength=size).astype(np.float64)
+    sums = np.bincount(inverse, weights=values, minlength=size)
+    sq_sums = np.bincount(inverse, weights=values * values, minlength=size)
+    means = sums / counts
+    variances = np.maximum(sq_sums / counts - means * means, 0.0)
+    return counts, means, variances
+
+
+def score_averages(columns):
+    """各维度平均分"""
+    if len(columns['total']) == 0:
+        return {f'avg_{field}': 0 for field in SCORE_FIELDS}
+    return {f'avg_{field}': float(columns[field].mean()) for field in SCORE_FIELDS}
+
+
+def calibration_report(columns):
+    """评审人校准报告
+
+    - reviewers: 每位评审人的均值、方差、各维度均值、z分数、宽严指数
+    - projects: 每个项目的原始均分、校准后均分、标准差、极差、一致性
+    - pool: 评审池整体均值、标准差以及ICC(1)一致性系数
+    """
+    total = columns['total']
+    n = len(total)
+    if n == 0:
+        return {
+            'pool': {'reviews': 0, 'reviewers': 0, 'projects': 0, 'mean': 0, 'std': 0, 'icc': None},
+            'reviewers': [],
+            'projects': [],
+        }
+
+    reviewer_ids, r_inv = np.unique(columns['reviewer_id'], return_inverse=True)
+    project_ids, p_inv = np.unique(columns['project_id'], return_inverse=True)
+    n_reviewers, n_projects = len(reviewer_ids), len(project_ids)
+
+    pool_mean = float(total.mean())
+    pool_std = float(total.std())
+
+    # 评审人维度
+    r_counts, r_means, r_vars = _group_moments(r_inv, total, n_reviewers)
+    r_stds = np.sqrt(r_vars)
+    dim_means = {
+        field: np.bincount(r_inv, weights=columns[field], minlength=n_reviewers) / r_counts
+        for field in SCORE_FIELDS
+    }
+    # 评审人均值相对评审池的z分数（按样本量缩放标准误）
+    if pool_std > 0:
+        r_z = (r_means - pool_mean) / (pool_std / np.sqrt(r_counts))
+    else:
+        r_z = np.zeros(n_reviewers)
+
+    # 项目维度
+    p_counts, p_means, p_vars = _group_moments(p_inv, total, n_projects)
+    p_stds = np.sqrt(p_vars)
+    p_max = np.full(n_projects, -np.inf)
+    p_min = np.full(n_projects, np.inf)
+    np.maximum.at(p_max, p_inv, total)
+    np.minimum.at(p_min, p_inv, total)
+
+    # 宽严指数：评审人给分相对同项目均分的平均偏离，以评审池标准差为单位
+    deviation = total - p_means[p_inv]
+    r_leniency = np.bincount(r_inv, weights=deviation, minlength=n_reviewers) / r_counts
+    if pool_std > 0:
+        r_leniency = r_leniency / pool_std
+
+    # z分数校准：每条评分先按评审人自身分布标准化，再映射回评审池分布
+    safe_r_stds = np.where(r_stds > 0, r_stds, 1.0)
+    z = (total - r_means[r_inv]) / safe_r_stds[r_inv]
+    calibrated = pool_mean + z * pool_std
+    p_calibrated = np.bincount(p_inv, weights=calibrated, minlength=n_projects) / p_counts
+
+    # 项目内一致性：1 - 项目内标准差 / 评审池标准差，截断到[0, 1]
+    if pool_std > 0:
+        p_agreement = np.clip(1.0 - p_stds / pool_std, 0.0, 1.0)
+    else:
+        p_agreement = np.ones(n_projects)
+
+    # ICC(1)：单向随机效应模型，k取每个项目的平均评审数
+    icc = None
+    if n_projects > 1 and n > n_projects:
+        k = n / n_projects
+        ms_between = float(np.sum(p_counts * (p_means - pool_mean) ** 2) / (n_projects - 1))
+        ms_within = float(np.sum(p_counts * p_vars) / (n - n_projects))
+        denominator = ms_between + (k - 1) * ms_within
+        if denominator > 0:
+            icc = (ms_between - ms_within) / denominator
+
+    reviewer_names = dict(db.session.query(User.user_id, User.real_name)
+                          .filter(User.user_id.in_(reviewer_ids.tolist())).all())
+    project_names = dict(db.session.query(Project.project_id, Project.project_name)
+                         .filter(Project.project_id.in_(project_ids.tolist())).all())
+
+    reviewers = []
+    for i, rid in enumerate(reviewer_ids.tolist()):
+        leniency = float(r_leniency[i])
+        if leniency > TENDENCY_THRESHOLD:
+            tendency = '偏宽松'
+        elif leniency < -TENDENCY_THRESHOLD:
+            tendency = '偏严格'
+        else:
+            tendency = '正常'
+        reviewers.append({
+            'reviewer_id': rid,
+            'reviewer_name': reviewer_names.get(rid) or '未知',
+            'reviews': int(r_counts[i]),
+            'mean': round(float(r_means[i]), 2),
+            'variance': round(float(r_vars[i]), 2),
+            'dimension_means': {field: round(float(dim_means[field][i]), 2) for field in SCORE_FIELDS},
+            'z_score': round(float(r_z[i]), 3),
+            'leniency_index': round(leniency, 3),
+            'tendency': tendency,
+        })
+
+    projects = [{
+        'project_id': pid,
+        'project_name': project_names.get(pid) or '未知',
+        'reviews': int(p_counts[i]),
+        'mean': round(float(p_means[i]), 2),
+        'calibrated_mean': round(float(p_calibrated[i]), 2),
+        'std': round(float(p_stds[i]), 2),
+        'range': float(p_max[i] - p_min[i]),
+        'agreement': round(float(p_agreement[i]), 3),
+    } for i, pid in enumerate(project_ids.tolist())]
+
+    return {
+        'pool': {
+            'reviews': n,
+            'reviewers': n_reviewers,
+            'projects': n_projects,
+            'mean': round(pool_mean, 2),
+            'std': round(pool_std, 2),
+            'icc': round(icc, 3) if icc is not None else None,
+        },
+        'reviewers': reviewers,
+        'projects': projects,
+    }
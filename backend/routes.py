@@ -6,9 +6,10 @@ from flask_restful import Api
 
 # 导入所有Resource类
 from resources.auth import Login, Register
-from resources.users import AdminUserResource
+from resources.users import AdminUserResource, AdminImportResource
 from resources.teams import TeamResource, MyTeamsResource, TeamMembersResource
 from resources.projects import ProjectResource
+from resources.project_overview import ProjectOverviewResource
 from resources.secretary import ProjectAudit, TaskAssignment
 from resources.reviewer import (
     ReviewerTasksResource, ReviewerIncubationProjectsResource,
@@ -25,8 +26,12 @@ from resources.marketplace import (
     PublicResourcesResource, ResourceApplyResource, MyResourceApplicationsResource
 )
 from resources.statistics import (
-    StatisticsResource, UserStatisticsResource, ReviewerStatisticsResource, SupporterStatisticsResource
+    StatisticsResource, UserStatisticsResource, ReviewerStatisticsResource, SupporterStatisticsResource,
+    ReviewerCalibrationResource, SupporterFunnelResource
 )
+from resources.batch import BatchResource
+from resources.exports import DataExportResource
+from resources.monitoring import DbPoolResource, MetricsResource, ProfileListResource, ProfileDownloadResource
 
 
 def register_routes(api: Api):
@@ -35,6 +40,7 @@ def register_routes(api: Api):
     api.add_resource(Login, '/api/login')
     api.add_resource(Register, '/api/register')
     api.add_resource(AdminUserResource, '/api/admin/users')
+    api.add_resource(AdminImportResource, '/api/admin/import')
     
     # 团队管理
     api.add_resource(TeamResource, '/api/teams')
@@ -43,6 +49,7 @@ def register_routes(api: Api):
     
     # 项目管理
     api.add_resource(ProjectResource, '/api/projects', '/api/projects/<int:project_id>')
+    api.add_resource(ProjectOverviewResource, '/api/projects/<int:project_id>/overview')
     api.add_resource(ProjectAudit, '/api/projects/<int:project_id>/audit')
     api.add_resource(TaskAssignment, '/api/projects/<int:project_id>/assign')
     
@@ -90,4 +97,18 @@ def register_routes(api: Api):
     api.add_resource(StatisticsResource, '/api/statistics')
     api.add_resource(UserStatisticsResource, '/api/statistics/user')
     api.add_resource(ReviewerStatisticsResource, '/api/statistics/reviewer')
+    api.add_resource(ReviewerCalibrationResource, '/api/statistics/reviewer/calibration')
     api.add_resource(SupporterStatisticsResource, '/api/statistics/supporter')
+    api.add_resource(SupporterFunnelResource, '/api/statistics/supporter/funnel')
+    
+    # 批量请求
+    api.add_resource(BatchResource, '/api/batch')
+
+    # 数据导出
+    api.add_resource(DataExportResource, '/api/admin/export/<string:dataset>')
+
+    # 运行监控
+    api.add_resource(DbPoolResource, '/api/admin/db-pool')
+    api.add_resource(MetricsResource, '/api/metrics')
+    api.add_resource(ProfileListResource, '/api/admin/profiles')
+    api.add_resource(ProfileDownloadResource, '/api/admin/profiles/<string:profile_id>')
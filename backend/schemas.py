@@ -0,0 +1,315 @@
+"""
+声明式行序列化
+- 列表接口的输出字段在 Schema 子类中声明一次：输出名、来源列（或带标签的表达式）、空值时的默认值
+- 定义子类时编译为按位置解包的行转字典函数；查询只选取声明的列，不再构造完整的 ORM 对象
+- Schema.dto 为带 __slots__ 的轻量行对象，供需要按属性访问、长期持有大量行的代码使用
+输出与改造前各资源手写的字典一致：
+- 字符串默认值对 None 和空字符串生效（原写法 `x or '未知'`），其他默认值只替换 None
+- 原写法为 `str(x)` 的时间字段声明 as_text=True，在转换时按 str() 输出（空值为 'None'）；
+  原写法为 `str(x) if x else None` 的字段输出原值，由 serialization 按相同格式编码，空值为 null
+- Decimal 直接输出原值，由 serialization 统一编码
+"""
+import json
+from copy import deepcopy
+
+from sqlalchemy import select
+
+from models import (
+    db, User, Project, ReviewTask, Notification, IncubationComment, IncubationResource,
+    IncubationRecord, ProofOfConcept, Milestone, FundRecord, Expenditure, Achievement, AchievementOfProject,
+    SupportIntention
+)
+
+
+def json_text(value):
+    """JSON 文本列：空串或格式错误时返回 None，由字段默认值替代"""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class Field:
+    """Schema 字段"""
+    __slots__ = ('column', 'default', 'transform', 'as_text')
+
+    def __init__(self, column, default=None, transform=None, as_text=False):
+        """
+        column: 模型列或 SQL 表达式
+        default: 替代值；字符串默认值在值为 None 或空字符串时使用，其他默认值只替换 None
+                （0、False 照常输出）；列表、字典等可变值每行复制一份
+        transform: 对非 None 值调用的转换函数
+        as_text: 按 str(value) 输出（含 None → 'None'），与改造前的 str(datetime) 写法一致
+        """
+        self.column = column
+        self.default = default
+        self.transform = transform
+        self.as_text = as_text
+
+
+def _compile(name, fields):
+    """生成行转字典函数和 DTO 类"""
+    namespace = {}
+    variables = [f'c{i}' for i in range(len(fields))]
+    items = []
+    for i, (key, field) in enumerate(fields.items()):
+        expr = variables[i]
+        if field.as_text:
+            expr = f'str({expr})'
+        if field.transform is not None:
+            namespace[f't{i}'] = field.transform
+            expr = f'(t{i}({expr}) if {expr} is not None else None)'
+        if field.default is not None:
+            namespace[f'd{i}'] = field.default
+            fallback = f'd{i}'
+            if isinstance(field.default, (list, dict, set)):
+                namespace['deepcopy'] = deepcopy
+                fallback = f'deepcopy(d{i})'
+            if isinstance(field.default, str):
+                expr = f'({expr} or {fallback})'
+            elif field.transform is not None:
+                expr = f'({fallback} if (v{i} := {expr}) is None else v{i})'
+            else:
+                expr = f'({fallback} if {expr} is None else {expr})'
+        items.append(f'{key!r}: {expr}')
+    unpack = ', '.join(variables) + (',' if len(variables) == 1 else '')
+    body = '{' + ', '.join(items) + '}'
+    source = (f'def dump(row):\n    {unpack} = row\n    return {body}\n'
+              f'def dump_all(rows):\n    return [{body} for {unpack} in rows]\n')
+    exec(compile(source, f'<schema {name}>', 'exec'), namespace)
+
+    keys = tuple(fields)
+    init_source = (f'def __init__(self, {", ".join(keys)}):\n'
+                   + ''.join(f'    self.{key} = {key}\n' for key in keys))
+    dto_namespace = {}
+    exec(compile(init_source, f'<dto {name}>', 'exec'), dto_namespace)
+    dto = type(f'{name}Row', (), {
+        '__slots__': keys,
+        '__init__': dto_namespace['__init__'],
+        '__repr__': lambda self: f'{name}Row({", ".join(f"{k}={getattr(self, k)!r}" for k in keys)})',
+    })
+    return namespace['dump'], namespace['dump_all'], dto
+
+
+class Schema:
+    """
+    声明式 Schema 基类，子类在 fields 中按输出顺序声明 {输出名: Field}
+    用法：rows = ProjectListSchema.query().filter(...).all(); return ProjectListSchema.dump_all(rows)
+    """
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.columns = tuple(field.column.label(key) for key, field in cls.fields.items())
+        dump, dump_all, dto = _compile(cls.__name__, cls.fields)
+        cls.dump = staticmethod(dump)
+        cls.dump_all = staticmethod(dump_all)
+        cls.dto = dto
+
+    @classmethod
+    def query(cls):
+        """只选取声明列的查询，JOIN 和过滤条件由调用方追加"""
+        return db.session.query(*cls.columns)
+
+    @classmethod
+    def select(cls):
+        """只选取声明列的 select 语句，同步会话和异步会话（ASGI 模式）都可执行"""
+        return select(*cls.columns)
+
+    @classmethod
+    def load_all(cls, rows):
+        """行转为 DTO 列表"""
+        dto = cls.dto
+        return [dto(*row) for row in rows]
+
+
+class ProjectListSchema(Schema):
+    """项目列表（需 outerjoin 负责人）"""
+    fields = {
+        'project_id': Field(Project.project_id),
+        'project_name': Field(Project.project_name),
+        'domain': Field(Project.domain),
+        'status': Field(Project.status),
+        'principal_name': Field(User.user_name, default='未知'),
+    }
+
+
+class SupporterProjectSchema(Schema):
+    """支持者浏览的孵化项目（需 join 负责人）"""
+    fields = {
+        'project_id': Field(Project.project_id),
+        'project_name': Field(Project.project_name),
+        'domain': Field(Project.domain),
+        'maturity_level': Field(Project.maturity_level),
+        'project_description': Field(Project.project_description),
+        'status': Field(Project.status),
+        'principal_name': Field(User.real_name, default='未知'),
+        'submit_time': Field(Project.submit_time, as_text=True),
+    }
+
+
+class UserListSchema(Schema):
+    """用户列表"""
+    fields = {
+        'user_id': Field(User.user_id),
+        'user_name': Field(User.user_name),
+        'real_name': Field(User.real_name),
+        'role': Field(User.role),
+        'affiliation': Field(User.affiliation),
+    }
+
+
+class NotificationSchema(Schema):
+    """通知列表"""
+    fields = {
+        'id': Field(Notification.notification_id),
+        'title': Field(Notification.title),
+        'content': Field(Notification.content),
+        'create_time': Field(Notification.create_time, as_text=True),
+        'is_read': Field(Notification.is_read),
+    }
+
+
+class ReviewerTaskSchema(Schema):
+    """评审人的任务列表（需 join 项目）"""
+    fields = {
+        'task_id': Field(ReviewTask.task_id),
+        'project_id': Field(Project.project_id),
+        'project_name': Field(Project.project_name),
+        'domain': Field(Project.domain),
+        'deadline': Field(ReviewTask.deadline, default='无'),
+        'status': Field(ReviewTask.status),
+    }
+
+
+class CommentSchema(Schema):
+    """项目留言（需 join 留言人）"""
+    fields = {
+        'comment_id': Field(IncubationComment.comment_id),
+        'project_id': Field(IncubationComment.project_id),
+        'user_id': Field(IncubationComment.user_id),
+        'content': Field(IncubationComment.content),
+        'parent_id': Field(IncubationComment.parent_id),
+        'create_time': Field(IncubationComment.create_time, as_text=True),
+        'user_name': Field(User.real_name, default='未知'),
+        'user_role': Field(User.role),
+        'user_affiliation': Field(User.affiliation, default=''),
+    }
+
+
+class PublicResourceSchema(Schema):
+    """资源集市中开放的资源（需 join 提供方）"""
+    fields = {
+        'resource_id': Field(IncubationResource.resource_id),
+        'provider_id': Field(IncubationResource.provider_id),
+        'title': Field(IncubationResource.title),
+        'resource_type': Field(IncubationResource.resource_type),
+        'description': Field(IncubationResource.description),
+        'status': Field(IncubationResource.status),
+        'create_time': Field(IncubationResource.create_time, as_text=True),
+        'provider_name': Field(User.real_name, default='未知'),
+        'provider_affiliation': Field(User.affiliation, default=''),
+    }
+
+
+class IncubationSchema(Schema):
+    """项目孵化记录"""
+    fields = {
+        'incubation_id': Field(IncubationRecord.incubation_id),
+        'project_id': Field(IncubationRecord.project_id),
+        'start_time': Field(IncubationRecord.start_time, as_text=True),
+        'planned_end_time': Field(IncubationRecord.planned_end_time),
+        'actual_end_time': Field(IncubationRecord.actual_end_time),
+        'status': Field(IncubationRecord.status),
+        'progress': Field(IncubationRecord.progress),
+        'incubation_plan': Field(IncubationRecord.incubation_plan, default=''),
+        'milestones': Field(IncubationRecord.milestones, default=[], transform=json_text),
+        'resources': Field(IncubationRecord.resources, default=''),
+        'challenges': Field(IncubationRecord.challenges, default=''),
+        'achievements': Field(IncubationRecord.achievements, default=''),
+        'update_time': Field(IncubationRecord.update_time, as_text=True),
+    }
+
+
+class ProofOfConceptSchema(Schema):
+    """项目概念验证记录"""
+    fields = {
+        'poc_id': Field(ProofOfConcept.poc_id),
+        'project_id': Field(ProofOfConcept.project_id),
+        'incubation_id': Field(ProofOfConcept.incubation_id),
+        'title': Field(ProofOfConcept.title),
+        'description': Field(ProofOfConcept.description),
+        'verification_objective': Field(ProofOfConcept.verification_objective),
+        'verification_method': Field(ProofOfConcept.verification_method),
+        'verification_result': Field(ProofOfConcept.verification_result),
+        'status': Field(ProofOfConcept.status),
+        'start_time': Field(ProofOfConcept.start_time, as_text=True),
+        'end_time': Field(ProofOfConcept.end_time),
+        'evidence_files': Field(ProofOfConcept.evidence_files, default=[], transform=json_text),
+        'metrics': Field(ProofOfConcept.metrics, default={}, transform=json_text),
+        'conclusion': Field(ProofOfConcept.conclusion),
+        'create_time': Field(ProofOfConcept.create_time, as_text=True),
+    }
+
+
+class MilestoneSchema(Schema):
+    """项目里程碑"""
+    fields = {
+        'milestone_id': Field(Milestone.milestone_id),
+        'project_id': Field(Milestone.project_id),
+        'title': Field(Milestone.title),
+        'due_date': Field(Milestone.due_date),
+        'status': Field(Milestone.status),
+        'deliverable': Field(Milestone.deliverable, default=''),
+        'create_time': Field(Milestone.create_time, as_text=True),
+        'update_time': Field(Milestone.update_time, as_text=True),
+    }
+
+
+class FundRecordSchema(Schema):
+    """经费下拨记录"""
+    fields = {
+        'fund_id': Field(FundRecord.fund_id),
+        'title': Field(FundRecord.title),
+        'amount': Field(FundRecord.amount, default=0.0),
+    }
+
+
+class ExpenditureSchema(Schema):
+    """支出记录"""
+    fields = {
+        'expenditure_id': Field(Expenditure.expenditure_id),
+        'title': Field(Expenditure.title),
+        'amount': Field(Expenditure.amount, default=0.0),
+    }
+
+
+class ProjectAchievementSchema(Schema):
+    """项目成果（需 join AchievementOfProject）"""
+    fields = {
+        'achievement_id': Field(Achievement.achievement_id),
+        'title': Field(Achievement.title),
+        'type': Field(Achievement.type, default=''),
+        'publish_time': Field(Achievement.publish_time),
+        'source_information': Field(Achievement.source_information, default=''),
+        'record_id': Field(AchievementOfProject.record_id),
+    }
+
+
+class ProjectIntentionSchema(Schema):
+    """项目收到的对接意向（需 join 支持者）"""
+    fields = {
+        'intention_id': Field(SupportIntention.intention_id),
+        'project_id': Field(SupportIntention.project_id),
+        'supporter_id': Field(SupportIntention.supporter_id),
+        'support_type': Field(SupportIntention.support_type),
+        'message': Field(SupportIntention.message),
+        'status': Field(SupportIntention.status),
+        'create_time': Field(SupportIntention.create_time, as_text=True),
+        'update_time': Field(SupportIntention.update_time, as_text=True),
+        'supporter_name': Field(User.real_name, default='未知'),
+        'supporter_affiliation': Field(User.affiliation, default=''),
+        'supporter_email': Field(User.email, default=''),
+    }
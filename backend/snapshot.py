@@ -0,0 +1,131 @@
+"""
+数据快照
+由后台线程定期重新计算并原子替换，请求始终读取最近一次的快照（stale-while-revalidate）
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+
+from models import db
+from metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """带版本号的数据快照
+
+    - 后台线程按 interval 定期刷新
+    - 读请求直接返回当前快照，过期时只触发一次重新计算（single-flight）
+    - 只有在尚无任何快照时，首个请求才会同步等待计算完成
+    """
+
+    def __init__(self, name, compute, interval=60):
+        self.name = name
+        self.interval = interval
+        self._compute = compute
+        self._app = None
+        self._lock = threading.Lock()
+        self._data = None
+        self._version = 0
+        self._computed_at = None
+        self._computed_ts = 0.0
+        self._thread = None
+
+    def init_app(self, app, interval=None):
+        """绑定应用并启动后台刷新线程"""
+        self._app = app
+        if interval is not None:
+            self.interval = interval
+        registry.register_collector(self.collect_metrics)
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f'snapshot-{self.name}', daemon=True
+            )
+            self._thread.start()
+
+    def get(self):
+        """返回当前快照：{'data', 'version', 'computed_at'}"""
+        if self._data is None:
+            # 冷启动：所有请求等待同一次计算
+            with self._lock:
+                if self._data is None:
+                    self._refresh_locked()
+        elif self.is_stale():
+            self._refresh_async()
+        return {
+            'data': self._data,
+            'version': self._version,
+            'computed_at': self._computed_at.isoformat() if self._computed_at else None,
+        }
+
+    def is_stale(self):
+        return time.monotonic() - self._computed_ts >= self.interval
+
+    def invalidate(self):
+        """标记快照过期，下一次读取时触发后台刷新"""
+        self._computed_ts = 0.0
+
+    def collect_metrics(self):
+        """供 /api/metrics 抓取的快照版本和数据年龄"""
+        labels = {'snapshot': self.name}
+        age = time.monotonic() - self._computed_ts if self._computed_ts else -1
+        return [
+            ('snapshot_version', 'gauge', '快照当前版本号', [(labels, self._version)]),
+            ('snapshot_age_seconds', 'gauge', '快照距上次计算的秒数（-1表示尚未计算）', [(labels, round(age, 3))]),
+        ]
+
+    def refresh(self):
+        """同步刷新快照（已有刷新在进行时直接返回）"""
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._refresh_locked()
+        finally:
+            self._lock.release()
+
+    def _refresh_async(self):
+        # 先取锁再启动线程，并发的过期读取只会启动一个刷新线程
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            threading.Thread(target=self._revalidate, name=f'snapshot-{self.name}-revalidate',
+                             daemon=True).start()
+        except Exception:
+            self._lock.release()
+            raise
+
+    def _revalidate(self):
+        """后台刷新线程：锁已由 _refresh_async 取得，在此释放"""
+        try:
+            self._refresh_locked()
+        except Exception as e:
+            logger.error(f"刷新快照 {self.name} 失败: {str(e)}", exc_info=True)
+        finally:
+            self._lock.release()
+
+    def _refresh_locked(self):
+        started = time.monotonic()
+        if self._app is not None:
+            with self._app.app_context():
+                try:
+                    data = self._compute()
+                finally:
+                    db.session.remove()
+        else:
+            data = self._compute()
+        # 整体替换引用，读者不会看到半更新的快照
+        self._data = data
+        self._version += 1
+        self._computed_at = datetime.now()
+        self._computed_ts = time.monotonic()
+        logger.info(f"快照 {self.name} 已刷新 (版本 {self._version}, 耗时 {time.monotonic() - started:.3f}s)")
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"刷新快照 {self.name} 失败: {str(e)}", exc_info=True)
+            time.sleep(max(self.interval, 1))
@@ -0,0 +1,107 @@
+"""
+访问令牌声明与版本校验
+- 登录时把角色和团队ID写入JWT，权限判断不必每次查询 User/UserInTeam
+- 每个用户有 token_version，角色变更、移出团队时递增，使旧令牌失效
+- 令牌校验时对比进程内缓存中的版本号，缓存条目过期后从数据库刷新
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify
+from sqlalchemy import func
+
+from models import db, User, UserInTeam
+from db_routing import replica_router
+
+
+def build_claims(user):
+    """生成写入JWT的附加声明"""
+    team_ids = [tid for (tid,) in db.session.query(UserInTeam.team_id)
+                .filter(UserInTeam.user_id == user.user_id).all()]
+    return {
+        'role': user.role,
+        'team_ids': team_ids,
+        'ver': user.token_version or 0,
+    }
+
+
+class TokenVersionCache:
+    """用户 token_version 的进程内LRU缓存，条目在 ttl 秒后从数据库刷新"""
+
+    def __init__(self, ttl=5, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('TOKEN_VERSION_TTL', self.ttl)
+        self.max_entries = app.config.get('TOKEN_VERSION_CACHE_SIZE', self.max_entries)
+
+    def get(self, user_id):
+        """返回用户当前的 token_version，用户不存在时返回 None"""
+        version = self.cached(user_id)
+        if version is not None:
+            return version
+
+        # 版本号决定令牌是否已吊销，始终从主库读取，不受副本延迟影响
+        with replica_router.force(False):
+            version = db.session.query(User.token_version).filter(User.user_id == user_id).scalar()
+        if version is None:
+            return None
+        self.store(user_id, version)
+        return version
+
+    def cached(self, user_id):
+        """缓存中未过期的版本号，未命中时返回 None（ASGI 模式由调用方异步查询后 store）"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+        return None
+
+    def store(self, user_id, version):
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+token_versions = TokenVersionCache()
+
+
+def bump_token_version(*user_ids):
+    """递增用户的 token_version，使其已签发的令牌失效（需由调用方提交事务）"""
+    user_ids = [int(uid) for uid in user_ids if uid is not None]
+    if not user_ids:
+        return
+    db.session.query(User).filter(User.user_id.in_(user_ids)).update(
+        {User.token_version: func.coalesce(User.token_version, 0) + 1}, synchronize_session=False
+    )
+    token_versions.invalidate(*user_ids)
+
+
+def init_jwt(jwt, app):
+    """注册令牌吊销检查：令牌中的版本号与用户当前版本不一致即视为失效"""
+    token_versions.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_token_version(jwt_header, jwt_payload):
+        try:
+            user_id = int(jwt_payload['sub'])
+        except (KeyError, TypeError, ValueError):
+            return True
+        current = token_versions.get(user_id)
+        return current is None or jwt_payload.get('ver', 0) != current
+
+    @jwt.revoked_token_loader
+    def handle_revoked_token(jwt_header, jwt_payload):
+        return jsonify({'message': '登录状态已失效，请重新登录'}), 401
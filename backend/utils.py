@@ -1,10 +1,14 @@
 """
 辅助函数
 """
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_jwt, get_jwt_identity
 from datetime import datetime, timedelta
-from models import db, User, Milestone
-from exceptions import NotFoundError
+from sqlalchemy import select
+from models import db, User, UserInTeam, Milestone
+from exceptions import NotFoundError, PermissionError
+
+# 可以查看全部项目和全局数据的角色
+STAFF_ROLES = ('管理员', '秘书')
 
 
 def get_current_user():
@@ -16,6 +20,61 @@ def get_current_user():
     return user
 
 
+def get_current_role():
+    """获取当前用户角色：优先取令牌声明，旧令牌回退到数据库查询"""
+    role = get_jwt().get('role')
+    if role:
+        return role
+    return get_current_user().role
+
+
+def is_team_member(team_id):
+    """当前用户是否属于该团队
+
+    令牌中的团队列表在移出团队时会随 token_version 失效，命中即可信；
+    登录后新加入的团队不在列表中，未命中时回退到数据库查询
+    """
+    if team_id in get_jwt().get('team_ids', ()):
+        return True
+    return db.session.query(UserInTeam.record_id).filter_by(
+        user_id=get_jwt_identity(), team_id=team_id
+    ).first() is not None
+
+
+# 以下权限判断只依赖传入的角色、用户ID和项目，同步资源与 ASGI 异步视图（resources/async_views.py）共用
+
+def require_role(role, allowed, message):
+    """角色不在 allowed 中时抛出 PermissionError"""
+    if role not in allowed:
+        raise PermissionError(message)
+
+
+def require_statistics_viewer(role):
+    """全局统计数据：管理员、秘书"""
+    require_role(role, STAFF_ROLES, '只有管理员或秘书可以查看统计数据')
+
+
+def require_incubation_browser(role):
+    """浏览孵化中的项目：企业支持者"""
+    require_role(role, ('企业支持者',), '只有企业支持者可以浏览孵化项目')
+
+
+def sees_all_projects(role):
+    """项目列表不按负责人和团队过滤的角色"""
+    return role in STAFF_ROLES
+
+
+def can_view_project(role, uid, project):
+    """项目详情：负责人、秘书、管理员、评审人及项目团队成员（团队取自令牌声明，未命中时查询数据库）"""
+    return (str(project.principal_id) == str(uid) or role in STAFF_ROLES + ('评审人',)
+            or is_team_member(project.team_id))
+
+
+def my_team_ids_subquery(uid):
+    """当前用户所在团队ID的子查询，用于列表过滤（不额外往返数据库）"""
+    return select(UserInTeam.team_id).where(UserInTeam.user_id == uid)
+
+
 def create_default_milestones(project_id):
     """为项目创建默认里程碑"""
     try:
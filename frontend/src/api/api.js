@@ -38,6 +38,8 @@ export const projectApi = {
   create: (data) => api.post('/projects', data),
   getAll: () => api.get('/projects'),
   getDetail: (id) => api.get(`/projects/${id}`),
+  // 项目全景：params 如 {include: 'detail,poc,milestones', poc_page: 1, poc_per_page: 20}
+  getOverview: (id, params) => api.get(`/projects/${id}/overview`, {params}),
   audit: (id, data) => api.post(`/projects/${id}/audit`, data),
   assignReviewer: (id, data) => api.post(`/projects/${id}/assign`, data),
 };
@@ -110,4 +112,9 @@ export const statisticsApi = {
   getSupporterStatistics: () => api.get('/statistics/supporter'),
 };
 
+// 批量请求：paths 为接口路径列表（如 '/api/projects/1'），返回各请求的 {path, status, body}
+export const batchApi = {
+  get: (paths) => api.post('/batch', {requests: paths.map((path) => ({path}))}),
+};
+
 export default api;
@@ -1,7 +1,7 @@
 @echo off
 if exist ".venv" (call .venv\Scripts\activate) else (call venv\Scripts\activate)
 
-set FLASK_APP=backend/app.py
+set FLASK_APP=app_new:create_app()
 
 echo 正在执行数据库迁移...
 cd backend
@@ -11,6 +11,6 @@ if errorlevel 1 (
 )
 cd ..
 
-start "Backend Service" cmd /k "python backend/app.py"
+start "Backend Service" cmd /k "python backend/app_new.py"
 
 cd frontend && npm start
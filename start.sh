@@ -5,8 +5,8 @@ trap 'kill $(jobs -p); exit' SIGINT
 # 激活虚拟环境
 source .venv/bin/activate || source venv/bin/activate
 
-# 设置 Flask 应用环境变量
-export FLASK_APP=backend/app.py
+# 设置 Flask 应用环境变量（在 backend 目录下解析，使用应用工厂）
+export FLASK_APP='app_new:create_app()'
 
 # 运行数据库迁移
 echo "正在执行数据库迁移..."
@@ -17,7 +17,7 @@ fi
 cd ..
 
 # 启动后端服务
-python backend/app.py &
+python backend/app_new.py &
 
 # 启动前端服务
 cd frontend && npm start